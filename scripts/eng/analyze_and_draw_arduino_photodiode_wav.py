@@ -1,88 +1,33 @@
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Use a non-interactive backend
-import matplotlib.pyplot as plt
-from scipy.io import wavfile
-from scipy.signal import find_peaks
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import EventCache, analyze_dual_wav, run_reported
 
 # === Parameters ===
 WAV_FILENAME = 'arduino_trigger_master_timer_500ms_both_2.wav'
 MIN_DISTANCE_MS = 100.0
+MATCH_MODE = 'after'    # 'after' (first photodiode peak after the trigger) or 'nearest'
+MAX_LAG_MS = None       # Reject pairs further apart than this (None = half the trigger period)
+ONE_TO_ONE = True       # Never pair the same photodiode peak with two triggers
+ONSET_METHOD = 'crossing'  # Sub-sample timing: 'crossing', 'parabolic' or None (integer samples)
+THRESHOLD_MODE = 'max'     # 'max' (fraction of the global max) or 'adaptive' (rolling levels, hysteresis)
+EVENT_CACHE = False        # Reuse the events detected by a previous run with the same file and parameters
+EXPORT_DIR = None          # Per-event table folder (Parquet, or .npz without pyarrow), None = no export
+WORKERS = None             # Processes sharing the detection of one long recording, None = a single process
+PERIOD_MS = None           # Expected stimulation period (e.g. 500 ms timer): flags missed / extra / mistimed events
+N_TRIALS = None            # Number of scheduled trials, None = from the first to the last event
+PHOTO_FILTER = None        # Clean-up before detection, e.g. {'notch_hz': 50, 'n_harmonics': 3, 'lowpass_hz': 2000}
+                           # (mains, backlight ripple); 'highpass_hz' removes a drifting baseline of short flashes
+EPOCH_MS = None            # (before, after) ms of photodiode waveform per trigger, e.g. (5, 50); None = off
 
 def analyze_wav_signals(filename):
-    try:
-        sampling_rate, data = wavfile.read(filename)
-        if data.ndim != 2 or data.shape[1] < 2:
-            raise ValueError("WAV file must contain at least 2 channels (Arduino, Photodiode).")
-
-        ttl = data[:, 0]
-        photodiode = data[:, 1]
-
-        print(f"--- Analyzing file: {filename} ---")
-        print(f"Sampling rate: {sampling_rate} Hz")
-
-        # Dynamic thresholds, photodiode based on absolute amplitude
-        ttl_threshold = 0.5 * np.max(ttl)
-        photo_abs = np.abs(photodiode)
-        photo_threshold = 0.8 * np.max(photo_abs)
-        print(f"TTL threshold: {ttl_threshold:.2f}, Photodiode threshold: {photo_threshold:.2f}")
-
-        min_distance_samples = int((MIN_DISTANCE_MS / 1000) * sampling_rate)
-
-        # Peak detection
-        ttl_peaks, _ = find_peaks(ttl, height=ttl_threshold, distance=min_distance_samples)
-        photo_peaks, _ = find_peaks(photo_abs, height=photo_threshold, distance=min_distance_samples)
-
-        def analyze_intervals(peaks, label):
-            intervals = np.diff(peaks) / sampling_rate * 1000  # in ms
-            mean_val = np.mean(intervals)
-            print(f"\n--- {label} ---")
-            print(f"Number of triggers: {len(peaks)}")
-            print(f"Mean interval: {mean_val:.2f} ms")
-            print(f"Min: {np.min(intervals):.2f}, Max: {np.max(intervals):.2f}, Std Dev: {np.std(intervals):.2f}")
-
-            plt.figure(figsize=(10, 5))
-            plt.hist(intervals, bins=40, edgecolor='black', alpha=0.8)
-            plt.axvline(mean_val, color='red', linestyle='--', label=f'Mean = {mean_val:.2f} ms')
-            plt.title(f'Trigger intervals - {label}')
-            plt.xlabel("Duration (ms)")
-            plt.ylabel("Occurrences")
-            plt.legend()
-            os.makedirs('figures', exist_ok=True)
-            filename_safe = label.lower().replace(" ", "_")
-            plt.savefig(f'figures/hist_intervals_{filename_safe}.png')
-            plt.close()
-
-        analyze_intervals(ttl_peaks, "Arduino")
-        analyze_intervals(photo_peaks, "Photodiode")
-
-        # Delay Arduino → Photodiode
-        matched_delays = []
-        for t in ttl_peaks:
-            deltas = photo_peaks - t
-            pos_deltas = deltas[deltas > 0]
-            if len(pos_deltas) > 0:
-                delay = pos_deltas[0] / sampling_rate * 1000
-                matched_delays.append(delay)
-
-        matched_delays = np.array(matched_delays)
-        print("\n--- Delay between Arduino trigger and photodiode detection ---")
-        print(f"Number of matched triggers: {len(matched_delays)}")
-        print(f"Mean delay: {np.mean(matched_delays):.2f} ms, Min: {np.min(matched_delays):.2f}, Max: {np.max(matched_delays):.2f}, Jitter: {np.std(matched_delays):.2f} ms")
-
-        plt.figure(figsize=(10, 5))
-        plt.hist(matched_delays, bins=30, edgecolor='black', alpha=0.8)
-        plt.axvline(np.mean(matched_delays), color='red', linestyle='--', label=f'Mean = {np.mean(matched_delays):.2f} ms')
-        plt.title("Delay between Arduino trigger and photodiode detection")
-        plt.xlabel("Delay (ms)")
-        plt.ylabel("Occurrences")
-        plt.legend()
-        plt.savefig('figures/delay_arduino_vs_photodiode.png')
-        plt.close()
-
-    except Exception as e:
-        print(f"Error: {e}")
+    return run_reported(analyze_dual_wav, filename, 'en', min_distance_ms=MIN_DISTANCE_MS,
+                        threshold_mode=THRESHOLD_MODE, onset_method=ONSET_METHOD, match_mode=MATCH_MODE,
+                        max_lag_ms=MAX_LAG_MS, one_to_one=ONE_TO_ONE,
+                        cache=EventCache() if EVENT_CACHE else None, export_dir=EXPORT_DIR, workers=WORKERS,
+                        period_ms=PERIOD_MS, n_trials=N_TRIALS, epoch_ms=EPOCH_MS, photodiode_filter=PHOTO_FILTER)
 
 if __name__ == '__main__':
     analyze_wav_signals(WAV_FILENAME)
@@ -1,78 +1,29 @@
-import numpy as np
-import matplotlib
-# Specify the non-interactive backend 'Agg' BEFORE importing pyplot
-# This prevents Matplotlib from trying to access a display server (like X11), which would crash in headless mode.
-matplotlib.use('Agg')
-
-import matplotlib.pyplot as plt
-from scipy.io import wavfile
-from scipy.signal import find_peaks
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import EventCache, analyze_trigger_wav, run_reported
 
 # --- Parameters ---
 WAV_FILENAME = 'triggers_arduino_better_250ms_100kHz.wav'
 MIN_DISTANCE_MS = 100.0
+THRESHOLD_MODE = 'max'  # 'max' (50% of the global max) or 'adaptive' (rolling robust levels with hysteresis)
+EVENT_CACHE = False     # Reuse the events detected by a previous run with the same file and parameters
+EXPORT_DIR = None       # Per-event table folder (Parquet, or .npz without pyarrow), None = no export
+WORKERS = None          # Processes sharing the detection of one long recording, None = a single process
+PERIOD_MS = None        # Expected stimulation period (e.g. 500 ms timer): flags missed / extra / mistimed events
+N_TRIALS = None         # Number of scheduled trials, None = from the first to the last event
 
 def analyze_and_save_plot(filename):
     """
     Analyzes a WAV file to detect triggers, computes the intervals between them,
     generates a histogram of their distribution, and saves it as an image.
     """
-    try:
-        sampling_rate, data = wavfile.read(filename)
-        print(f"--- Analyzing file: {filename} ---")
-        print(f"Sampling rate read from file: {sampling_rate} Hz")
-
-        if data.ndim > 1:
-            data = data[:, 0]  # Take only one channel if stereo
-
-        abs_signal = np.abs(data)
-        threshold = 0.5 * np.max(abs_signal)
-        print(f"Detection threshold (absolute): {int(threshold)} (computed at 50% of max amplitude)")
-
-        min_distance_samples = int(MIN_DISTANCE_MS * sampling_rate / 1000)
-        print(f"Minimum distance between peaks: {MIN_DISTANCE_MS} ms")
-        
-        peak_indices, _ = find_peaks(abs_signal, height=threshold, distance=min_distance_samples)
-        interval_samples = np.diff(peak_indices)
-        interval_ms = (interval_samples / sampling_rate) * 1000
-
-        print("\n--- RESULTS ---")
-        print(f"Number of peaks (triggers) detected: {len(peak_indices)}")
-        print(f"Total number of intervals: {len(interval_ms)}")
-        
-        if len(interval_ms) > 0:
-            mean_interval = np.mean(interval_ms)
-            print(f"Mean interval: {mean_interval:.2f} ms")
-            print(f"Minimum interval: {np.min(interval_ms):.2f} ms")
-            print(f"Maximum interval: {np.max(interval_ms):.2f} ms")
-        
-            plt.figure(figsize=(12, 7))
-            plt.hist(interval_ms, bins=50, edgecolor='black', alpha=0.75)
-            plt.axvline(mean_interval, color='red', linestyle='--', linewidth=2, 
-                        label=f'Mean = {mean_interval:.2f} ms')
-            plt.title(f"Interval Duration Distribution\nFile: {os.path.basename(filename)}", fontsize=16)
-            plt.xlabel("Interval Duration (ms)", fontsize=12)
-            plt.ylabel("Number of Intervals (Frequency)", fontsize=12)
-            plt.legend()
-            plt.grid(True, linestyle='--', alpha=0.6)
-            
-            output_dir = 'figures'
-            os.makedirs(output_dir, exist_ok=True)
-            base_name = os.path.splitext(os.path.basename(filename))[0]
-            save_path = os.path.join(output_dir, f'distribution_intervals_{base_name}_wav.png')
-            
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print(f"\nFigure successfully saved to: '{save_path}'")
-        else:
-            print("No intervals to plot, figure was not created.")
-
-    except FileNotFoundError:
-        print(f"ERROR: The file '{filename}' was not found.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    return run_reported(analyze_trigger_wav, filename, 'en', min_distance_ms=MIN_DISTANCE_MS,
+                        threshold_mode=THRESHOLD_MODE,
+                        cache=EventCache() if EVENT_CACHE else None, export_dir=EXPORT_DIR, workers=WORKERS,
+                        period_ms=PERIOD_MS, n_trials=N_TRIALS)
 
 if __name__ == '__main__':
     analyze_and_save_plot(WAV_FILENAME)
@@ -1,14 +1,24 @@
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-from scipy.io import wavfile
-from scipy.signal import find_peaks
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import EventCache, analyze_photodiode_wav, run_reported
 
 # --- Parameters ---
 WAV_FILENAME = 'expy_stimuli_only_pc_gaming_250ms.wav'  # Name of the WAV file to analyze
 MIN_INTERVAL_MS = 100.0  # Minimum interval between peaks (in ms)
+THRESHOLD_MODE = 'max'   # 'max' (80% of the global max) or 'adaptive' (rolling robust levels with hysteresis)
+ENVELOPE_PLOT = True     # Plot a min/max envelope (one pair per pixel column) instead of every sample
+ZOOM_PEAKS = 3           # Number of zoomed panels around detected peaks (envelope mode)
+ZOOM_WINDOW_MS = 150.0   # Half-width of each zoomed panel (in ms)
+EVENT_CACHE = False      # Reuse the events detected by a previous run with the same file and parameters
+EXPORT_DIR = None        # Per-event table folder (Parquet, or .npz without pyarrow), None = no export
+WORKERS = None           # Processes sharing the detection of one long recording, None = a single process
+PERIOD_MS = None         # Expected stimulation period (e.g. 500 ms timer): flags missed / extra / mistimed events
+N_TRIALS = None          # Number of scheduled trials, None = from the first to the last event
+PHOTO_FILTER = None      # Clean-up before detection, e.g. {'notch_hz': 50, 'n_harmonics': 3, 'lowpass_hz': 2000}
+                         # (mains, backlight ripple); 'highpass_hz' removes a drifting baseline of short flashes
 
 def analyze_and_save_plot(filename):
     """
@@ -18,71 +28,11 @@ def analyze_and_save_plot(filename):
     - interval histogram
     - plot of the signal with peaks
     """
-    try:
-        sampling_rate, data = wavfile.read(filename)
-        print(f"\n--- Analyzing file: {filename} ---")
-        print(f"Sampling rate: {sampling_rate} Hz")
-
-        if data.ndim > 1:
-            data = data[:, 0]  # Use only the first channel if stereo
-
-        signal_abs = np.abs(data)
-        threshold = 0.8 * np.max(signal_abs)
-        print(f"Detection threshold (80% of max amplitude): {int(threshold)}")
-
-        min_distance_samples = int(MIN_INTERVAL_MS * sampling_rate / 1000)
-
-        peak_indices, _ = find_peaks(signal_abs, height=threshold, distance=min_distance_samples)
-        intervals_in_samples = np.diff(peak_indices)
-        intervals_in_ms = (intervals_in_samples / sampling_rate) * 1000
-
-        print(f"\nNumber of detected peaks: {len(peak_indices)}")
-        print(f"Number of intervals: {len(intervals_in_ms)}")
-
-        if len(intervals_in_ms) > 0:
-            mean_interval = np.mean(intervals_in_ms)
-            print(f"Mean interval: {mean_interval:.2f} ms")
-            print(f"Min: {np.min(intervals_in_ms):.2f} ms")
-            print(f"Max: {np.max(intervals_in_ms):.2f} ms")
-
-            # --- Histogram of intervals ---
-            plt.figure(figsize=(12, 6))
-            plt.hist(intervals_in_ms, bins=50, edgecolor='black', alpha=0.75)
-            plt.axvline(mean_interval, color='red', linestyle='--', linewidth=2, label=f'Mean = {mean_interval:.2f} ms')
-            plt.title(f"Interval Distribution — {os.path.basename(filename)}", fontsize=14)
-            plt.xlabel("Interval duration (ms)")
-            plt.ylabel("Number of intervals")
-            plt.legend()
-            plt.grid(True, linestyle='--', alpha=0.6)
-
-            output_dir = 'figures'
-            os.makedirs(output_dir, exist_ok=True)
-            base_name = os.path.splitext(os.path.basename(filename))[0]
-            save_hist_path = os.path.join(output_dir, f'distribution_intervals_{base_name}.png')
-            plt.savefig(save_hist_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"\nHistogram saved: {save_hist_path}")
-
-            # --- Signal plot with detected peaks ---
-            plt.figure(figsize=(15, 5))
-            plt.plot(data, label='Signal')
-            plt.plot(peak_indices, data[peak_indices], 'rx', label='Detected Peaks')
-            plt.title(f"Signal and Detected Peaks — {base_name}")
-            plt.xlabel("Samples")
-            plt.ylabel("Amplitude")
-            plt.legend()
-            save_signal_path = os.path.join(output_dir, f'signal_peaks_{base_name}.png')
-            plt.savefig(save_signal_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"Signal plot saved: {save_signal_path}")
-
-        else:
-            print("No intervals detected — no figures generated.")
-
-    except FileNotFoundError:
-        print(f"ERROR: File '{filename}' not found.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    return run_reported(analyze_photodiode_wav, filename, 'en', min_distance_ms=MIN_INTERVAL_MS,
+                        threshold_mode=THRESHOLD_MODE, envelope=ENVELOPE_PLOT, zoom_peaks=ZOOM_PEAKS,
+                        zoom_window_ms=ZOOM_WINDOW_MS,
+                        cache=EventCache() if EVENT_CACHE else None, export_dir=EXPORT_DIR, workers=WORKERS,
+                        period_ms=PERIOD_MS, n_trials=N_TRIALS, photodiode_filter=PHOTO_FILTER)
 
 # --- Auto-run ---
 if __name__ == '__main__':
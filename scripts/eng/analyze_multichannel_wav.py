@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import EventCache, analyze_multichannel_wav, run_reported
+from stimisation.multichannel import parse_role
+
+# === Parameters ===
+WAV_FILENAME = 'arduino_trigger_master_timer_500ms_both_2.wav'
+ROLES = {                  # Name: (channel, kind), kind in 'ttl', 'photodiode', 'button', 'meg_trigger'
+    'ttl': (0, 'ttl'),
+    'photodiode': (1, 'photodiode'),
+}
+PAIRS = None               # (source, target) names to compare, e.g. [('ttl', 'photodiode')] (None = all pairs)
+MIN_DISTANCE_MS = 100.0
+MATCH_MODE = 'after'       # 'after' (first target event after the source event) or 'nearest'
+MAX_LAG_MS = None          # Reject pairs further apart than this (None = half the source period)
+ONE_TO_ONE = True          # Never pair the same target event with two source events
+ONSET_METHOD = 'crossing'  # Sub-sample timing: 'crossing', 'parabolic' or None (integer samples)
+THRESHOLD_MODE = 'max'     # 'max' (fraction of the global max) or 'adaptive' (rolling levels, hysteresis)
+EVENT_CACHE = False        # Reuse the events detected by a previous run with the same file and parameters
+EXPORT_DIR = None          # Per-event table folder (Parquet, or .npz without pyarrow), None = no export
+WORKERS = None             # Processes sharing the detection of one long recording, None = a single process
+PHOTO_FILTER = None        # Clean-up of the 'photodiode' lines before detection, e.g. {'notch_hz': 50, 'n_harmonics': 3}
+
+def analyze_wav_channels(filename, roles=ROLES):
+    return run_reported(analyze_multichannel_wav, filename, 'en', roles=roles, pairs=PAIRS,
+                        min_distance_ms=MIN_DISTANCE_MS, threshold_mode=THRESHOLD_MODE, onset_method=ONSET_METHOD,
+                        match_mode=MATCH_MODE, max_lag_ms=MAX_LAG_MS, one_to_one=ONE_TO_ONE,
+                        cache=EventCache() if EVENT_CACHE else None, export_dir=EXPORT_DIR, workers=WORKERS,
+                        photodiode_filter=PHOTO_FILTER)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Event counts and pairwise delays of every line of a WAV recording.")
+    parser.add_argument('filename', nargs='?', default=WAV_FILENAME)
+    parser.add_argument('--role', action='append', type=parse_role, metavar='NAME=CHANNEL:KIND',
+                        help="Replaces ROLES (repeat for each line), e.g. --role ttl=0:ttl --role photo=1:photodiode")
+    args = parser.parse_args()
+    analyze_wav_channels(args.filename, dict(args.role) if args.role else ROLES)
@@ -1,7 +1,14 @@
 #include <TimerOne.h>
 
+// 1: 9-byte binary frames (see stimisation/trigger_protocol.py), 0: "SHOW" text lines
+#define BINARY_PROTOCOL 1
+
 const int triggerPin = 8;
+const byte FRAME_SYNC = 0xA5;
+const byte EVENT_SHOW = 1;
+
 volatile bool should_send = false;
+uint16_t sequence = 0;
 
 void setup() {
   Serial.begin(115200);
@@ -13,12 +20,43 @@ void setup() {
   Timer1.attachInterrupt(periodic_routine);
 }
 
+// CRC-8, polynomial 0x07 (same as crc8() in trigger_protocol.py)
+byte crc8(const byte *data, byte length) {
+  byte crc = 0;
+  for (byte i = 0; i < length; i++) {
+    crc ^= data[i];
+    for (byte bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// sync | event code | sequence (u16) | micros() (u32) | CRC-8, little-endian
+void send_frame(byte event, unsigned long stamp) {
+  byte frame[9];
+  frame[0] = FRAME_SYNC;
+  frame[1] = event;
+  frame[2] = sequence & 0xFF;
+  frame[3] = sequence >> 8;
+  for (byte i = 0; i < 4; i++) {
+    frame[4 + i] = (stamp >> (8 * i)) & 0xFF;
+  }
+  frame[8] = crc8(frame, 8);
+  Serial.write(frame, 9);
+  sequence++;
+}
+
 void loop() {
   if (should_send) {
     should_send = false;
 
     // 1. Send the serial command
+#if BINARY_PROTOCOL
+    send_frame(EVENT_SHOW, micros());
+#else
     Serial.println("SHOW");
+#endif
     Serial.flush();  // ensure the message is fully sent before the TTL trigger
 
     // 2. Send a TTL pulse of 1 ms
@@ -1,13 +1,27 @@
+import os
+import sys
+import time
+
+import numpy as np
 from expyriment import design, control, stimuli, misc
 import serial
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import BinaryFramer
+from stimisation.serial_listener import READ_TIMEOUT, LineFramer, SerialListener
+
 # === Parameters ===
 SERIAL_PORT = '/dev/ttyACM0'  # Adjust if needed
 BAUDRATE = 115200
 SQUARE_DURATION = 100  # Duration of white square in ms
+POLL_TIMEOUT = 0.005   # Max wait for a command (s) before checking the control keys again
+BINARY_PROTOCOL = True  # Must match BINARY_PROTOCOL in the Arduino sketch
 
 # === Initialize Arduino & Expyriment ===
-arduino = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=0.1)
+arduino = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=READ_TIMEOUT)
+framer = BinaryFramer() if BINARY_PROTOCOL else LineFramer()
+listener = SerialListener(arduino, framer)
 
 exp = design.Experiment(name="Square Display on Serial Trigger")
 control.set_develop_mode(True)
@@ -21,19 +35,27 @@ blank.preload()
 control.start(skip_ready_screen=True)
 
 clock = misc.Clock()
+latencies_ms = []  # Serial byte arrival → end of square.present
+listener.start()
 print("✅ Ready. Waiting for 'SHOW' serial commands...")
 
 try:
     while True:
-        if arduino.in_waiting:
-            line = arduino.readline().decode(errors="ignore").strip()
-            if line == "SHOW":
-                square.present(update=True)
-                clock.wait(SQUARE_DURATION)
-                blank.present(update=True)
+        command = listener.get(timeout=POLL_TIMEOUT)
+        if command is not None and command.command == "SHOW":
+            square.present(update=True)
+            latencies_ms.append((time.perf_counter_ns() - command.arrival_ns) / 1e6)
+            clock.wait(SQUARE_DURATION)
+            blank.present(update=True)
         exp.keyboard.process_control_keys()
 except KeyboardInterrupt:
     print("🛑 Manually interrupted.")
 finally:
+    listener.stop()
     arduino.close()
+    if BINARY_PROTOCOL:
+        print(f"Frames received: {framer.n_frames}, dropped: {framer.n_dropped}, corrupted: {framer.n_corrupted}")
+    if latencies_ms:
+        print(f"Serial → present latency over {len(latencies_ms)} commands: mean {np.mean(latencies_ms):.2f} ms, "
+              f"min {np.min(latencies_ms):.2f}, max {np.max(latencies_ms):.2f}, jitter {np.std(latencies_ms):.2f} ms")
     control.end()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+import analyze_and_draw_arduino_csv as csv_params
+import analyze_and_draw_arduino_photodiode_wav as dual_params
+import analyze_and_draw_arduino_wav as arduino_params
+import analyze_and_draw_photodiode_wav as photodiode_params
+from stimisation.batch import analyze_batch
+
+# --- Parameters ---
+SUMMARY_FILENAME = 'batch_summary.csv'
+SETTINGS = {  # Each file type is analysed with the parameters of its single-file script
+    'csv': dict(sampling_rate=csv_params.SAMPLING_RATE, column=csv_params.SIGNAL_COLUMN,
+                min_distance_ms=csv_params.MIN_DISTANCE_MS, threshold_mode=csv_params.THRESHOLD_MODE,
+                onset_method=csv_params.ONSET_METHOD, period_ms=csv_params.PERIOD_MS, n_trials=csv_params.N_TRIALS),
+    'arduino': dict(min_distance_ms=arduino_params.MIN_DISTANCE_MS, threshold_mode=arduino_params.THRESHOLD_MODE,
+                    workers=arduino_params.WORKERS, period_ms=arduino_params.PERIOD_MS,
+                    n_trials=arduino_params.N_TRIALS),
+    'photodiode': dict(min_distance_ms=photodiode_params.MIN_INTERVAL_MS,
+                       threshold_mode=photodiode_params.THRESHOLD_MODE, workers=photodiode_params.WORKERS,
+                       period_ms=photodiode_params.PERIOD_MS, n_trials=photodiode_params.N_TRIALS,
+                       photodiode_filter=photodiode_params.PHOTO_FILTER),
+    'dual': dict(min_distance_ms=dual_params.MIN_DISTANCE_MS, threshold_mode=dual_params.THRESHOLD_MODE,
+                 onset_method=dual_params.ONSET_METHOD, match_mode=dual_params.MATCH_MODE,
+                 max_lag_ms=dual_params.MAX_LAG_MS, one_to_one=dual_params.ONE_TO_ONE, workers=dual_params.WORKERS,
+                 period_ms=dual_params.PERIOD_MS, n_trials=dual_params.N_TRIALS,
+                 photodiode_filter=dual_params.PHOTO_FILTER),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a directory (or glob) of trigger recordings in parallel.")
+    parser.add_argument('paths', nargs='+', help="Directories, files or glob patterns (CSV and WAV)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument('-o', '--output', default=SUMMARY_FILENAME, help="Merged summary CSV")
+    parser.add_argument('--single-channel', choices=['arduino', 'photodiode'], default='arduino',
+                        help="Analysis used for single-channel WAV files")
+    parser.add_argument('--cache', action='store_true',
+                        help="Reuse the events detected by a previous run (hashes every file on the first run)")
+    parser.add_argument('--export-dir', help="Also write one per-event table per file (Parquet, or .npz) here")
+    args = parser.parse_args(argv)
+
+    analyze_batch(args.paths, SETTINGS, args.output, args.workers, args.single_channel, args.cache, args.export_dir,
+                  'en')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import Messages
+from stimisation.benchmark import DEFAULT_SIZES, REPEATS, STAGES, compare, run_benchmarks
+
+messages = Messages('en')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic recordings.")
+    parser.add_argument('--sizes', type=float, nargs='+', default=DEFAULT_SIZES,
+                        help="Session lengths in samples (e.g. 1e5 1e6 1e9)")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="Best of N runs per case")
+    parser.add_argument('--workdir', help="Directory for the synthetic WAV files (default: system temp)")
+    parser.add_argument('-o', '--output', help="Save the results as JSON")
+    parser.add_argument('--baseline', help="JSON results of a previous run; exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks([int(size) for size in args.sizes], args.stages, args.repeats, args.workdir, 'en')
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(messages('results_saved', path=args.output))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f))
+        for row, reference in regressions:
+            print(messages('regression', stage=row['stage'], n=row['n_samples'], rate=row['samples_per_s'],
+                           reference=reference))
+        if regressions:
+            sys.exit(1)
+        print(messages('no_regression'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import Messages
+from stimisation.adaptive_threshold import detect_onsets
+from stimisation.clock_alignment import fit_piecewise_clock, load_stimulus_times, match_and_fit, report
+from stimisation.wav_reader import MappedWav
+
+# --- Parameters ---
+PHOTO_CHANNEL = 1
+MIN_DISTANCE_MS = 100.0
+
+messages = Messages('en')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate the drift between the stimulus log and photodiode onsets.")
+    parser.add_argument('log', help="Expyriment data file with a stimulus_time column (ms)")
+    parser.add_argument('wav', help="Recording with the photodiode channel")
+    parser.add_argument('--channel', type=int, default=PHOTO_CHANNEL, help="Photodiode channel in the WAV file")
+    parser.add_argument('--max-lag', type=float, default=50.0, help="Matching window after alignment (ms)")
+    parser.add_argument('--segments', type=int, default=1, help="Piecewise linear model with this many segments")
+    args = parser.parse_args(argv)
+
+    host_ms = load_stimulus_times(args.log)
+    wav = MappedWav(args.wav)
+    photo_ms = detect_onsets(wav.channel(args.channel), wav.sampling_rate, MIN_DISTANCE_MS,
+                             absolute=True) / wav.sampling_rate * 1000
+    print(messages('drift_header', n_log=len(host_ms), n_photo=len(photo_ms)))
+
+    fit, host_idx, photo_idx = match_and_fit(host_ms, photo_ms, args.max_lag)
+    print(messages('matched_events', n=len(host_idx)))
+    report(fit, 'host', 'recorder', 'en')
+    if args.segments > 1:
+        breaks, fits = fit_piecewise_clock(host_ms[host_idx], photo_ms[photo_idx], args.segments)
+        for start, segment_fit in zip(breaks, fits):
+            print(messages('drift_segment', start=start / 1000, ppm=segment_fit.drift_ppm, jitter=segment_fit.jitter))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,11 @@
-from expyriment import design, control, stimuli, misc
+import os
+import sys
+
+from expyriment import design, control, stimuli
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation import FrameTimingLog, PresentationScheduler, measure_frame_period, periodic_schedule
 
 # --- Setup Expyriment ---
 exp = design.Experiment(name="Stimuli_Only")
@@ -7,30 +14,48 @@ control.initialize(exp)
 
 PERIOD = 250
 SQUARE_DURATION = 100  # ms
+N_TRIALS = 10000
+FLIP_LEAD_MS = 3       # Presentation starts this early to absorb the flip duration
+GUARD_MS = 2.0         # Sleep until this close to each deadline, then spin-wait
+REFRESH_HZ = 60        # Display refresh rate (None: measured, needs blocking flips, i.e. develop mode off)
+ONSET_LOG = 'onset_log.csv'  # Planned vs actual onsets
+FRAME_LOG = 'frame_log.csv'  # Pre/post flip timestamps, frame index and missed frames of every flip
+SQUARE, BLANK = 0, 1         # Flip labels in FRAME_LOG
 
 square = stimuli.Rectangle((400, 400), position=(0, 0))
 blank = stimuli.BlankScreen()
 square.preload()
 blank.preload()
 
-exp.add_data_variable_names(['trial', 'stimulus_time'])
+exp.add_data_variable_names(['trial', 'stimulus_time', 'planned_time', 'frame', 'missed_frames'])
 
 control.start(skip_ready_screen=True)
-clock2 = misc.Clock()
-i = 1
-
-while i <= 10000:
-    while (clock2.time < i * PERIOD - 3):
-        pass
-
-    stim_time = clock2.time + square.present(update=True)
-
-    while (clock2.time - stim_time < SQUARE_DURATION - 3):
-        pass
-    blank.present(update=True)
-
-    exp.data.add([i, stim_time])
-    i += 1
-    exp.keyboard.process_control_keys()
+frame_period = 1000 / REFRESH_HZ if REFRESH_HZ else measure_frame_period(blank.present)
+scheduler = PresentationScheduler(periodic_schedule(N_TRIALS, PERIOD), guard_ms=GUARD_MS)
+frames = FrameTimingLog(2 * N_TRIALS, clock=scheduler.now, labels=('square', 'blank'))
+scheduler.start()
+
+try:
+    for i in range(N_TRIALS):
+        deadline = scheduler.planned[i] - FLIP_LEAD_MS
+        scheduler.wait_until(deadline)
+        stim_time = frames.flip(square.present, SQUARE, deadline)
+        scheduler.record(i, stim_time)
+
+        deadline = stim_time + SQUARE_DURATION - FLIP_LEAD_MS
+        scheduler.wait_until(deadline)
+        frames.flip(blank.present, BLANK, deadline)
+
+        exp.keyboard.process_control_keys()
+finally:
+    # Nothing is written during the presentation loop
+    flips = frames.table(frame_period)
+    for k in range(0, frames.n_flips, 2):
+        exp.data.add([k // 2 + 1, flips['post_ms'][k], scheduler.planned[k // 2], flips['frame'][k],
+                      flips['missed_frames'][k]])
+    print(scheduler.summary())
+    print(frames.summary(frame_period))
+    scheduler.save_log(ONSET_LOG)
+    frames.save(FRAME_LOG, frame_period)
 
 control.end()
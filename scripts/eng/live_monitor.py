@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.live_monitor import SoundDeviceSource, WavReplaySource, run
+
+# --- Parameters ---
+SAMPLING_RATE = 100000   # Hz, live input (--rate)
+REPORT_INTERVAL_S = 1.0  # Seconds between two status lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live Arduino trigger → photodiode latency monitor.")
+    parser.add_argument('--wav', help="Replay a 2-channel WAV recording instead of a live input")
+    parser.add_argument('--fast', action='store_true', help="Replay as fast as possible (not in real time)")
+    parser.add_argument('--device', help="Audio input device (name or index, see sounddevice)")
+    parser.add_argument('--rate', type=int, default=SAMPLING_RATE, help="Sampling rate of the live input (Hz)")
+    args = parser.parse_args(argv)
+
+    if args.wav:
+        source = WavReplaySource(args.wav, realtime=not args.fast)
+    else:
+        device = int(args.device) if args.device is not None and args.device.isdigit() else args.device
+        source = SoundDeviceSource(args.rate, device=device, language='en')
+    run(source, REPORT_INTERVAL_S, 'en')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+import analyser_et_tracer_arduino_csv as params_csv
+import analyser_et_tracer_arduino_photodiode_wav as params_double
+import analyser_et_tracer_arduino_wav as params_arduino
+import analyser_et_tracer_photodiode_wav as params_photodiode
+from stimisation.batch import analyze_batch
+
+# === Paramètres ===
+NOM_RESUME = 'resume_lots.csv'
+REGLAGES = {  # Chaque type de fichier est analysé avec les paramètres de son script mono-fichier
+    'csv': dict(sampling_rate=params_csv.SAMPLING_RATE, column=params_csv.COLONNE_SIGNAUX,
+                min_distance_ms=params_csv.DISTANCE_MIN_MS, threshold_mode=params_csv.MODE_SEUIL,
+                onset_method=params_csv.METHODE_ONSET, period_ms=params_csv.PERIODE_MS, n_trials=params_csv.N_ESSAIS),
+    'arduino': dict(min_distance_ms=params_arduino.DISTANCE_MIN_MS, threshold_mode=params_arduino.MODE_SEUIL,
+                    workers=params_arduino.PROCESSUS, period_ms=params_arduino.PERIODE_MS,
+                    n_trials=params_arduino.N_ESSAIS),
+    'photodiode': dict(min_distance_ms=params_photodiode.DISTANCE_MIN_MS, threshold_mode=params_photodiode.MODE_SEUIL,
+                       workers=params_photodiode.PROCESSUS, period_ms=params_photodiode.PERIODE_MS,
+                       n_trials=params_photodiode.N_ESSAIS, photodiode_filter=params_photodiode.FILTRE_PHOTO),
+    'dual': dict(min_distance_ms=params_double.DISTANCE_MIN_MS, threshold_mode=params_double.MODE_SEUIL,
+                 onset_method=params_double.METHODE_ONSET, match_mode=params_double.MODE_APPARIEMENT,
+                 max_lag_ms=params_double.DECALAGE_MAX_MS, one_to_one=params_double.UN_POUR_UN,
+                 workers=params_double.PROCESSUS, period_ms=params_double.PERIODE_MS, n_trials=params_double.N_ESSAIS,
+                 photodiode_filter=params_double.FILTRE_PHOTO),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse en parallèle un dossier (ou motif) d'enregistrements.")
+    parser.add_argument('chemins', nargs='+', help="Dossiers, fichiers ou motifs glob (CSV et WAV)")
+    parser.add_argument('-j', '--processus', type=int, default=os.cpu_count(),
+                        help="Nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument('-o', '--sortie', default=NOM_RESUME, help="CSV de résumé fusionné")
+    parser.add_argument('--mono-voie', choices=['arduino', 'photodiode'], default='arduino',
+                        help="Analyse utilisée pour les WAV à une seule voie")
+    parser.add_argument('--cache', action='store_true',
+                        help="Réutilise les événements d'une exécution précédente (hache chaque fichier la 1re fois)")
+    parser.add_argument('--export', help="Écrit aussi une table d'événements par fichier (Parquet, ou .npz) ici")
+    args = parser.parse_args(argv)
+
+    analyze_batch(args.chemins, REGLAGES, args.sortie, args.processus, args.mono_voie, args.cache, args.export, 'fr')
+
+
+if __name__ == '__main__':
+    main()
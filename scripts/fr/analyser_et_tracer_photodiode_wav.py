@@ -1,14 +1,24 @@
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Backend non interactif
-import matplotlib.pyplot as plt
-from scipy.io import wavfile
-from scipy.signal import find_peaks
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation import EventCache, analyze_photodiode_wav, run_reported
 
 # --- Paramètres ---
 NOM_FICHIER_WAV = 'expy_stimuli_only_pc_gaming_250ms.wav'  # Nom du fichier WAV à analyser
 DISTANCE_MIN_MS = 100.0                       # Intervalle minimal entre pics
+MODE_SEUIL = 'max'       # 'max' (80% du max global) ou 'adaptive' (niveaux glissants robustes, hystérésis)
+TRACE_ENVELOPPE = True   # Trace une enveloppe min/max (une paire par colonne de pixels) au lieu de chaque échantillon
+PICS_ZOOMES = 3          # Nombre de vues zoomées autour des pics détectés (mode enveloppe)
+FENETRE_ZOOM_MS = 150.0  # Demi-largeur de chaque vue zoomée (en ms)
+CACHE_EVENEMENTS = False  # Réutilise les événements déjà détectés (même fichier, mêmes paramètres)
+EXPORT = None             # Dossier des tables d'événements (Parquet, ou .npz sans pyarrow), None = aucun
+PROCESSUS = None          # Processus se partageant la détection d'un long enregistrement, None = un seul
+PERIODE_MS = None         # Période de stimulation attendue (ex. timer 500 ms) : repère manqués / doublés / décalés
+N_ESSAIS = None           # Nombre d'essais programmés, None = du premier au dernier événement
+FILTRE_PHOTO = None       # Nettoyage avant détection, ex. {'notch_hz': 50, 'n_harmonics': 3, 'lowpass_hz': 2000}
+                          # (secteur, scintillement) ; 'highpass_hz' retire la dérive de ligne de base
 
 def analyser_et_sauvegarder_graphique(nom_fichier):
     """
@@ -18,71 +28,11 @@ def analyser_et_sauvegarder_graphique(nom_fichier):
     - histogramme des intervalles
     - tracé du signal avec pics
     """
-    try:
-        sampling_rate, data = wavfile.read(nom_fichier)
-        print(f"\n--- Analyse du fichier : {nom_fichier} ---")
-        print(f"Taux d'échantillonnage : {sampling_rate} Hz")
-
-        if data.ndim > 1:
-            data = data[:, 0]
-
-        signal_abs = np.abs(data)
-        seuil = 0.8 * np.max(signal_abs)
-        print(f"Seuil de détection (80% amplitude max) : {int(seuil)}")
-
-        distance_min_samples = int(DISTANCE_MIN_MS * sampling_rate / 1000)
-
-        indices_pics, _ = find_peaks(signal_abs, height=seuil, distance=distance_min_samples)
-        intervalles_en_samples = np.diff(indices_pics)
-        intervalles_en_ms = (intervalles_en_samples / sampling_rate) * 1000
-
-        print(f"\nNombre de pics détectés : {len(indices_pics)}")
-        print(f"Nombre d'intervalles : {len(intervalles_en_ms)}")
-
-        if len(intervalles_en_ms) > 0:
-            moyenne = np.mean(intervalles_en_ms)
-            print(f"Intervalle moyen : {moyenne:.2f} ms")
-            print(f"Min : {np.min(intervalles_en_ms):.2f} ms")
-            print(f"Max : {np.max(intervalles_en_ms):.2f} ms")
-
-            # --- Histogramme des intervalles ---
-            plt.figure(figsize=(12, 6))
-            plt.hist(intervalles_en_ms, bins=50, edgecolor='black', alpha=0.75)
-            plt.axvline(moyenne, color='red', linestyle='--', linewidth=2, label=f'Moyenne = {moyenne:.2f} ms')
-            plt.title(f"Distribution des intervalles — {os.path.basename(nom_fichier)}", fontsize=14)
-            plt.xlabel("Durée de l'intervalle (ms)")
-            plt.ylabel("Nombre d'intervalles")
-            plt.legend()
-            plt.grid(True, linestyle='--', alpha=0.6)
-
-            output_dir = 'figures'
-            os.makedirs(output_dir, exist_ok=True)
-            base_name = os.path.splitext(os.path.basename(nom_fichier))[0]
-            save_hist_path = os.path.join(output_dir, f'distribution_intervalles_{base_name}.png')
-            plt.savefig(save_hist_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"\nHistogramme sauvegardé : {save_hist_path}")
-
-            # --- Tracé du signal avec pics ---
-            plt.figure(figsize=(15, 5))
-            plt.plot(data, label='Signal')
-            plt.plot(indices_pics, data[indices_pics], 'rx', label='Pics détectés')
-            plt.title(f"Signal et pics détectés — {base_name}")
-            plt.xlabel("Échantillons")
-            plt.ylabel("Amplitude")
-            plt.legend()
-            save_signal_path = os.path.join(output_dir, f'signal_pics_{base_name}.png')
-            plt.savefig(save_signal_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"Tracé du signal sauvegardé : {save_signal_path}")
-
-        else:
-            print("Aucun intervalle détecté — pas de figure générée.")
-
-    except FileNotFoundError:
-        print(f"ERREUR : Le fichier '{nom_fichier}' est introuvable.")
-    except Exception as e:
-        print(f"Une erreur est survenue : {e}")
+    return run_reported(analyze_photodiode_wav, nom_fichier, 'fr', min_distance_ms=DISTANCE_MIN_MS,
+                        threshold_mode=MODE_SEUIL, envelope=TRACE_ENVELOPPE, zoom_peaks=PICS_ZOOMES,
+                        zoom_window_ms=FENETRE_ZOOM_MS,
+                        cache=EventCache() if CACHE_EVENEMENTS else None, export_dir=EXPORT, workers=PROCESSUS,
+                        period_ms=PERIODE_MS, n_trials=N_ESSAIS, photodiode_filter=FILTRE_PHOTO)
 
 # --- Lancement automatique ---
 if __name__ == '__main__':
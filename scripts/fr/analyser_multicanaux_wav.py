@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation import EventCache, analyze_multichannel_wav, run_reported
+from stimisation.multichannel import parse_role
+
+# === Paramètres ===
+NOM_FICHIER_WAV = 'arduino_trigger_master_timer_500ms_both_2.wav'
+ROLES = {                   # Nom : (canal, type), type parmi 'ttl', 'photodiode', 'button', 'meg_trigger'
+    'ttl': (0, 'ttl'),
+    'photodiode': (1, 'photodiode'),
+}
+PAIRES = None               # Paires (source, cible) à comparer, ex. [('ttl', 'photodiode')] (None = toutes)
+DISTANCE_MIN_MS = 100.0
+MODE_APPARIEMENT = 'after'  # 'after' (premier événement cible après l'événement source) ou 'nearest'
+DECALAGE_MAX_MS = None      # Rejette les paires plus éloignées (None = moitié de la période source)
+UN_POUR_UN = True           # Un événement cible n'est jamais apparié à deux événements source
+METHODE_ONSET = 'crossing'  # Instant sub-échantillon : 'crossing', 'parabolic' ou None (échantillons entiers)
+MODE_SEUIL = 'max'          # 'max' (fraction du max global) ou 'adaptive' (niveaux glissants, hystérésis)
+CACHE_EVENEMENTS = False    # Réutilise les événements déjà détectés (même fichier, mêmes paramètres)
+EXPORT = None               # Dossier des tables d'événements (Parquet, ou .npz sans pyarrow), None = aucun
+PROCESSUS = None            # Processus se partageant la détection d'un long enregistrement, None = un seul
+FILTRE_PHOTO = None         # Nettoyage des voies 'photodiode' avant détection, ex. {'notch_hz': 50, 'lowpass_hz': 2000}
+
+def analyser_canaux_wav(nom_fichier, roles=ROLES):
+    return run_reported(analyze_multichannel_wav, nom_fichier, 'fr', roles=roles, pairs=PAIRES,
+                        min_distance_ms=DISTANCE_MIN_MS, threshold_mode=MODE_SEUIL, onset_method=METHODE_ONSET,
+                        match_mode=MODE_APPARIEMENT, max_lag_ms=DECALAGE_MAX_MS, one_to_one=UN_POUR_UN,
+                        cache=EventCache() if CACHE_EVENEMENTS else None, export_dir=EXPORT, workers=PROCESSUS,
+                        photodiode_filter=FILTRE_PHOTO)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Événements et délais par paire de toutes les voies d'un WAV.")
+    parser.add_argument('nom_fichier', nargs='?', default=NOM_FICHIER_WAV)
+    parser.add_argument('--role', action='append', type=parse_role, metavar='NOM=CANAL:TYPE',
+                        help="Remplace ROLES (une option par voie), ex. --role ttl=0:ttl --role photo=1:photodiode")
+    args = parser.parse_args()
+    analyser_canaux_wav(args.nom_fichier, dict(args.role) if args.role else ROLES)
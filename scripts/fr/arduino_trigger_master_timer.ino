@@ -1,7 +1,14 @@
 #include <TimerOne.h>
 
+// 1 : trames binaires de 9 octets (voir stimisation/trigger_protocol.py), 0 : lignes texte "SHOW"
+#define PROTOCOLE_BINAIRE 1
+
 const int triggerPin = 8;
+const byte SYNCHRO_TRAME = 0xA5;
+const byte EVENEMENT_SHOW = 1;
+
 volatile bool doit_envoyer = false;
+uint16_t sequence = 0;
 
 void setup() {
   Serial.begin(115200);
@@ -13,12 +20,43 @@ void setup() {
   Timer1.attachInterrupt(routine_periode);
 }
 
+// CRC-8, polynôme 0x07 (identique à crc8() dans trigger_protocol.py)
+byte crc8(const byte *donnees, byte longueur) {
+  byte crc = 0;
+  for (byte i = 0; i < longueur; i++) {
+    crc ^= donnees[i];
+    for (byte bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// synchro | code d'événement | séquence (u16) | micros() (u32) | CRC-8, petit-boutiste
+void envoyer_trame(byte evenement, unsigned long horodatage) {
+  byte trame[9];
+  trame[0] = SYNCHRO_TRAME;
+  trame[1] = evenement;
+  trame[2] = sequence & 0xFF;
+  trame[3] = sequence >> 8;
+  for (byte i = 0; i < 4; i++) {
+    trame[4 + i] = (horodatage >> (8 * i)) & 0xFF;
+  }
+  trame[8] = crc8(trame, 8);
+  Serial.write(trame, 9);
+  sequence++;
+}
+
 void loop() {
   if (doit_envoyer) {
     doit_envoyer = false;
 
     // 1. Envoi de la commande série
+#if PROTOCOLE_BINAIRE
+    envoyer_trame(EVENEMENT_SHOW, micros());
+#else
     Serial.println("SHOW");
+#endif
     Serial.flush();  // assure la transmission complète avant TTL
 
     // 2. Envoi du trigger TTL de 1 ms
@@ -1,13 +1,27 @@
+import os
+import sys
+import time
+
+import numpy as np
 from expyriment import design, control, stimuli, misc
 import serial
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation import BinaryFramer
+from stimisation.serial_listener import READ_TIMEOUT, LineFramer, SerialListener
+
 # === Paramètres ===
 SERIAL_PORT = '/dev/ttyACM0'  # À adapter si nécessaire
 BAUDRATE = 115200
 SQUARE_DURATION = 100  # Durée en ms du carré blanc
+ATTENTE_MAX = 0.005    # Attente maximale d'une commande (s) avant de revérifier les touches de contrôle
+PROTOCOLE_BINAIRE = True  # Doit correspondre à PROTOCOLE_BINAIRE dans le sketch Arduino
 
 # === Initialisation Arduino & Expyriment ===
-arduino = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=0.1)
+arduino = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=READ_TIMEOUT)
+decodeur = BinaryFramer() if PROTOCOLE_BINAIRE else LineFramer()
+ecoute = SerialListener(arduino, decodeur)
 
 exp = design.Experiment(name="Square Display on Serial Trigger")
 control.set_develop_mode(True)
@@ -21,19 +35,28 @@ blank.preload()
 control.start(skip_ready_screen=True)
 
 clock = misc.Clock()
+latences_ms = []  # Arrivée de l'octet série → fin de square.present
+ecoute.start()
 print("✅ Prêt. Attente des commandes série 'SHOW'...")
 
 try:
     while True:
-        if arduino.in_waiting:
-            line = arduino.readline().decode(errors="ignore").strip()
-            if line == "SHOW":
-                square.present(update=True)
-                clock.wait(SQUARE_DURATION)
-                blank.present(update=True)
+        commande = ecoute.get(timeout=ATTENTE_MAX)
+        if commande is not None and commande.command == "SHOW":
+            square.present(update=True)
+            latences_ms.append((time.perf_counter_ns() - commande.arrival_ns) / 1e6)
+            clock.wait(SQUARE_DURATION)
+            blank.present(update=True)
         exp.keyboard.process_control_keys()
 except KeyboardInterrupt:
     print("🛑 Interrompu manuellement.")
 finally:
+    ecoute.stop()
     arduino.close()
+    if PROTOCOLE_BINAIRE:
+        print(f"Trames reçues : {decodeur.n_frames}, perdues : {decodeur.n_dropped}, "
+              f"corrompues : {decodeur.n_corrupted}")
+    if latences_ms:
+        print(f"Latence série → affichage sur {len(latences_ms)} commandes : moyenne {np.mean(latences_ms):.2f} ms, "
+              f"min {np.min(latences_ms):.2f}, max {np.max(latences_ms):.2f}, gigue {np.std(latences_ms):.2f} ms")
     control.end()
@@ -0,0 +1,45 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation import Messages
+from stimisation.benchmark import DEFAULT_SIZES, REPEATS, STAGES, compare, run_benchmarks
+
+messages = Messages('fr')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai de la chaîne d'analyse sur des enregistrements "
+                                                 "synthétiques.")
+    parser.add_argument('--tailles', type=float, nargs='+', default=DEFAULT_SIZES,
+                        help="Durées des sessions en échantillons (ex. 1e5 1e6 1e9)")
+    parser.add_argument('--etapes', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repetitions', type=int, default=REPEATS, help="Meilleure de N mesures par cas")
+    parser.add_argument('--dossier', help="Dossier des WAV synthétiques (défaut : dossier temporaire du système)")
+    parser.add_argument('-o', '--sortie', help="Sauvegarde les résultats en JSON")
+    parser.add_argument('--reference', help="Résultats JSON d'une exécution précédente ; statut 1 si régression")
+    args = parser.parse_args(argv)
+
+    resultats = run_benchmarks([int(taille) for taille in args.tailles], args.etapes, args.repetitions, args.dossier,
+                               'fr')
+    if args.sortie:
+        with open(args.sortie, 'w') as f:
+            json.dump(resultats, f, indent=2)
+        print(messages('results_saved', path=args.sortie))
+
+    if args.reference:
+        with open(args.reference) as f:
+            regressions = compare(resultats, json.load(f))
+        for ligne, reference in regressions:
+            print(messages('regression', stage=ligne['stage'], n=ligne['n_samples'], rate=ligne['samples_per_s'],
+                           reference=reference))
+        if regressions:
+            sys.exit(1)
+        print(messages('no_regression'))
+
+
+if __name__ == '__main__':
+    main()
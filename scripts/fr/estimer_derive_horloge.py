@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation import Messages
+from stimisation.adaptive_threshold import detect_onsets
+from stimisation.clock_alignment import fit_piecewise_clock, load_stimulus_times, match_and_fit, report
+from stimisation.wav_reader import MappedWav
+
+# === Paramètres ===
+CANAL_PHOTO = 1
+DISTANCE_MIN_MS = 100.0
+
+messages = Messages('fr')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estime la dérive entre le journal des stimuli et les onsets "
+                                                 "de la photodiode.")
+    parser.add_argument('journal', help="Fichier de données Expyriment avec une colonne stimulus_time (ms)")
+    parser.add_argument('wav', help="Enregistrement contenant la voie photodiode")
+    parser.add_argument('--canal', type=int, default=CANAL_PHOTO, help="Voie de la photodiode dans le fichier WAV")
+    parser.add_argument('--decalage-max', type=float, default=50.0,
+                        help="Fenêtre d'appariement après alignement (ms)")
+    parser.add_argument('--segments', type=int, default=1, help="Modèle linéaire par morceaux à ce nombre de segments")
+    args = parser.parse_args(argv)
+
+    hote_ms = load_stimulus_times(args.journal)
+    wav = MappedWav(args.wav)
+    photo_ms = detect_onsets(wav.channel(args.canal), wav.sampling_rate, DISTANCE_MIN_MS,
+                             absolute=True) / wav.sampling_rate * 1000
+    print(messages('drift_header', n_log=len(hote_ms), n_photo=len(photo_ms)))
+
+    modele, idx_hote, idx_photo = match_and_fit(hote_ms, photo_ms, args.decalage_max)
+    print(messages('matched_events', n=len(idx_hote)))
+    report(modele, 'hote', 'enregistreur', 'fr')
+    if args.segments > 1:
+        debuts, modeles = fit_piecewise_clock(hote_ms[idx_hote], photo_ms[idx_photo], args.segments)
+        for debut, modele_segment in zip(debuts, modeles):
+            print(messages('drift_segment', start=debut / 1000, ppm=modele_segment.drift_ppm,
+                           jitter=modele_segment.jitter))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,11 @@
-from expyriment import design, control, stimuli, misc
+import os
+import sys
+
+from expyriment import design, control, stimuli
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation import FrameTimingLog, PresentationScheduler, measure_frame_period, periodic_schedule
 
 # --- Setup Expyriment ---
 exp = design.Experiment(name="Stimuli_Only")
@@ -7,30 +14,48 @@ control.initialize(exp)
 
 PERIOD = 250 # Intervalle total en ms
 SQUARE_DURATION = 100  # ms
+N_ESSAIS = 10000
+AVANCE_FLIP_MS = 3     # La présentation démarre en avance pour absorber la durée du flip
+GARDE_MS = 2.0         # Sommeil jusqu'à cette marge avant chaque échéance, puis attente active
+FREQUENCE_ECRAN_HZ = 60  # Fréquence de rafraîchissement (None : mesurée, flips bloquants, mode développement coupé)
+JOURNAL_ONSETS = 'journal_onsets.csv'  # Onsets prévus / réels
+JOURNAL_IMAGES = 'journal_images.csv'  # Temps avant / après chaque flip, indice d'image et images manquées
+CARRE, VIDE = 0, 1                     # Étiquettes des flips dans JOURNAL_IMAGES
 
 square = stimuli.Rectangle((400, 400), position=(0, 0))
 blank = stimuli.BlankScreen()
 square.preload()
 blank.preload()
 
-exp.add_data_variable_names(['trial', 'stimulus_time'])
+exp.add_data_variable_names(['trial', 'stimulus_time', 'planned_time', 'frame', 'missed_frames'])
 
 control.start(skip_ready_screen=True)
-clock2 = misc.Clock()
-i = 1
-
-while i <= 10000:
-    while (clock2.time < i * PERIOD - 3):
-        pass
-
-    stim_time = clock2.time + square.present(update=True)
-
-    while (clock2.time - stim_time < SQUARE_DURATION - 3):
-        pass
-    blank.present(update=True)
-
-    exp.data.add([i, stim_time])
-    i += 1
-    exp.keyboard.process_control_keys()
+periode_image = 1000 / FREQUENCE_ECRAN_HZ if FREQUENCE_ECRAN_HZ else measure_frame_period(blank.present)
+planificateur = PresentationScheduler(periodic_schedule(N_ESSAIS, PERIOD), guard_ms=GARDE_MS)
+images = FrameTimingLog(2 * N_ESSAIS, clock=planificateur.now, labels=('carre', 'vide'))
+planificateur.start()
+
+try:
+    for i in range(N_ESSAIS):
+        echeance = planificateur.planned[i] - AVANCE_FLIP_MS
+        planificateur.wait_until(echeance)
+        stim_time = images.flip(square.present, CARRE, echeance)
+        planificateur.record(i, stim_time)
+
+        echeance = stim_time + SQUARE_DURATION - AVANCE_FLIP_MS
+        planificateur.wait_until(echeance)
+        images.flip(blank.present, VIDE, echeance)
+
+        exp.keyboard.process_control_keys()
+finally:
+    # Rien n'est écrit pendant la boucle de présentation
+    flips = images.table(periode_image)
+    for k in range(0, images.n_flips, 2):
+        exp.data.add([k // 2 + 1, flips['post_ms'][k], planificateur.planned[k // 2], flips['frame'][k],
+                      flips['missed_frames'][k]])
+    print(planificateur.summary())
+    print(images.summary(periode_image))
+    planificateur.save_log(JOURNAL_ONSETS)
+    images.save(JOURNAL_IMAGES, periode_image)
 
 control.end()
@@ -0,0 +1,34 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # paquet stimisation
+
+from stimisation.live_monitor import SoundDeviceSource, WavReplaySource, run
+
+# === Paramètres ===
+SAMPLING_RATE = 100000      # Hz, entrée en direct (--frequence)
+INTERVALLE_RAPPORT_S = 1.0  # Secondes entre deux lignes d'état
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Moniteur en direct du délai trigger Arduino → photodiode.")
+    parser.add_argument('--wav', help="Rejoue un enregistrement WAV à 2 voies au lieu d'une entrée en direct")
+    parser.add_argument('--rapide', action='store_true', help="Rejoue aussi vite que possible (pas en temps réel)")
+    parser.add_argument('--peripherique', help="Périphérique d'entrée audio (nom ou indice, voir sounddevice)")
+    parser.add_argument('--frequence', type=int, default=SAMPLING_RATE,
+                        help="Taux d'échantillonnage de l'entrée en direct (Hz)")
+    args = parser.parse_args(argv)
+
+    if args.wav:
+        source = WavReplaySource(args.wav, realtime=not args.rapide)
+    else:
+        peripherique = args.peripherique
+        if peripherique is not None and peripherique.isdigit():
+            peripherique = int(peripherique)
+        source = SoundDeviceSource(args.frequence, device=peripherique, language='fr')
+    run(source, INTERVALLE_RAPPORT_S, 'fr')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Core library of the trigger / photodiode analyses, shared by the English
+(`scripts/eng`) and French (`scripts/fr`) scripts:
+loaders → detectors → matching → stats → reporting, chained by `pipelines`.
+"""
+
+from .batch import analyze_batch, analyze_file
+from .detectors import Detection, detect_events
+from .edge_detection import TtlEdges, detect_edges
+from .epochs import EpochShapes, epoch_shapes
+from .event_cache import EventCache
+from .export import event_table, export_events, read_event_tables, write_event_table
+from .filtering import FilteredChannel, StreamingFilter, design_filter, filter_signal
+from .frame_timing import FrameTimingLog, measure_frame_period
+from .live_monitor import LiveMonitor, RingBuffer, SoundDeviceSource, WavReplaySource
+from .loaders import CsvRecording, open_recording
+from .multichannel import ChannelRole, DelayMatrix, delay_matrix, detect_all_channels, make_roles
+from .messages import LANGUAGES, Messages
+from .pipelines import (AnalysisResult, analyze_csv, analyze_dual_wav, analyze_multichannel_wav, analyze_photodiode_wav,
+                        analyze_trigger_wav, run_reported)
+from .presentation_scheduler import PresentationScheduler, periodic_schedule
+from .reporting import Reporter
+from .schedule import SLOT_STATUSES, ScheduleAlignment, align_schedule, schedule_counts
+from .serial_listener import LineFramer, SerialCommand, SerialListener
+from .stats import DelayStats, IntervalStats, delay_stats, interval_stats
+from .streaming_stats import LatencySummary, StreamingStats
+from .trigger_matching import MatchResult, bounded_lag, match_events
+from .trigger_protocol import BinaryFramer, LoopbackSerial, TriggerFrame, decode_frame, encode_frame
+from .wav_reader import MappedWav
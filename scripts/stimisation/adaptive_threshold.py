@@ -0,0 +1,173 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- Parameters ---
+WINDOW_MS = 1000.0       # Length of the windows on which the levels are estimated
+OVERLAP = 4              # Estimates per window length (hop = window / OVERLAP)
+HIGH_RATIO = 0.5         # Switch-on level, as a fraction of the baseline → top range
+LOW_RATIO = 0.25         # Switch-off level (hysteresis), same scale
+BASELINE = 'percentile'  # Baseline estimate: 'percentile' (BASELINE_PCT) or 'median' (median, with MAD noise)
+BASELINE_PCT = 5.0       # Rolling percentile used as baseline
+TOP_PCT = 99.9           # Rolling percentile used as pulse amplitude (ignores isolated artifacts)
+MIN_SNR = 8.0            # Windows whose range is below MIN_SNR robust sigmas contain no pulse
+BLOCK_HOPS = 16          # Hops processed per block by `detect_onsets`
+
+BASELINES = ('percentile', 'median')
+
+
+class AdaptiveThreshold:
+    """
+    Rolling robust switching levels from overlapping windows.
+
+    A window of `window` samples is centred on every hop of window / OVERLAP
+    samples; in each one, top = TOP_PCT percentile, sigma = 1.4826 * MAD
+    around the median, and the baseline is the BASELINE_PCT percentile or
+    the median (`baseline='median'`). The levels
+    baseline + ratio * (top - baseline) are linearly interpolated between the
+    window centres, so they follow a drift without steps. A window without
+    pulses (range below `min_snr` sigmas) keeps the levels of the previous
+    valid window, so a single artifact spike or a silent stretch never resets
+    the detection. All windows of a block are measured in one vectorized pass.
+    """
+
+    def __init__(self, window, high_ratio=HIGH_RATIO, low_ratio=LOW_RATIO, baseline=BASELINE,
+                 baseline_pct=BASELINE_PCT, top_pct=TOP_PCT, min_snr=MIN_SNR, overlap=OVERLAP, absolute=False):
+        if not 0 <= low_ratio < high_ratio:
+            raise ValueError("Hysteresis needs 0 <= low_ratio < high_ratio.")
+        if baseline not in BASELINES:
+            raise ValueError(f"Unknown baseline '{baseline}', expected one of {BASELINES}.")
+        self.window = max(1, int(window))
+        self.hop = max(1, self.window // overlap)
+        self.high_ratio = high_ratio
+        self.low_ratio = low_ratio
+        self.baseline = baseline
+        self.percentiles = (baseline_pct, top_pct)
+        self.min_snr = min_snr
+        self.absolute = absolute
+        self._carry = None  # (hop index, high, low) of the first estimate of the next block
+
+    def _window_levels(self, windows):
+        baseline, median, top = np.percentile(windows, (self.percentiles[0], 50, self.percentiles[1]), axis=1)
+        if self.baseline == 'median':
+            baseline = median
+        sigma = 1.4826 * np.median(np.abs(windows - median[:, None]), axis=1)
+        span = top - baseline
+        high = baseline + self.high_ratio * span
+        low = baseline + self.low_ratio * span
+        valid = span > self.min_snr * sigma
+        return high, low, valid
+
+    def levels(self, signal, start, stop):
+        """
+        Per-sample (high, low) levels of samples [start, stop) of `signal`
+        (array or memory-mapped channel), read with half a window of context
+        on each side. Blocks must be consecutive and start on a hop boundary.
+        """
+        n = len(signal)
+        hop = self.hop
+        window = min(self.window, n)
+        index = np.arange(max(start // hop - 1, 0), min((stop - 1) // hop + 1, (n - 1) // hop) + 1)
+        centres = index * hop + (hop - 1) / 2
+        starts = np.clip(index * hop + hop // 2 - window // 2, 0, n - window)
+        values = np.asarray(signal[starts[0]:starts[-1] + window], dtype=float)
+        if self.absolute:
+            values = np.abs(values)
+        high, low, valid = self._window_levels(sliding_window_view(values, window)[starts - starts[0]])
+
+        if self._carry is not None and self._carry[0] == index[0]:
+            high[0], low[0] = self._carry[1:]  # Already forward-filled by the previous block
+            valid[0] = np.isfinite(high[0])
+        # Invalid windows inherit the last valid levels (forward fill), none before the first valid one
+        source = np.maximum.accumulate(np.where(valid, np.arange(len(valid)), -1))
+        high = np.where(source >= 0, high[np.maximum(source, 0)], np.inf)
+        low = np.where(source >= 0, low[np.maximum(source, 0)], np.inf)
+        next_first = stop // hop - 1 - index[0]
+        if 0 <= next_first < len(index):
+            self._carry = (index[next_first], high[next_first], low[next_first])
+
+        positions = np.arange(start, stop)
+        unset = np.interp(positions, centres, (~np.isfinite(high)).astype(float)) > 0
+        high = np.interp(positions, centres, np.where(np.isfinite(high), high, 0))
+        low = np.interp(positions, centres, np.where(np.isfinite(low), low, 0))
+        return np.where(unset, np.inf, high), np.where(unset, np.inf, low)
+
+
+class HysteresisDetector:
+    """
+    Schmitt-trigger onset detector fed block by block.
+
+    The output switches on when the signal reaches the high level and off when
+    it falls below the low level, so noise around a single threshold cannot
+    produce extra events. Switching is computed with a vectorized forward fill;
+    each onset is returned as a fractional sample index, linearly interpolated
+    at the high level. Onsets closer than `min_distance` samples to the
+    previous accepted one are dropped (refractory window).
+    """
+
+    def __init__(self, min_distance=0, absolute=False):
+        self.min_distance = min_distance
+        self.absolute = absolute
+        self._state = False
+        self._previous = None  # Last sample of the previous block
+        self._offset = 0
+        self._last_onset = -np.inf
+
+    def feed(self, block, high, low):
+        """Processes the next block with its per-sample levels and returns the onset times found in it."""
+        x = np.asarray(block, dtype=float)
+        if self.absolute:
+            x = np.abs(x)
+        n = len(x)
+        if n == 0:
+            return np.empty(0)
+
+        # -1: keep the previous state, 1: switch on, 0: switch off
+        event = np.full(n, -1, dtype=np.int8)
+        event[x < low] = 0
+        event[x >= high] = 1
+        source = np.maximum.accumulate(np.where(event >= 0, np.arange(n), -1))
+        state = np.where(source >= 0, event[np.maximum(source, 0)] == 1, self._state)
+        previous_state = np.concatenate(([self._state], state[:-1]))
+        rising = np.flatnonzero(state & ~previous_state)
+
+        # Interpolate between the sample before the onset and the onset sample
+        before = np.concatenate(([x[0] if self._previous is None else self._previous], x[:-1]))
+        y0, y1, level = before[rising], x[rising], high[rising]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(y1 > y0, (level - y0) / (y1 - y0), 1.0)
+        onsets = self._offset + rising - 1 + np.clip(fraction, 0.0, 1.0)
+
+        self._state = bool(state[-1])
+        self._previous = x[-1]
+        self._offset += n
+        return self._refractory(onsets)
+
+    def _refractory(self, onsets):
+        if self.min_distance <= 0 or len(onsets) == 0:
+            return onsets
+        keep = np.ones(len(onsets), dtype=bool)
+        last = self._last_onset
+        for k, onset in enumerate(onsets):  # Only runs over the (few) onsets
+            if onset - last < self.min_distance:
+                keep[k] = False
+            else:
+                last = onset
+        self._last_onset = last
+        return onsets[keep]
+
+
+def detect_onsets(signal, sampling_rate, min_distance_ms, absolute=False, window_ms=WINDOW_MS,
+                  high_ratio=HIGH_RATIO, low_ratio=LOW_RATIO, baseline=BASELINE):
+    """
+    Single streaming pass of adaptive hysteresis detection over an array or a
+    memory-mapped channel. Returns the fractional onset indices.
+    """
+    window = int(window_ms * sampling_rate / 1000)
+    threshold = AdaptiveThreshold(window, high_ratio, low_ratio, baseline, absolute=absolute)
+    detector = HysteresisDetector(int(min_distance_ms * sampling_rate / 1000), absolute)
+    block_size = threshold.hop * BLOCK_HOPS
+    onsets = []
+    for start in range(0, len(signal), block_size):
+        stop = min(start + block_size, len(signal))
+        onsets.append(detector.feed(signal[start:stop], *threshold.levels(signal, start, stop)))
+    return np.concatenate(onsets) if onsets else np.empty(0)
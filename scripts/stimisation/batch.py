@@ -0,0 +1,144 @@
+import csv
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .event_cache import EventCache
+from .messages import Messages
+from .pipelines import analyze_csv, analyze_dual_wav, analyze_photodiode_wav, analyze_trigger_wav
+from .reporting import Reporter
+from .schedule import SLOT_STATUSES, schedule_counts
+from .streaming_stats import StreamingStats
+from .wav_reader import MappedWav
+
+# --- Parameters ---
+SUMMARY_COLUMNS = ['file', 'type', 'sampling_rate', 'n_peaks', 'mean_interval_ms', 'min_interval_ms',
+                   'max_interval_ms', 'std_interval_ms', 'n_photo_peaks', 'n_matched', 'n_unmatched',
+                   'n_orphans', 'mean_delay_ms', 'min_delay_ms', 'max_delay_ms', 'jitter_ms', 'p50_delay_ms',
+                   'p95_delay_ms', 'p99_delay_ms', 'p999_delay_ms']
+SUMMARY_COLUMNS += [f'slots_{status}' for status in SLOT_STATUSES] + ['error']  # Schedule of the last channel
+
+ANALYSES = {'csv': analyze_csv, 'arduino': analyze_trigger_wav, 'photodiode': analyze_photodiode_wav,
+            'dual': analyze_dual_wav}
+
+
+def find_recordings(paths):
+    """Expands directories (CSV and WAV files inside) and glob patterns into a sorted file list."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in ('*.csv', '*.wav', '*.CSV', '*.WAV'):
+                files.extend(glob.glob(os.path.join(path, ext)))
+        else:
+            files.extend(glob.glob(path))
+    return sorted(set(files))
+
+
+def detect_file_type(filename, single_channel_kind='arduino'):
+    """'csv', 'dual' (Arduino + photodiode WAV) or the kind given for single-channel WAV files."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext == '.wav':
+        return 'dual' if MappedWav(filename).n_channels >= 2 else single_channel_kind
+    raise ValueError(f"Unsupported file type '{ext}'.")
+
+
+def analyze_file(filename, settings, single_channel_kind='arduino', use_cache=False, export_dir=None):
+    """
+    Runs the analysis matching the file type and returns one summary row (no
+    figures) and the StreamingStats of its delays, to be pooled across files.
+    The per-event table is written into `export_dir` when given.
+
+    `settings` maps each file type ('csv', 'arduino', 'photodiode', 'dual')
+    to the keyword arguments of its analysis, i.e. the parameters of its
+    single-file script, including period_ms / n_trials (schedule counts of
+    the photodiode, or of the only channel, in the `slots_*` columns),
+    photodiode_filter and workers (processes per file, on top of the batch
+    workers). The response epochs are left out: the response shape is only
+    drawn, and batch mode draws no figure.
+    """
+    row = {'file': filename}
+    pooled = StreamingStats()
+    cache = EventCache() if use_cache else None
+    quiet = Reporter(verbose=False, output_dir=None)
+    try:
+        file_type = detect_file_type(filename, single_channel_kind)
+        row['type'] = file_type
+
+        result = ANALYSES[file_type](filename, cache=cache, reporter=quiet, export_dir=export_dir,
+                                     **settings[file_type])
+        if file_type == 'dual':
+            delays = result.delays
+            row.update(n_photo_peaks=result.intervals[1].n_events, n_matched=len(delays.delays_ms),
+                       n_unmatched=delays.n_unmatched, n_orphans=delays.n_orphans)
+            if len(delays.delays_ms) > 0:
+                row.update(mean_delay_ms=delays.mean, min_delay_ms=delays.min, max_delay_ms=delays.max,
+                           jitter_ms=delays.jitter, p50_delay_ms=delays.distribution.p50,
+                           p95_delay_ms=delays.distribution.p95, p99_delay_ms=delays.distribution.p99,
+                           p999_delay_ms=delays.distribution.p999)
+                pooled.update(delays.delays_ms)
+
+        stats = result.intervals[0]
+        row.update(sampling_rate=result.sampling_rate, n_peaks=stats.n_events)
+        if result.schedules and result.schedules[-1] is not None:
+            row.update({f'slots_{status}': count for status, count in schedule_counts(result.schedules[-1]).items()})
+        if len(stats.intervals_ms) > 0:
+            row.update(mean_interval_ms=stats.mean, min_interval_ms=stats.min, max_interval_ms=stats.max,
+                       std_interval_ms=stats.std)
+    except Exception as e:
+        row['error'] = str(e)
+    return row, pooled
+
+
+def write_summary(rows, path):
+    """Writes one CSV line per file, floats rounded to the µs."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: round(float(value), 3) if isinstance(value, (float, np.floating)) else value
+                             for key, value in row.items()})
+
+
+def analyze_batch(paths, settings, output, workers=None, single_channel_kind='arduino', use_cache=False,
+                  export_dir=None, language='en'):
+    """
+    Analyzes every CSV / WAV file under `paths` (see `analyze_file`) on
+    `workers` processes, prints one line per file and the delays pooled
+    across files, and writes the summary CSV to `output`. Returns the rows.
+    """
+    messages = Messages(language)
+    # Never analyse a previous summary written into the same folder
+    files = [f for f in find_recordings(paths) if os.path.abspath(f) != os.path.abspath(output)]
+    if not files:
+        print(messages('batch_no_file'))
+        return []
+    print(messages('batch_header', n=len(files), workers=workers or os.cpu_count()))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(analyze_file, files, [settings] * len(files), [single_channel_kind] * len(files),
+                                    [use_cache] * len(files), [export_dir] * len(files)))
+    rows = [row for row, _ in results]
+
+    for row in rows:
+        if 'error' in row:
+            print(messages('batch_file_error', filename=row['file'], error=row['error']))
+        else:
+            print(messages('batch_file', filename=row['file'], kind=row['type'], n=row['n_peaks'],
+                           mean=row.get('mean_interval_ms', float('nan'))))
+
+    # Accumulators merge without the delays of every file being gathered in one array
+    pooled = StreamingStats()
+    for _, delays in results:
+        pooled.merge(delays)
+    if pooled.n:
+        summary = pooled.summary()
+        print(messages('batch_pooled', n=summary.n, mean=summary.mean, p50=summary.p50, p95=summary.p95,
+                       p99=summary.p99, p999=summary.p999))
+
+    write_summary(rows, output)
+    print(messages('summary_saved', path=output))
+    return rows
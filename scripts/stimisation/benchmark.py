@@ -0,0 +1,100 @@
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .detectors import detect_events
+from .envelope_plot import plot_signal_with_peaks
+from .messages import Messages
+from .stats import delay_stats
+from .synthetic import write_synthetic_wav
+from .trigger_matching import bounded_lag, match_events
+from .wav_reader import MappedWav
+
+# --- Parameters ---
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]  # Add 1e8 / 1e9 with --sizes (disk: 4 bytes per sample)
+STAGES = ('generate', 'load', 'detect', 'match', 'plot')
+REPEATS = 3
+MIN_DISTANCE_MS = 100.0
+MAX_LAG_MS = None           # Reject pairs further apart than this (None = half the trigger period)
+ONE_TO_ONE = True           # Never pair the same photodiode peak with two triggers
+REGRESSION_TOLERANCE = 0.2  # Throughput drop (fraction) reported as a regression against --baseline
+
+
+def _peak_rss():
+    """Peak resident set size of the current process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _run_stage(stage, filename, n_samples):
+    """One timed stage on a fresh worker process; returns (seconds, peak RSS, check)."""
+    if stage == 'generate':
+        start = time.perf_counter()
+        truth = write_synthetic_wav(filename + '.generated.wav', n_samples)
+        return time.perf_counter() - start, _peak_rss(), len(truth.ttl_onsets)
+
+    wav = MappedWav(filename)
+    if stage == 'load':
+        start = time.perf_counter()
+        total = sum(float(block.sum(dtype=np.int64)) for block in wav.blocks(1 << 20))
+        return time.perf_counter() - start, _peak_rss(), total
+
+    start = time.perf_counter()
+    ttl, photo = detect_events(wav, [(0, 0.5, False, True), (1, 0.8, True)], MIN_DISTANCE_MS, onset_method='crossing')
+    detect_seconds = time.perf_counter() - start
+    if stage == 'detect':
+        return detect_seconds, _peak_rss(), len(ttl.peaks)
+
+    if stage == 'match':
+        start = time.perf_counter()
+        max_lag = bounded_lag(ttl.times, None if MAX_LAG_MS is None else MAX_LAG_MS * wav.sampling_rate / 1000)
+        match = match_events(ttl.times, photo.times, mode='after', max_lag=max_lag, one_to_one=ONE_TO_ONE)
+        delays = delay_stats(ttl.times, photo.times, match, wav.sampling_rate)
+        return time.perf_counter() - start, _peak_rss(), len(delays.delays_ms)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        plot_signal_with_peaks(wav.channel(1), photo.peaks, "benchmark", os.path.join(tmp, 'signal.png'))
+        return time.perf_counter() - start, _peak_rss(), len(photo.peaks)
+
+
+def run_benchmarks(sizes, stages=STAGES, repeats=REPEATS, workdir=None, language='en'):
+    """
+    Times every stage on synthetic sessions of each size. Each measurement
+    runs in its own process, so peak RSS is that of the stage alone (plus the
+    interpreter). Throughput is samples per second (per channel).
+    """
+    messages = Messages(language)
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for n_samples in sizes:
+            filename = os.path.join(tmp, f'synthetic_{n_samples}.wav')
+            write_synthetic_wav(filename, n_samples)
+            for stage in stages:
+                runs = []
+                for _ in range(repeats):
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        runs.append(executor.submit(_run_stage, stage, filename, n_samples).result())
+                seconds = min(run[0] for run in runs)
+                results.append({'stage': stage, 'n_samples': n_samples, 'seconds': seconds,
+                                'samples_per_s': n_samples / seconds if seconds > 0 else float('inf'),
+                                'peak_rss_mb': max(run[1] for run in runs) / 2 ** 20, 'check': runs[0][2]})
+                print(messages('benchmark_case', stage=stage, n=n_samples, ms=seconds * 1000,
+                               rate=results[-1]['samples_per_s'], rss=results[-1]['peak_rss_mb']))
+    return results
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Cases whose throughput dropped by more than `tolerance` relative to the baseline results."""
+    reference = {(row['stage'], row['n_samples']): row['samples_per_s'] for row in baseline}
+    regressions = []
+    for row in results:
+        key = (row['stage'], row['n_samples'])
+        if key in reference and row['samples_per_s'] < (1 - tolerance) * reference[key]:
+            regressions.append((row, reference[key]))
+    return regressions
@@ -0,0 +1,132 @@
+import csv
+from collections import namedtuple
+
+import numpy as np
+
+from .messages import Messages
+from .trigger_matching import match_events
+
+# --- Parameters ---
+MAX_PAIRS = 200000     # Theil-Sen uses every pair below this count, a random sample above
+OUTLIER_MADS = 5.0     # Residuals beyond this many robust sigmas are outliers
+
+ClockFit = namedtuple('ClockFit', ['slope', 'intercept', 'drift_ppm', 'residuals', 'inliers', 'jitter'])
+ClockFit.__doc__ = """
+Linear clock model y = slope * x + intercept. `drift_ppm` is (slope - 1) * 1e6,
+`residuals` are y - model(x) for every point, `jitter` their standard
+deviation over the inliers.
+"""
+
+
+def theil_sen(x, y, max_pairs=MAX_PAIRS, seed=0):
+    """
+    Median of the pairwise slopes and median intercept, computed vectorized.
+    With more than `max_pairs` pairs, a fixed-seed random sample of pairs is used.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n < 2:
+        raise ValueError("A clock fit needs at least 2 events.")
+    if n * (n - 1) // 2 <= max_pairs:
+        i, j = np.triu_indices(n, k=1)
+    else:
+        rng = np.random.default_rng(seed)
+        i = rng.integers(0, n, max_pairs)
+        j = rng.integers(0, n, max_pairs)
+    dx = x[j] - x[i]
+    keep = dx != 0
+    slope = np.median((y[j] - y[i])[keep] / dx[keep])
+    return slope, np.median(y - slope * x)
+
+
+def fit_clock(x, y, outlier_mads=OUTLIER_MADS, max_pairs=MAX_PAIRS):
+    """
+    Robust linear fit of clock `y` against clock `x` (same units): Theil-Sen,
+    then outliers beyond `outlier_mads` robust sigmas are rejected and the
+    line is refitted on the inliers.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    slope, intercept = theil_sen(x, y, max_pairs)
+    inliers = _inliers(y - (slope * x + intercept), outlier_mads)
+    if 2 <= np.count_nonzero(inliers) < len(x):
+        slope, intercept = theil_sen(x[inliers], y[inliers], max_pairs)
+    residuals = y - (slope * x + intercept)
+    inliers = _inliers(residuals, outlier_mads)
+    return ClockFit(slope, intercept, (slope - 1) * 1e6, residuals, inliers, np.std(residuals[inliers]))
+
+
+def _inliers(residuals, outlier_mads):
+    deviation = np.abs(residuals - np.median(residuals))
+    sigma = 1.4826 * np.median(deviation)
+    if sigma == 0:
+        return deviation == 0
+    return deviation <= outlier_mads * sigma
+
+
+def fit_piecewise_clock(x, y, n_segments, outlier_mads=OUTLIER_MADS):
+    """
+    Independent robust fits on `n_segments` consecutive segments with the same
+    number of events. Returns the segment start values of x and the fits.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bounds = np.linspace(0, len(x), n_segments + 1).astype(int)
+    if np.any(np.diff(bounds) < 2):
+        raise ValueError("Each clock segment needs at least 2 events.")
+    fits = [fit_clock(x[a:b], y[a:b], outlier_mads) for a, b in zip(bounds[:-1], bounds[1:])]
+    return x[bounds[:-1]], fits
+
+
+def apply_clock(x, fit, breaks=None):
+    """Maps times of clock x onto clock y with one fit, or piecewise fits starting at `breaks`."""
+    x = np.asarray(x, dtype=float)
+    if breaks is None:
+        return fit.slope * x + fit.intercept
+    segment = np.clip(np.searchsorted(breaks, x, side='right') - 1, 0, len(fit) - 1)
+    slopes = np.array([f.slope for f in fit])
+    intercepts = np.array([f.intercept for f in fit])
+    return slopes[segment] * x + intercepts[segment]
+
+
+def match_and_fit(x, y, max_lag, outlier_mads=OUTLIER_MADS, n_initial=10):
+    """
+    Pairs two event streams with an unknown offset and drift, then fits y = f(x).
+
+    Starts from the offset between the first events, then alternates nearest
+    matching (within `max_lag`) on a prefix that doubles in length and a
+    robust refit, so accumulated drift never exceeds the matching window.
+    Returns the fit and the matched (x index, y index) arrays.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) < 2 or len(y) < 2:
+        raise ValueError("A clock fit needs at least 2 events in each stream.")
+    slope, intercept = 1.0, y[0] - x[0]
+    count = min(n_initial, len(x))
+    while True:
+        match = match_events(slope * x[:count] + intercept, y, mode='nearest', max_lag=max_lag, one_to_one=True)
+        if len(match.trigger_idx) >= 2:
+            fit = fit_clock(x[match.trigger_idx], y[match.event_idx], outlier_mads)
+            slope, intercept = fit.slope, fit.intercept
+        if count == len(x):
+            break
+        count = min(2 * count, len(x))
+    if len(match.trigger_idx) < 2:
+        raise ValueError("Fewer than 2 events could be paired between the two clocks.")
+    return fit, match.trigger_idx, match.event_idx
+
+
+def report(fit, x_label, y_label, language='en'):
+    messages = Messages(language)
+    print(messages('clock_model', y=y_label, slope=fit.slope, x=x_label, intercept=fit.intercept))
+    print(messages('clock_drift_rate', ppm=fit.drift_ppm, per_hour=fit.drift_ppm * 3.6))
+    print(messages('clock_jitter', jitter=fit.jitter, outliers=np.count_nonzero(~fit.inliers), n=len(fit.inliers)))
+
+
+def load_stimulus_times(filename, column='stimulus_time'):
+    """One column of an Expyriment data file (.xpd: CSV with '#' comment lines)."""
+    with open(filename, newline='') as f:
+        rows = csv.DictReader(line for line in f if not line.startswith('#'))
+        return np.array([float(row[column]) for row in rows])
@@ -0,0 +1,64 @@
+import glob
+import os
+
+import numpy as np
+
+
+def csv_column_count(filename, delimiter=','):
+    """Number of columns, read from the first line only."""
+    with open(filename, 'rb') as f:
+        first_line = f.readline()
+    return len(first_line.split(delimiter.encode()))
+
+
+def _parse_csv_column(filename, column, delimiter):
+    """
+    Parses only `column` with numpy's C tokenizer (numpy >= 1.23): the other
+    columns are skipped while reading, so memory holds a single column.
+    """
+    n_columns = csv_column_count(filename, delimiter)
+    if not 0 <= column < n_columns:
+        raise ValueError(f"Column {column} requested but the file has {n_columns} column(s).")
+    return np.loadtxt(filename, delimiter=delimiter, usecols=column, ndmin=1)
+
+
+def _cache_path(filename, column):
+    """Sidecar cache name, keyed on the CSV size and modification time."""
+    stat = os.stat(filename)
+    return f"{filename}.col{column}.{stat.st_size}-{stat.st_mtime_ns}.npy"
+
+
+def cached_column_length(filename, column):
+    """Number of rows of `column` from its sidecar cache header, None when the column was never cached."""
+    cache_path = _cache_path(filename, column)
+    if not os.path.exists(cache_path):
+        return None
+    return len(np.load(cache_path, mmap_mode='r'))
+
+
+def load_csv_column(filename, column=0, delimiter=',', use_cache=True):
+    """
+    Loads one column of a numeric CSV capture as float64 (same values as np.loadtxt).
+
+    The first load writes a sidecar `.npy` cache next to the CSV; later loads of
+    the unchanged file memory-map that cache instead of parsing the text again.
+    A cache whose size/mtime key no longer matches is replaced.
+    """
+    cache_path = _cache_path(filename, column)
+    if use_cache and os.path.exists(cache_path):
+        return np.load(cache_path, mmap_mode='r')
+
+    signal = _parse_csv_column(filename, column, delimiter)
+
+    if use_cache:
+        for stale in glob.glob(f"{glob.escape(filename)}.col{column}.*.npy"):
+            os.remove(stale)
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, signal)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # Read-only data folder: the analysis still works without the cache
+            print(f"Warning: could not write the cache '{cache_path}': {e}")
+    return signal
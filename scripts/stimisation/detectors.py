@@ -0,0 +1,143 @@
+from collections import namedtuple
+
+import numpy as np
+
+from . import adaptive_threshold
+from .adaptive_threshold import detect_onsets
+from .edge_detection import StreamingEdgeDetector
+from .filtering import FilteredChannel
+from .onset_refinement import refine_crossing, refine_onsets
+from .sharded_detection import detect_sharded
+from .streaming_detection import run_channel_detectors
+from .wav_reader import MappedWav
+
+THRESHOLD_MODES = ('max', 'adaptive')
+
+Detection = namedtuple('Detection', ['peaks', 'times', 'amplitudes', 'threshold', 'widths'], defaults=(None,))
+Detection.__doc__ = """
+Events of one channel: integer sample indices (`peaks`, rising edges of
+digital channels), fractional event times in samples (`times`), signal
+values at the peaks, the fixed threshold (None in adaptive mode) and the
+pulse widths in samples of digital channels (None otherwise).
+"""
+
+
+def detect_events(recording, channels, min_distance_ms, threshold_mode='max', onset_method=None, cache=None,
+                  workers=None, filters=None):
+    """
+    Detects the events of several channels of a recording (`MappedWav` or
+    `CsvRecording`) and returns one Detection per channel.
+
+    `channels` is a list of (channel index, threshold ratio, absolute[, digital])
+    tuples. In 'max' mode the threshold is the ratio times the channel maximum
+    and all channels share the same streaming passes; event times are refined
+    with `onset_method` ('crossing', 'parabolic' or None). Digital (TTL)
+    channels go through the edge detector, whose crossing onsets and pulse
+    widths come out of the same pass. In 'adaptive' mode the
+    rolling hysteresis detector gives sub-sample onsets directly.
+
+    With `workers` > 1, 'max' detection of a `MappedWav` is split into shards
+    processed in parallel (see `detect_sharded`), with the same events as the
+    serial run.
+
+    `filters` maps channel indices to SOS coefficients (`design_filter`): those
+    channels are detected on their filtered samples (`FilteredChannel`, read
+    in order, so they are never sharded) and the amplitudes are filtered values.
+
+    With an `EventCache`, the events are loaded from (or saved to) the cache
+    and the samples are not read at all on a hit.
+    """
+    if cache is None:
+        return _detect(recording, channels, min_distance_ms, threshold_mode, onset_method, workers, filters)
+
+    key = cache.key(recording.filename, _cache_params(recording, channels, min_distance_ms, threshold_mode,
+                                                      onset_method, filters))
+    entry = cache.load(key)
+    if entry is not None:
+        return [Detection(entry[f'peaks_{k}'], entry[f'times_{k}'], entry[f'amplitudes_{k}'],
+                          None if np.isnan(entry['thresholds'][k]) else entry['thresholds'][k].item(),
+                          entry.get(f'widths_{k}'))
+                for k in range(len(channels))]
+
+    detections = _detect(recording, channels, min_distance_ms, threshold_mode, onset_method, workers, filters)
+    arrays = {'thresholds': np.array([np.nan if d.threshold is None else d.threshold for d in detections])}
+    for k, detection in enumerate(detections):
+        arrays.update({f'peaks_{k}': detection.peaks, f'times_{k}': detection.times,
+                       f'amplitudes_{k}': detection.amplitudes})
+        if detection.widths is not None:
+            arrays[f'widths_{k}'] = detection.widths
+    cache.save(key, **arrays)
+    return detections
+
+
+def _cache_params(recording, channels, min_distance_ms, threshold_mode, onset_method, filters=None):
+    """Everything the detected events depend on, besides the file content."""
+    params = {'channels': [list(channel) for channel in channels], 'min_distance_ms': min_distance_ms,
+              'threshold_mode': threshold_mode, 'onset_method': onset_method,
+              'sampling_rate': recording.sampling_rate}
+    if filters:
+        params['filters'] = {str(channel): np.asarray(sos).tolist() for channel, sos in filters.items()}
+    if threshold_mode == 'adaptive':
+        params['adaptive'] = [getattr(adaptive_threshold, name) for name in
+                              ('WINDOW_MS', 'OVERLAP', 'HIGH_RATIO', 'LOW_RATIO', 'BASELINE', 'BASELINE_PCT',
+                               'TOP_PCT', 'MIN_SNR')]
+    return params
+
+
+def _detect(recording, channels, min_distance_ms, threshold_mode, onset_method, workers=None, filters=None):
+    sampling_rate = recording.sampling_rate
+    filters = filters or {}
+    signals = [FilteredChannel(recording.channel(channel[0]), filters[channel[0]]) if channel[0] in filters
+               else recording.channel(channel[0]) for channel in channels]
+
+    if threshold_mode == 'adaptive':
+        detections = []
+        for signal, channel in zip(signals, channels):
+            times = detect_onsets(signal, sampling_rate, min_distance_ms, absolute=channel[2])
+            peaks = np.minimum(np.round(times).astype(int), len(signal) - 1)
+            detections.append(Detection(peaks, times, np.asarray(signal[peaks]), None))
+        return detections
+    if threshold_mode != 'max':
+        raise ValueError(f"Unknown threshold mode '{threshold_mode}', expected one of {THRESHOLD_MODES}.")
+
+    min_distance = int(min_distance_ms * sampling_rate / 1000)
+    if workers is not None and workers > 1 and isinstance(recording, MappedWav) and not filters:
+        return _detect_sharded(recording, signals, channels, min_distance, onset_method, workers)
+    thresholds, detectors, peaks = run_channel_detectors(signals, [channel[1:] for channel in channels],
+                                                         min_distance)
+    detections = []
+    for signal, detector, channel_peaks, threshold, channel in zip(signals, detectors, peaks, thresholds, channels):
+        absolute = channel[2]
+        amplitudes = np.asarray(signal[channel_peaks])
+        if isinstance(detector, StreamingEdgeDetector):
+            edges = detector.edges()
+            times = edges.onsets if onset_method == 'crossing' else refine_onsets(signal, channel_peaks,
+                                                                                  onset_method, absolute=absolute)
+            detections.append(Detection(channel_peaks, times, amplitudes, float(threshold), edges.widths))
+        else:
+            times = refine_onsets(signal, channel_peaks, onset_method, level=threshold, absolute=absolute)
+            detections.append(Detection(channel_peaks, times, amplitudes, float(threshold)))
+    return detections
+
+
+def _detect_sharded(wav, signals, channels, min_distance, onset_method, workers):
+    specs = [(channel[0], channel[1], channel[2], len(channel) > 3 and channel[3]) for channel in channels]
+    thresholds, results = detect_sharded(wav, specs, min_distance, workers, crossings=onset_method == 'crossing')
+    detections = []
+    for signal, result, threshold, spec in zip(signals, results, thresholds, specs):
+        absolute = spec[2]
+        if spec[3]:
+            channel_peaks = result.rising
+            times = result.onsets if onset_method == 'crossing' else refine_onsets(signal, channel_peaks,
+                                                                                   onset_method, absolute=absolute)
+            widths = result.widths
+        else:
+            channel_peaks, crossings = result
+            if onset_method == 'crossing':
+                times = refine_crossing(signal, channel_peaks, threshold, absolute, crossings=crossings)
+            else:
+                times = refine_onsets(signal, channel_peaks, onset_method, absolute=absolute)
+            widths = None
+        detections.append(Detection(channel_peaks, times, np.asarray(signal[channel_peaks]), float(threshold),
+                                    widths))
+    return detections
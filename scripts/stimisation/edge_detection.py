@@ -0,0 +1,136 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+TtlEdges = namedtuple('TtlEdges', ['rising', 'falling', 'widths', 'onsets'])
+TtlEdges.__doc__ = """
+Pulses of a digital channel: first sample at or above the level (`rising`),
+first sample back below it (`falling`, -1 if the recording ends high), pulse
+widths in samples (NaN when open) and sub-sample onsets (interpolated crossing).
+"""
+
+
+def transitions(bits):
+    """
+    Indices p where bits[p] != bits[p + 1]. The boolean array is bit-packed
+    (8 samples per byte) and only the bytes holding a change of state, inside
+    them or at their boundary with the next byte, are unpacked again.
+    """
+    n = len(bits)
+    if n < 2:
+        return np.empty(0, dtype=np.int64)
+    packed = np.packbits(bits)
+    following = np.r_[packed[1:], np.uint8(0)]
+    mixed = (packed != 0) & (packed != 255)
+    boundary = (packed & 1) != (following >> 7)
+    candidates = np.flatnonzero(mixed | boundary)
+
+    # Bit 15 - p of (word ^ word << 1) is set when bit p of the byte differs from bit p + 1
+    words = (packed[candidates].astype(np.uint16) << 8) | following[candidates]
+    changes = ((words ^ (words << 1)) >> 8).astype(np.uint8)
+    rows, columns = np.nonzero(np.unpackbits(changes[:, None], axis=1))
+    found = candidates[rows].astype(np.int64) * 8 + columns
+    return found[found < n - 1]
+
+
+def refractory(rising, distance, last=None):
+    """
+    Mask of the rising edges at least `distance` samples after the previously
+    accepted one (`last`, from earlier blocks); vectorized when none is rejected.
+    """
+    if len(rising) == 0 or ((last is None or rising[0] - last >= distance)
+                            and np.all(np.diff(rising) >= distance)):
+        return np.ones(len(rising), dtype=bool)
+    keep = np.zeros(len(rising), dtype=bool)
+    for k, edge in enumerate(rising):
+        if last is None or edge - last >= distance:
+            keep[k] = True
+            last = edge
+    return keep
+
+
+class StreamingEdgeDetector:
+    """
+    Rising / falling edges of a square-wave (TTL) channel, block by block.
+
+    Each block is thresholded once; edges are the changes of state of the
+    bit-packed result, so the cost is linear in the samples with no sort and no
+    plateau handling. A rising edge closer than `distance` samples to the
+    previous accepted one (contact bounce, glitch) is ignored. Same interface
+    as `StreamingPeakDetector`: `feed()` returns the accepted rising edges.
+    With `record=False` (unbounded live streams), edges are not kept for
+    `edges()`.
+    """
+
+    def __init__(self, height, distance, absolute=False, record=True):
+        self.height = height
+        self.record = record
+        self.distance = math.ceil(distance)
+        self.absolute = absolute
+        self._previous = None  # Last sample of the previous block
+        self._offset = 0       # Global index of the first sample of the next block
+        self._last_rising = None
+        self._open = False     # The last accepted pulse has not fallen yet
+        self._rising, self._falling, self._onsets = [], [], []
+
+    def feed(self, block):
+        """Processes the next block and returns the accepted rising edges (global indices)."""
+        values = np.abs(block) if self.absolute else np.asarray(block)
+        if len(values) == 0:
+            return np.empty(0, dtype=np.int64)
+        start = self._offset
+        if self._previous is not None:
+            values = np.r_[self._previous, values]
+            start -= 1
+        self._previous = values[-1]
+        self._offset += len(block)
+
+        high = values >= self.height
+        changes = transitions(high)
+        becomes_high = high[changes + 1]
+        up, down = changes[becomes_high], changes[~becomes_high]
+        rising, falling = start + up + 1, start + down + 1
+
+        if self._open and len(falling):
+            self._falling[-1][-1] = falling[0]
+            self._open = False
+
+        keep = refractory(rising, self.distance, self._last_rising)
+        up, rising = up[keep], rising[keep]
+        if len(rising) == 0:
+            return rising
+        self._last_rising = rising[-1]
+        if not self.record:
+            return rising
+        y0, y1 = values[up].astype(float), values[up + 1].astype(float)
+        onsets = start + up + (self.height - y0) / (y1 - y0)
+
+        after = np.searchsorted(falling, rising)
+        closed = after < len(falling)
+        ends = np.full(len(rising), -1, dtype=np.int64)
+        ends[closed] = falling[after[closed]]
+        self._open = not closed[-1]
+        self._rising.append(rising)
+        self._falling.append(ends)
+        self._onsets.append(onsets)
+        return rising
+
+    def finish(self):
+        """Edges are final as soon as they are seen: nothing is left to flush."""
+        return np.empty(0, dtype=np.int64)
+
+    def edges(self):
+        rising = np.concatenate(self._rising) if self._rising else np.empty(0, dtype=np.int64)
+        falling = np.concatenate(self._falling) if self._falling else np.empty(0, dtype=np.int64)
+        widths = np.where(falling >= 0, falling - rising, np.nan)
+        onsets = np.concatenate(self._onsets) if self._onsets else np.empty(0)
+        return TtlEdges(rising, falling, widths, onsets)
+
+
+def detect_edges(signal, height, distance, absolute=False, block_size=1 << 20):
+    """TtlEdges of a whole signal (array or memory-mapped channel), read block by block."""
+    detector = StreamingEdgeDetector(height, distance, absolute)
+    for start in range(0, len(signal), block_size):
+        detector.feed(signal[start:start + block_size])
+    return detector.edges()
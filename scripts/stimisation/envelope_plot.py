@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend
+import matplotlib.pyplot as plt
+
+# --- Parameters ---
+BLOCK_SIZE = 1 << 20  # Samples reduced at once when computing the envelope
+
+
+def minmax_envelope(signal, n_bins, block_size=BLOCK_SIZE):
+    """
+    Reduces a signal to `n_bins` (min, max) pairs, one per pixel column.
+
+    The signal is read block by block (blocks are a whole number of bins), so a
+    memory-mapped recording is never materialised. Returns the sample index of
+    each bin start, the minima and the maxima.
+    """
+    n_samples = len(signal)
+    bin_size = max(1, math.ceil(n_samples / n_bins))
+    block_size = max(bin_size, block_size // bin_size * bin_size)
+
+    mins, maxs = [], []
+    for start in range(0, n_samples, block_size):
+        block = np.asarray(signal[start:start + block_size])
+        full = len(block) // bin_size * bin_size
+        if full:
+            bins = block[:full].reshape(-1, bin_size)
+            mins.append(bins.min(axis=1))
+            maxs.append(bins.max(axis=1))
+        if full < len(block):
+            mins.append(block[full:].min(keepdims=True))
+            maxs.append(block[full:].max(keepdims=True))
+
+    starts = np.arange(0, n_samples, bin_size)
+    return starts, np.concatenate(mins), np.concatenate(maxs)
+
+
+def select_zoom_peaks(peak_indices, n_zooms):
+    """Peaks spread evenly over the recording (first, ..., last)."""
+    if n_zooms <= 0 or len(peak_indices) == 0:
+        return np.empty(0, dtype=int)
+    picks = np.unique(np.linspace(0, len(peak_indices) - 1, n_zooms).round().astype(int))
+    return np.asarray(peak_indices)[picks]
+
+
+def plot_signal_with_peaks(signal, peak_indices, title, save_path, zoom_peaks=None, zoom_half_width=0,
+                           figsize=(15, 5), dpi=300, xlabel="Samples", ylabel="Amplitude",
+                           signal_label='Signal', peaks_label='Detected Peaks'):
+    """
+    Plots the signal as a per-pixel-column min/max envelope with the detected peaks.
+
+    Rendering cost depends on the figure width (figsize * dpi), not on the
+    recording length. `zoom_peaks` (sample indices) adds one panel per peak,
+    showing the raw samples within +/- `zoom_half_width` samples.
+    """
+    zoom_peaks = [] if zoom_peaks is None else list(zoom_peaks)
+    n_pixels = int(figsize[0] * dpi)
+    n_samples = len(signal)
+    peak_indices = np.asarray(peak_indices, dtype=int)
+
+    if zoom_peaks:
+        fig = plt.figure(figsize=(figsize[0], figsize[1] * 1.6))
+        grid = fig.add_gridspec(2, len(zoom_peaks), height_ratios=[2, 1], hspace=0.35)
+        ax = fig.add_subplot(grid[0, :])
+    else:
+        fig, ax = plt.subplots(figsize=figsize)
+
+    if n_samples <= 2 * n_pixels:
+        ax.plot(np.asarray(signal), label=signal_label)
+    else:
+        starts, mins, maxs = minmax_envelope(signal, n_pixels)
+        ax.fill_between(starts, mins, maxs, step='post', linewidth=0.6, label=signal_label)
+    ax.plot(peak_indices, signal[peak_indices], 'rx', label=peaks_label)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(loc='upper right')
+
+    for k, peak in enumerate(zoom_peaks):
+        start = max(0, peak - zoom_half_width)
+        stop = min(n_samples, peak + zoom_half_width + 1)
+        zoom_ax = fig.add_subplot(grid[1, k])
+        zoom_ax.plot(np.arange(start, stop), signal[start:stop])
+        zoom_ax.plot(peak, signal[peak], 'rx')
+        zoom_ax.set_title(f"{xlabel} {peak}", fontsize=9)
+        zoom_ax.tick_params(labelsize=7)
+
+    fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- Parameters ---
+EPOCH_CHUNK = 1024          # Trials gathered and measured at once (bounds the memory used)
+EDGE_LEVELS = (0.1, 0.9)    # Fractions of the amplitude delimiting the rising edge
+
+EpochShapes = namedtuple('EpochShapes', ['events', 'baseline', 'amplitude', 'latency_ms', 'rise_ms', 'peak_ms',
+                                         'average', 'time_ms'])
+EpochShapes.__doc__ = """
+Response shape of every trial whose window fits in the recording (`events`,
+sample indices): pre-event baseline, amplitude (peak - baseline), latency of
+the 10% level and 10–90% rise time (interpolated, NaN when the epoch starts
+above 10%), time of the peak, all relative to the event. `average` is the
+baseline-corrected grand average on the `time_ms` axis.
+"""
+
+
+def epoch_view(signal, before, after):
+    """
+    Zero-copy (n_samples - window + 1, window) view of a signal array (or
+    memory map): row `event - before` is the epoch of an event at `event`.
+    """
+    return sliding_window_view(signal, before + after)
+
+
+def gather_epochs(signal, events, before, after):
+    """
+    (n_events, before + after) samples around integer event indices, in one
+    vectorized gather (rows of `epoch_view`; decoded on demand for 24-bit files).
+    """
+    starts = np.asarray(events, dtype=np.int64) - before
+    if isinstance(signal, np.ndarray):
+        return epoch_view(signal, before, after)[starts]
+    return signal[starts[:, None] + np.arange(before + after)]
+
+
+def _last_below(epochs, level, peak):
+    """Interpolated position of the last upward crossing of `level` before each peak (NaN without any)."""
+    columns = np.arange(epochs.shape[1])
+    below = (epochs < level[:, None]) & (columns <= peak[:, None])
+    found = below.any(axis=1)
+    last = epochs.shape[1] - 1 - below[:, ::-1].argmax(axis=1)
+    rows = np.arange(len(epochs))
+    last = np.minimum(last, epochs.shape[1] - 2)
+    y0, y1 = epochs[rows, last].astype(float), epochs[rows, last + 1].astype(float)
+    return np.where(found, last + (level - y0) / np.where(y1 != y0, y1 - y0, 1), np.nan)
+
+
+def epoch_shapes(signal, events, sampling_rate, before_ms, after_ms, absolute=False, chunk=EPOCH_CHUNK):
+    """
+    Per-trial response shape and grand average of a signal around events
+    (sample indices, e.g. TTL rising edges or photodiode peaks), trials whose
+    window crosses the recording edges being skipped.
+
+    Epochs are read `chunk` trials at a time from the strided window view and
+    every measure is a reduction along the window axis, so there is no loop
+    over the trials. The peak is searched after the event only.
+    """
+    before = int(round(before_ms * sampling_rate / 1000))
+    after = int(round(after_ms * sampling_rate / 1000))
+    if before < 1 or after < 2:
+        raise ValueError(f"Epochs need samples on both sides of the event, got -{before_ms} / +{after_ms} ms.")
+    events = np.round(np.asarray(events)).astype(np.int64)
+    events = events[(events >= before) & (events + after <= len(signal))]
+    low, high = EDGE_LEVELS
+
+    baseline, amplitude, t_low, t_high, peaks = (np.empty(len(events)) for _ in range(5))
+    total = np.zeros(before + after)
+    for start in range(0, len(events), chunk):
+        part = slice(start, start + chunk)
+        epochs = gather_epochs(signal, events[part], before, after)
+        if absolute:
+            epochs = np.abs(epochs)
+        level = epochs[:, :before].mean(axis=1)
+        peak = before + epochs[:, before:].argmax(axis=1)
+        top = epochs[np.arange(len(epochs)), peak]
+        baseline[part], amplitude[part], peaks[part] = level, top - level, peak
+        t_low[part] = _last_below(epochs, level + low * (top - level), peak)
+        t_high[part] = _last_below(epochs, level + high * (top - level), peak)
+        total += epochs.sum(axis=0, dtype=float) - level.sum()
+
+    to_ms = 1000 / sampling_rate
+    average = total / len(events) if len(events) else np.full(before + after, np.nan)
+    return EpochShapes(events, baseline, amplitude, (t_low - before) * to_ms, (t_high - t_low) * to_ms,
+                       (peaks - before) * to_ms, average, (np.arange(before + after) - before) * to_ms)
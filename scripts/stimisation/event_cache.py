@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# --- Parameters ---
+CACHE_DIR = os.environ.get('STIMISATION_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'stimisation', 'events'))
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Least recently used entries are evicted above this size
+HASH_BLOCK_SIZE = 1 << 22
+MAX_INDEXED_FILES = 1000  # Remembered (path, size, mtime) → hash entries
+CACHE_VERSION = 2  # Bump when the detection output changes for the same parameters
+
+_HASH_INDEX = 'hashes.json'
+
+
+class EventCache:
+    """
+    On-disk cache of detected events, one compressed `.npz` file per entry.
+
+    Entries are keyed on a content hash of the recording (BLAKE2b, so a renamed
+    or copied file still hits) and on the detection parameters. The hash itself
+    is remembered per (path, size, mtime) so an unchanged file is hashed once.
+    A hit refreshes the entry's modification time; when the cache grows over
+    `max_bytes` the least recently used entries are removed.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def content_hash(self, filename):
+        stat = os.stat(filename)
+        file_key = f"{os.path.abspath(filename)}|{stat.st_size}|{stat.st_mtime_ns}"
+        index = self._read_index()
+        if file_key in index:
+            return index[file_key]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(chunk)
+        index[file_key] = digest.hexdigest()
+        self._write_index(index)
+        return index[file_key]
+
+    def key(self, filename, params):
+        """Entry key of a recording and a JSON-serializable dict of detection parameters."""
+        text = json.dumps({'content': self.content_hash(filename), 'params': params, 'version': CACHE_VERSION},
+                          sort_keys=True)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def load(self, key):
+        """Arrays stored under `key` (dict), or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+            os.utime(path)  # Most recently used
+            return arrays
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key, **arrays):
+        """Stores the arrays under `key`, then evicts old entries if needed."""
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'  # Batch workers may write concurrently
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, path)
+            self.evict()
+        except OSError as e:
+            # Read-only or full disk: the analysis still works without the cache
+            print(f"Warning: could not write the event cache '{path}': {e}")
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in `max_bytes`."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.npz'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            if name.endswith('.npz') or name == _HASH_INDEX:
+                os.remove(os.path.join(self.directory, name))
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.directory, _HASH_INDEX)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        path = os.path.join(self.directory, _HASH_INDEX)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        index = dict(list(index.items())[-MAX_INDEXED_FILES:])
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Only costs a new hash next time
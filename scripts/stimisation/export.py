@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+
+from .multichannel import DelayMatrix
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: tables are then written as .npz
+    pa = pq = None
+
+# --- Parameters ---
+FLAG_UNMATCHED = 1  # Source event without a matched target event
+FLAG_ORPHAN = 2     # Target event that no source event was matched to
+TABLE_SUFFIX = '_events'
+
+COLUMNS = ['filename', 'channel', 'channel_index', 'sample', 'time_s', 'amplitude', 'width_ms', 'interval_ms',
+           'delay_target', 'delay_ms', 'flags']
+
+
+def _pairs(delays):
+    """(source label, target label, DelayStats) of a result: one pair for DelayStats, all pairs of a DelayMatrix."""
+    if delays is None:
+        return []
+    if isinstance(delays, DelayMatrix):
+        return [(source, target, stats) for (source, target), stats in delays.stats.items()]
+    return [(None, None, delays)]
+
+
+def event_table(filename, result):
+    """
+    One row per detected event of an AnalysisResult, as a dict of equal-length
+    column arrays (see COLUMNS). `delay_ms` is the delay to the event matched
+    in the first pair whose source is this channel (`delay_target`); events of
+    the source / target of that pair that stayed unpaired are flagged.
+    """
+    labels = [label for label, _ in result.channels]
+    pairs = [(source if source is not None else labels[0], target if target is not None else labels[1], stats)
+             for source, target, stats in _pairs(result.delays)]
+    columns = {name: [] for name in COLUMNS}
+    for (label, channel), detection in zip(result.channels, result.detections):
+        n = len(detection.peaks)
+        times = np.asarray(detection.times, dtype=float)
+        interval = np.full(n, np.nan)
+        interval[1:] = np.diff(times) / result.sampling_rate * 1000
+        delay = np.full(n, np.nan)
+        flags = np.zeros(n, dtype=np.uint8)
+        target_name = ''
+        as_source = [(target, stats) for source, target, stats in pairs if source == label]
+        if as_source:
+            target_name, stats = as_source[0]
+            delay[stats.match.trigger_idx] = stats.delays_ms
+            flags[stats.match.unmatched_triggers] |= FLAG_UNMATCHED
+        as_target = [stats for source, target, stats in pairs if target == label]
+        if as_target:
+            flags[as_target[0].match.orphan_events] |= FLAG_ORPHAN
+
+        columns['filename'].append(np.full(n, filename))
+        columns['channel'].append(np.full(n, label))
+        columns['channel_index'].append(np.full(n, channel, dtype=np.int16))
+        columns['sample'].append(np.asarray(detection.peaks, dtype=np.int64))
+        columns['time_s'].append(times / result.sampling_rate)
+        columns['amplitude'].append(np.asarray(detection.amplitudes, dtype=float))
+        columns['width_ms'].append(np.full(n, np.nan) if detection.widths is None
+                                   else detection.widths / result.sampling_rate * 1000)
+        columns['interval_ms'].append(interval)
+        columns['delay_target'].append(np.full(n, target_name))
+        columns['delay_ms'].append(delay)
+        columns['flags'].append(flags)
+    return {name: np.concatenate(parts) if parts else np.empty(0) for name, parts in columns.items()}
+
+
+def write_event_table(table, path):
+    """
+    Writes a table as Parquet when pyarrow is installed, else as a compressed
+    .npz next to it; returns the path actually written.
+    """
+    base = os.path.splitext(path)[0]
+    if pq is not None:
+        path = base + '.parquet'
+        pq.write_table(pa.table({name: pa.array(values) for name, values in table.items()}), path)
+    else:
+        path = base + '.npz'
+        np.savez_compressed(path, **table)
+    return path
+
+
+def read_event_tables(paths):
+    """Concatenates the event tables of several sessions (.parquet or .npz) into one dict of columns."""
+    parts = []
+    for path in paths:
+        if path.endswith('.parquet'):
+            if pq is None:
+                raise ValueError(f"Reading '{path}' requires pyarrow.")
+            table = pq.read_table(path)
+            parts.append({name: table.column(name).to_numpy() for name in table.column_names})
+        else:
+            with np.load(path) as data:
+                parts.append({name: data[name] for name in data.files})
+    return {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS} if parts else {}
+
+
+def export_events(filename, result, export_dir):
+    """Writes the event table of one analysed file into `export_dir`; returns the saved path."""
+    os.makedirs(export_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(filename))[0] + TABLE_SUFFIX
+    return write_event_table(event_table(filename, result), os.path.join(export_dir, name))
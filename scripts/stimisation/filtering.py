@@ -0,0 +1,152 @@
+import numpy as np
+from scipy.signal import butter, iirnotch, sosfilt, sosfilt_zi, tf2sos
+
+# --- Parameters ---
+BLOCK_SIZE = 1 << 20  # Samples filtered at once
+NOTCH_Q = 30.0        # Quality factor of the mains notches (bandwidth = frequency / Q)
+FILTER_ORDER = 4      # Order of the Butterworth low-pass
+BASELINE_ORDER = 1    # Order of the baseline high-pass (first order: no ringing after a flash)
+
+
+def design_filter(sampling_rate, notch_hz=None, n_harmonics=1, highpass_hz=None, lowpass_hz=None,
+                  notch_q=NOTCH_Q, order=FILTER_ORDER, baseline_order=BASELINE_ORDER):
+    """
+    Second-order sections of the photodiode clean-up filter: notches at the
+    mains frequency `notch_hz` and its first `n_harmonics` multiples (below
+    Nyquist), a Butterworth high-pass removing the slow baseline and a
+    low-pass removing the backlight ripple, each optional.
+
+    A flash of duration T ends with an undershoot of 1 - exp(-2π·highpass·T)
+    of its height through the first-order high-pass; keep it well below the
+    detection ratio (e.g. 1 Hz for flashes up to about 150 ms).
+    """
+    nyquist = sampling_rate / 2
+    sections = []
+    if notch_hz is not None:
+        for k in range(1, n_harmonics + 1):
+            if k * notch_hz < nyquist:
+                sections.append(tf2sos(*iirnotch(k * notch_hz, notch_q, fs=sampling_rate)))
+    for cutoff, kind, kind_order in ((highpass_hz, 'highpass', baseline_order), (lowpass_hz, 'lowpass', order)):
+        if cutoff is None:
+            continue
+        if not 0 < cutoff < nyquist:
+            raise ValueError(f"The {kind} cutoff must be between 0 and {nyquist} Hz, got {cutoff} Hz.")
+        sections.append(butter(kind_order, cutoff, kind, fs=sampling_rate, output='sos'))
+    if not sections:
+        raise ValueError("The filter needs a notch, a high-pass or a low-pass frequency.")
+    return np.vstack(sections)
+
+
+class StreamingFilter:
+    """
+    Applies SOS coefficients block by block: the section states are carried
+    from one block to the next, so the concatenated output is the same as
+    `sosfilt` over the whole signal. The filter starts in the steady state of
+    the first sample (`sosfilt_zi`), so a DC baseline does not produce a
+    start-up step (which a high-pass would turn into the largest value).
+    """
+
+    def __init__(self, sos):
+        self.sos = np.asarray(sos, dtype=float)
+        self.state = None  # Set from the first sample
+
+    def feed(self, block):
+        block = np.asarray(block, dtype=float)
+        if len(block) == 0:
+            return block
+        if self.state is None:
+            self.state = sosfilt_zi(self.sos) * block[0]
+        filtered, self.state = sosfilt(self.sos, block, zi=self.state)
+        return filtered
+
+
+def filter_signal(signal, sos):
+    """Whole-signal reference of `StreamingFilter` (same start-up state)."""
+    signal = np.asarray(signal, dtype=float)
+    if len(signal) == 0:
+        return signal
+    return sosfilt(sos, signal, zi=sosfilt_zi(sos) * signal[0])[0]
+
+
+class FilteredChannel:
+    """
+    Lazy filtered view of a channel (array or memory-mapped view), used by the
+    detectors in place of the raw samples.
+
+    No filtered copy of the channel is kept: the section states at the start
+    of every block (a few floats per block) are recorded the first time the
+    stream reaches them, and each read re-filters the blocks it covers from
+    those snapshots. Memory holds the blocks in flight plus the last block
+    read; a detector pass costs one filtering of the channel. Values are
+    those of `filter_signal` over the whole channel.
+    """
+
+    def __init__(self, signal, sos, block_size=BLOCK_SIZE):
+        self._signal = signal
+        self._sos = np.asarray(sos, dtype=float)
+        self._block_size = block_size
+        self._states = []  # _states[k]: section states at the start of block k
+        self._last = (None, None)  # (index, filtered samples) of the last block read
+        self.dtype = np.dtype(float)
+        self.shape = (len(signal),)
+        self.ndim = 1
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _run(self, k):
+        """Filters block `k` from its snapshot; returns the samples and the states after it."""
+        start = k * self._block_size
+        block = np.asarray(self._signal[start:start + self._block_size], dtype=float)
+        return sosfilt(self._sos, block, zi=self._states[k])
+
+    def _block(self, k):
+        """Filtered samples of block `k`, streaming from the last snapshot to it the first time."""
+        if self._last[0] == k:
+            return self._last[1]
+        if not self._states:
+            self._states.append(sosfilt_zi(self._sos) * float(self._signal[0]))
+        while len(self._states) <= k:
+            self._states.append(self._run(len(self._states) - 1)[1])
+        filtered, state = self._run(k)
+        if len(self._states) == k + 1:
+            self._states.append(state)
+        self._last = (k, filtered)
+        return filtered
+
+    def _gather(self, indices):
+        """Samples at `indices` (non-negative), each covered block filtered once, in order."""
+        out = np.empty(len(indices))
+        blocks = indices // self._block_size
+        order = np.argsort(blocks, kind='stable')
+        bounds = np.flatnonzero(np.diff(blocks[order])) + 1
+        for group in np.split(order, bounds):
+            if len(group):
+                k = int(blocks[group[0]])
+                out[group] = self._block(k)[indices[group] - k * self._block_size]
+        return out
+
+    def __getitem__(self, key):
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return self._gather(np.arange(start, stop, step))
+            if start >= stop:
+                return np.empty(0)
+            first, last = start // self._block_size, (stop - 1) // self._block_size
+            pieces = [self._block(k)[max(start - k * self._block_size, 0):stop - k * self._block_size]
+                      for k in range(first, last + 1)]
+            return pieces[0].copy() if len(pieces) == 1 else np.concatenate(pieces)
+        if isinstance(key, (int, np.integer)):
+            index = key + n if key < 0 else key
+            if not 0 <= index < n:
+                raise IndexError(f"Index {key} is out of bounds for a channel of {n} samples.")
+            return self._block(index // self._block_size)[index % self._block_size]
+        key = np.asarray(key)
+        indices = np.flatnonzero(key) if key.dtype == bool else np.where(key < 0, key + n, key).astype(np.intp)
+        return self._gather(indices.ravel()).reshape(indices.shape)
+
+    def __array__(self, dtype=None, copy=None):
+        data = self[:]
+        return data if dtype is None else data.astype(dtype)
@@ -0,0 +1,116 @@
+import csv
+import time
+
+import numpy as np
+
+# --- Parameters ---
+CALIBRATION_FLIPS = 60     # Back-to-back flips used to measure the refresh period
+MIN_FRAME_PERIOD_MS = 1.0  # Shorter measured periods mean the flips do not wait for the vsync
+
+
+def perf_counter_ms():
+    return time.perf_counter() * 1000
+
+
+def measure_frame_period(present, n_flips=CALIBRATION_FLIPS, clock=perf_counter_ms):
+    """
+    Refresh period (ms) measured as the median interval between the returns of
+    `n_flips` back-to-back blocking flips (`present` must wait for the vsync).
+    Raises a ValueError when the period is below `MIN_FRAME_PERIOD_MS`: the
+    flips did not block (e.g. Expyriment develop mode), so the refresh rate
+    has to be given instead.
+    """
+    returns = np.empty(n_flips + 1)
+    present()  # Synchronises with the display before the first measurement
+    returns[0] = clock()
+    for k in range(1, n_flips + 1):
+        present()
+        returns[k] = clock()
+    period = float(np.median(np.diff(returns)))
+    if period < MIN_FRAME_PERIOD_MS:
+        raise ValueError(f"Measured frame period of {period:.3f} ms: the flips do not wait for the vsync, "
+                         f"give the refresh rate of the display instead.")
+    return period
+
+
+class FrameTimingLog:
+    """
+    Pre-/post-flip timestamps of every screen update, stored in preallocated
+    arrays so that logging costs two clock reads and a few array writes.
+
+    `clock` returns milliseconds (e.g. `PresentationScheduler.now`, so that
+    deadlines and timestamps share the schedule time base). Frame indices and
+    missed frames are only inferred after the run (`table`, `save`): each flip
+    advances the frame count by the number of refresh periods since the
+    previous post-flip timestamp, and a flip misses frames when it lands one
+    or more periods after its deadline.
+    """
+
+    def __init__(self, capacity, clock=perf_counter_ms, labels=('flip',)):
+        self.capacity = capacity
+        self.labels = tuple(labels)
+        self._clock = clock
+        self._pre = np.full(capacity, np.nan)
+        self._post = np.full(capacity, np.nan)
+        self._deadline = np.full(capacity, np.nan)
+        self._code = np.zeros(capacity, dtype=np.int8)
+        self.n_flips = 0
+        self.n_overflow = 0
+
+    def flip(self, present, code=0, deadline_ms=np.nan):
+        """
+        Calls `present()` between two clock reads and stores them; returns the
+        post-flip time (ms). `code` indexes `labels`, `deadline_ms` is the
+        time the flip was aimed at.
+        """
+        k = self.n_flips
+        pre = self._clock()
+        present()
+        post = self._clock()
+        if k < self.capacity:
+            self._pre[k] = pre
+            self._post[k] = post
+            self._deadline[k] = deadline_ms
+            self._code[k] = code
+            self.n_flips = k + 1
+        else:
+            self.n_overflow += 1
+        return post
+
+    def table(self, frame_period_ms):
+        """
+        One row per flip: label code, deadline, pre and post timestamps, flip
+        duration, inferred frame index (0 at the first flip) and missed frames.
+        """
+        n = self.n_flips
+        pre, post, deadline = self._pre[:n], self._post[:n], self._deadline[:n]
+        frame = np.zeros(n, dtype=np.int64)
+        frame[1:] = np.cumsum(np.maximum(np.round(np.diff(post) / frame_period_ms), 1))
+        due = np.where(np.isnan(deadline), pre, deadline)
+        missed = np.maximum(np.floor((post - due) / frame_period_ms), 0).astype(np.int64)
+        return {'code': self._code[:n], 'deadline_ms': deadline, 'pre_ms': pre, 'post_ms': post,
+                'flip_ms': post - pre, 'frame': frame, 'missed_frames': missed}
+
+    def summary(self, frame_period_ms):
+        if self.n_flips == 0:
+            return "No flip recorded."
+        rows = self.table(frame_period_ms)
+        missed = rows['missed_frames']
+        text = (f"Flips: {self.n_flips} over {rows['frame'][-1] + 1} frames of {frame_period_ms:.3f} ms, "
+                f"late flips: {np.count_nonzero(missed)} ({missed.sum()} missed frames), "
+                f"flip duration median {np.median(rows['flip_ms']):.3f} ms, max {np.max(rows['flip_ms']):.3f} ms")
+        if self.n_overflow:
+            text += f", {self.n_overflow} flips not logged (capacity {self.capacity})"
+        return text
+
+    def save(self, path, frame_period_ms):
+        """Writes the table as CSV (times in ms), to be called once the presentation is over."""
+        rows = self.table(frame_period_ms)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['index', 'label', 'deadline_ms', 'pre_flip_ms', 'post_flip_ms', 'flip_ms', 'frame',
+                             'missed_frames'])
+            for k in range(self.n_flips):
+                writer.writerow([k, self.labels[rows['code'][k]], f"{rows['deadline_ms'][k]:.3f}",
+                                 f"{rows['pre_ms'][k]:.3f}", f"{rows['post_ms'][k]:.3f}",
+                                 f"{rows['flip_ms'][k]:.3f}", rows['frame'][k], rows['missed_frames'][k]])
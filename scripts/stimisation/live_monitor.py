@@ -0,0 +1,248 @@
+import queue
+import time
+
+import numpy as np
+
+from .edge_detection import StreamingEdgeDetector
+from .messages import Messages
+from .onset_refinement import refine_onsets
+from .streaming_detection import StreamingPeakDetector
+from .streaming_stats import StreamingStats
+from .trigger_matching import match_events
+from .wav_reader import MappedWav
+
+# --- Parameters ---
+BLOCK_MS = 50.0              # Duration of each acquisition block
+BUFFER_S = 10.0              # Ring buffer length (recent samples kept in memory)
+CALIBRATION_S = 2.0          # Samples used to set the thresholds before detection starts
+CALIBRATION_SNR = 8.0        # A calibration pulse must clear the median by this many robust sigmas (1.4826 * MAD)
+TTL_THRESHOLD_RATIO = 0.5    # Fraction of the calibration max (TTL channel)
+PHOTO_THRESHOLD_RATIO = 0.8  # Fraction of the calibration max (photodiode, absolute amplitude)
+MIN_DISTANCE_MS = 100.0
+MAX_LAG_MS = 200.0           # Triggers without a photodiode peak within this lag are counted as missed
+REPORT_INTERVAL_S = 1.0      # Status line period of `run`
+
+
+class RingBuffer:
+    """
+    Fixed-size circular buffer of (frames, channels) samples, addressed with
+    global frame indices (frames written since the start of the acquisition).
+    """
+
+    def __init__(self, capacity, n_channels, dtype):
+        self.capacity = capacity
+        self.total = 0
+        self._data = np.zeros((capacity, n_channels), dtype=dtype)
+
+    def write(self, block):
+        n_frames = len(block)
+        block = block[-self.capacity:]  # Older frames would be overwritten anyway
+        start = (self.total + n_frames - len(block)) % self.capacity
+        first = min(len(block), self.capacity - start)
+        self._data[start:start + first] = block[:first]
+        self._data[:len(block) - first] = block[first:]
+        self.total += n_frames
+
+    def oldest(self):
+        """Global index of the oldest frame still in the buffer."""
+        return max(0, self.total - self.capacity)
+
+    def read(self, start, stop):
+        """Copy of frames [start, stop), which must still be in the buffer."""
+        if start < self.oldest() or stop > self.total or start > stop:
+            raise ValueError(f"Frames [{start}, {stop}) are not in the buffer.")
+        indices = np.arange(start, stop) % self.capacity
+        return self._data[indices]
+
+
+class WavReplaySource:
+    """Replays a WAV file block by block, at real-time speed unless `realtime=False`."""
+
+    def __init__(self, filename, block_ms=BLOCK_MS, realtime=True):
+        self._wav = MappedWav(filename)
+        self.sampling_rate = self._wav.sampling_rate
+        self.n_channels = self._wav.n_channels
+        self.dtype = self._wav.dtype
+        self.block_size = max(1, int(block_ms * self.sampling_rate / 1000))
+        self.realtime = realtime
+
+    def __iter__(self):
+        start = time.perf_counter()
+        emitted = 0
+        for block in self._wav.blocks(self.block_size):
+            emitted += len(block)
+            if self.realtime:
+                # A block is only "acquired" once its last sample has been played
+                delay = start + emitted / self.sampling_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield np.array(block)
+
+
+class SoundDeviceSource:
+    """
+    Live blocks from an audio interface (requires the optional `sounddevice` package).
+    The audio callback only enqueues blocks; analysis runs in the consumer.
+    """
+
+    def __init__(self, sampling_rate, n_channels=2, block_ms=BLOCK_MS, device=None, dtype='int16', language='en'):
+        self.sampling_rate = sampling_rate
+        self.n_channels = n_channels
+        self.dtype = np.dtype(dtype)
+        self.block_size = max(1, int(block_ms * sampling_rate / 1000))
+        self.device = device
+        self.messages = Messages(language)
+
+    def __iter__(self):
+        import sounddevice as sd
+
+        blocks = queue.Queue()
+
+        def callback(indata, frames, time_info, status):
+            if status:
+                print(self.messages('acquisition_warning', status=status))
+            blocks.put(indata.copy())
+
+        with sd.InputStream(samplerate=self.sampling_rate, channels=self.n_channels, dtype=self.dtype.name,
+                            blocksize=self.block_size, device=self.device, callback=callback):
+            while True:
+                yield blocks.get()
+
+
+def _pulse_max(values):
+    """Maximum of `values` if it stands `CALIBRATION_SNR` robust sigmas above the median, else None."""
+    values = np.asarray(values, dtype=float)
+    median = np.median(values)
+    sigma = 1.4826 * np.median(np.abs(values - median))
+    top = np.max(values)
+    return top if top - median > CALIBRATION_SNR * sigma else None
+
+
+class LiveMonitor:
+    """
+    Incremental TTL (channel 0) / photodiode (channel 1) latency monitor.
+
+    Thresholds are set from the first `calibration_s` seconds holding a pulse
+    on both channels (a maximum `CALIBRATION_SNR` robust sigmas above the
+    median; until then the window slides, so noise never sets them), then
+    every block from the start of that window goes through the streaming detectors (TTL edges, photodiode peaks); new
+    events are refined to sub-sample times from the ring buffer and matched to
+    compute running delay statistics. Only the events that can still be
+    matched are kept, so memory and time per block do not grow with the
+    session.
+    """
+
+    def __init__(self, sampling_rate, n_channels, dtype, buffer_s=BUFFER_S, calibration_s=CALIBRATION_S,
+                 min_distance_ms=MIN_DISTANCE_MS, max_lag_ms=MAX_LAG_MS, language='en'):
+        if n_channels < 2:
+            raise ValueError("The live monitor needs 2 channels (Arduino, Photodiode).")
+        if calibration_s >= buffer_s:
+            raise ValueError("The ring buffer must be longer than the calibration period.")
+        self.sampling_rate = sampling_rate
+        self.messages = Messages(language)
+        self.ring = RingBuffer(int(buffer_s * sampling_rate), n_channels, dtype)
+        self.calibration_frames = int(calibration_s * sampling_rate)
+        self.min_distance = int(min_distance_ms * sampling_rate / 1000)
+        self.max_lag = max_lag_ms * sampling_rate / 1000
+        self.thresholds = None
+        self._detectors = None
+        self._origin = 0  # Global index of the first sample fed to the detectors
+
+        self.n_triggers = 0
+        self.n_photo = 0
+        self._pending = np.empty(0)  # Trigger times still waiting for a photodiode event
+        self._photo = np.empty(0)    # Unmatched photodiode times a trigger may still claim
+        self.delays = StreamingStats()  # Fixed memory, however long the session
+        self.n_missed = 0
+
+    def process(self, block):
+        """Adds one acquisition block and returns the delays (ms) matched thanks to it."""
+        self.ring.write(block)
+        if self._detectors is None:
+            if self.ring.total < self.calibration_frames:
+                return []
+            origin = self.ring.total - self.calibration_frames
+            calibration = self.ring.read(origin, self.ring.total)
+            ttl_max, photo_max = _pulse_max(calibration[:, 0]), _pulse_max(np.abs(calibration[:, 1]))
+            if ttl_max is None or photo_max is None:
+                return []  # No pulse on a channel yet: keep calibrating on the latest samples
+            ttl_threshold = TTL_THRESHOLD_RATIO * ttl_max
+            photo_threshold = PHOTO_THRESHOLD_RATIO * photo_max
+            self.thresholds = (ttl_threshold, photo_threshold)
+            self._origin = origin
+            self._detectors = (StreamingEdgeDetector(ttl_threshold, self.min_distance, record=False),
+                               StreamingPeakDetector(photo_threshold, self.min_distance, absolute=True))
+            block = calibration  # Detection starts from the very first sample
+
+        ttl_peaks = self._origin + self._detectors[0].feed(block[:, 0])
+        photo_peaks = self._origin + self._detectors[1].feed(block[:, 1])
+        ttl_times = self._refine(ttl_peaks, 0, self.thresholds[0], absolute=False)
+        photo_times = self._refine(photo_peaks, 1, self.thresholds[1], absolute=True)
+        self.n_triggers += len(ttl_times)
+        self.n_photo += len(photo_times)
+        self._pending = np.concatenate((self._pending, ttl_times))
+        self._photo = np.concatenate((self._photo, photo_times))
+        return self._match()
+
+    def _refine(self, peaks, channel, level, absolute):
+        """Sub-sample times of new peaks, computed from the samples still in the ring buffer."""
+        if len(peaks) == 0:
+            return np.empty(0)
+        start = max(self.ring.oldest(), int(peaks[0]) - self.min_distance)
+        stop = min(self.ring.total, int(peaks[-1]) + 2)
+        if start > peaks[0]:
+            return peaks.astype(float)
+        window = self.ring.read(start, stop)[:, channel]
+        return start + refine_onsets(window, peaks - start, 'crossing', level=level, absolute=absolute,
+                                     max_lookback=self.min_distance)
+
+    def _match(self):
+        """Pairs waiting triggers with the first photodiode event after them, then drops the settled events."""
+        # A photodiode peak is released up to about two refractory windows late: before `horizon`,
+        # no trigger can still get an event within the lag window and no new trigger can appear
+        horizon = self.ring.total - 2 * self.min_distance - self.max_lag
+        match = match_events(self._pending, self._photo, mode='after', max_lag=self.max_lag, one_to_one=True)
+        delays = list((self._photo[match.event_idx] - self._pending[match.trigger_idx]) / self.sampling_rate * 1000)
+        self.delays.update(delays)
+
+        waiting = self._pending[match.unmatched_triggers]
+        expired = waiting < horizon
+        self.n_missed += int(np.count_nonzero(expired))
+        self._pending = waiting[~expired]
+        unused = self._photo[match.orphan_events]
+        oldest = min(self._pending[0], horizon) if len(self._pending) else horizon
+        self._photo = unused[unused > oldest]
+        return delays
+
+    def summary(self, recent_delays):
+        """One status line: counts, delay of the last interval and running statistics."""
+        elapsed = self.ring.total / self.sampling_rate
+        m = self.messages
+        if self.thresholds is None:
+            return m('live_calibrating', elapsed=elapsed)
+        line = m('live_counts', elapsed=elapsed, triggers=self.n_triggers, photo=self.n_photo, missed=self.n_missed)
+        if self.delays.n:
+            delays = self.delays.summary()
+            line += m('live_delays', mean=delays.mean, std=delays.std, p99=delays.p99, p999=delays.p999)
+        if recent_delays:
+            line += m('live_recent', n=len(recent_delays), mean=np.mean(recent_delays))
+        return line
+
+
+def run(source, report_interval_s=REPORT_INTERVAL_S, language='en'):
+    """Feeds every block of `source` to a LiveMonitor and prints the statistics every interval."""
+    monitor = LiveMonitor(source.sampling_rate, source.n_channels, source.dtype, language=language)
+    print(monitor.messages('live_header', rate=source.sampling_rate))
+    recent = []
+    next_report = report_interval_s
+    try:
+        for block in source:
+            recent.extend(monitor.process(block))
+            if monitor.ring.total / source.sampling_rate >= next_report:
+                print(monitor.summary(recent))
+                recent = []
+                next_report += report_interval_s
+    except KeyboardInterrupt:
+        print(monitor.messages('interrupted'))
+    print(monitor.summary(recent))
+    return monitor
@@ -0,0 +1,49 @@
+import os
+
+from .csv_loader import cached_column_length, csv_column_count, load_csv_column
+from .wav_reader import MappedWav
+
+
+class CsvRecording:
+    """
+    CSV capture exposing the same interface as `MappedWav` (`sampling_rate`,
+    `n_channels`, `channel(i)`). Columns are parsed on first access only
+    (and cached as .npy next to the file).
+    """
+
+    def __init__(self, filename, sampling_rate, delimiter=','):
+        self.filename = filename
+        self.sampling_rate = sampling_rate
+        self.delimiter = delimiter
+        self.n_channels = csv_column_count(filename, delimiter)
+        self._columns = {}
+
+    def channel(self, index):
+        if not 0 <= index < self.n_channels:
+            raise ValueError(f"Column {index} requested but the file has {self.n_channels} column(s).")
+        if index not in self._columns:
+            self._columns[index] = load_csv_column(self.filename, index, self.delimiter)
+        return self._columns[index]
+
+    def n_samples(self, index):
+        """Length of column `index` without parsing the CSV (None when neither loaded nor cached)."""
+        if index in self._columns:
+            return len(self._columns[index])
+        return cached_column_length(self.filename, index)
+
+
+def open_recording(filename, sampling_rate=None):
+    """
+    Opens a WAV (memory-mapped) or CSV recording. CSV files carry no sampling
+    rate, so `sampling_rate` is required for them.
+    """
+    if not os.path.exists(filename):
+        raise FileNotFoundError(filename)
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.wav':
+        return MappedWav(filename)
+    if ext == '.csv':
+        if sampling_rate is None:
+            raise ValueError("CSV recordings need an explicit sampling rate.")
+        return CsvRecording(filename, sampling_rate)
+    raise ValueError(f"Unsupported file type '{ext}'.")
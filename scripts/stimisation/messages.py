@@ -0,0 +1,219 @@
+LANGUAGES = ('en', 'fr')
+
+CATALOGUES = {
+    'en': {
+        # --- Console ---
+        'analysis_header': "--- Analyzing file: {filename} ---",
+        'csv_header': "--- CSV File Analysis: {filename} ---",
+        'csv_sampling_rate': "Sampling rate used: {rate} Hz (threshold set at {percent}% of max amplitude)",
+        'sampling_rate': "Sampling rate: {rate} Hz",
+        'single_column': "The file contains a single column, it will be used.",
+        'n_columns': "The file contains {n} columns, using column {column}.",
+        'threshold': "Detection threshold (absolute): {threshold:.2f} ({percent}% of max amplitude)",
+        'threshold_adaptive': "Detection threshold: adaptive (rolling percentiles, hysteresis)",
+        'dual_thresholds': "TTL threshold: {ttl:.2f}, Photodiode threshold: {photo:.2f}",
+        'min_distance': "Minimum distance between peaks: {ms} ms",
+        'pulse_width': "TTL pulse width: mean {mean:.3f} ms, min {min:.3f}, max {max:.3f}",
+        'photodiode_filter': "Photodiode filtered before detection: {params}",
+        'results': "\n--- RESULTS ---",
+        'n_peaks': "Number of detected peaks: {n}",
+        'n_intervals': "Total number of intervals: {n}",
+        'mean_interval': "Mean interval: {mean:.2f} ms",
+        'min_interval': "Min interval: {min:.2f} ms",
+        'max_interval': "Max interval: {max:.2f} ms",
+        'channel_header': "\n--- {label} ---",
+        'n_triggers': "Number of triggers: {n}",
+        'interval_summary': "Min: {min:.2f}, Max: {max:.2f}, Std Dev: {std:.2f}",
+        'delay_header': "\n--- Delay between Arduino trigger and photodiode detection ---",
+        'n_matched': "Number of matched triggers: {n}",
+        'unmatched': "Unmatched triggers: {unmatched}, Orphan photodiode events: {orphans}",
+        'delay_summary': "Mean delay: {mean:.2f} ms, Min: {min:.2f}, Max: {max:.2f}, Jitter: {jitter:.2f} ms",
+        'percentiles': "Percentiles: p50 {p50:.3f}, p95 {p95:.3f}, p99 {p99:.3f}, p99.9 {p999:.3f} ms",
+        'clock_drift': "Clock drift: {ppm:+.2f} ppm, Jitter after drift correction: {jitter:.2f} ms",
+        'no_interval': "No interval to plot — figure was not created.",
+        'figure_saved': "\nFigure saved at: '{path}'",
+        'signal_plot_saved': "Signal plot saved: {path}",
+        'file_not_found': "ERROR: File '{filename}' not found.",
+        'error': "An error occurred: {error}",
+        'need_two_channels': "WAV file must contain at least 2 channels (Arduino, Photodiode).",
+        'role_summary': "{name} (channel {channel}, {kind}): {n} events, mean interval {mean:.2f} ms",
+        'matrix_header': "\n--- Delays (mean ± jitter in ms, n matched), rows: source, columns: target ---",
+        'matrix_saved': "\nDelay matrix saved at: '{path}'",
+        'events_saved': "Event table saved at: '{path}'",
+        'schedule_header': "\n--- Schedule {label}: fitted period {period:.3f} ms, {n} slots ---",
+        'schedule_summary': "Hit: {hit}, Early: {early}, Late: {late}, Duplicated: {duplicated}, Missed: {missed}",
+        'anomalies_saved': "Anomalous slots saved at: '{path}'",
+        'response_header': "\n--- Photodiode response around the triggers ({n} trials, medians) ---",
+        'response_summary': "Latency (10%): {latency:.3f} ms, Rise 10–90%: {rise:.3f} ms, Peak: {peak:.3f} ms, "
+                            "Amplitude: {amplitude:.1f}",
+        # --- Batch, benchmark, clock drift, live monitor ---
+        'batch_no_file': "No CSV or WAV file found.",
+        'batch_header': "--- Batch analysis of {n} file(s) on {workers} worker(s) ---",
+        'batch_file_error': "{filename}: ERROR {error}",
+        'batch_file': "{filename} ({kind}): {n} peaks, mean interval {mean:.2f} ms",
+        'batch_pooled': "\nAll files: {n} delays, mean {mean:.3f} ms, p50 {p50:.3f}, p95 {p95:.3f}, p99 {p99:.3f}, "
+                        "p99.9 {p999:.3f} ms",
+        'summary_saved': "\nSummary saved at: '{path}'",
+        'benchmark_case': "{stage:>9} {n:>12.0e} samples: {ms:10.2f} ms, {rate:12.3e} samples/s, "
+                          "peak RSS {rss:8.1f} MB",
+        'results_saved': "\nResults saved at: '{path}'",
+        'regression': "REGRESSION {stage} @ {n:.0e}: {rate:.3e} samples/s (baseline {reference:.3e})",
+        'no_regression': "No throughput regression.",
+        'drift_header': "--- {n_log} logged stimuli, {n_photo} photodiode onsets ---",
+        'matched_events': "Matched events: {n}",
+        'clock_model': "Clock model: {y} = {slope:.9f} * {x} + {intercept:.3f} ms",
+        'clock_drift_rate': "Drift: {ppm:+.2f} ppm ({per_hour:+.2f} ms per hour)",
+        'clock_jitter': "Residual jitter after correction: {jitter:.3f} ms ({outliers} outlier(s) out of {n})",
+        'drift_segment': "  from {start:8.1f} s: drift {ppm:+.2f} ppm, jitter {jitter:.3f} ms",
+        'live_header': "--- Live monitoring at {rate} Hz (Ctrl+C to stop) ---",
+        'live_calibrating': "[{elapsed:7.1f} s] calibrating thresholds (waiting for a pulse on both channels)...",
+        'live_counts': "[{elapsed:7.1f} s] triggers: {triggers}, photodiode: {photo}, missed: {missed}",
+        'live_delays': " | delay mean {mean:.2f} ms, jitter {std:.2f} ms, p99 {p99:.2f} ms, p99.9 {p999:.2f} ms",
+        'live_recent': " | last {n}: mean {mean:.2f} ms",
+        'acquisition_warning': "Acquisition warning: {status}",
+        'interrupted': "🛑 Manually interrupted.",
+        # --- Figures ---
+        'interval_title': "Interval Distribution\nFile: {name}",
+        'interval_xlabel': "Interval duration (ms)",
+        'interval_ylabel': "Number of intervals",
+        'mean_label': "Mean = {mean:.2f} ms",
+        'trigger_interval_title': "Trigger intervals - {label}",
+        'duration_xlabel': "Duration (ms)",
+        'occurrences': "Occurrences",
+        'delay_title': "Delay between Arduino trigger and photodiode detection",
+        'delay_xlabel': "Delay (ms)",
+        'signal_title': "Signal and Detected Peaks — {name}",
+        'samples': "Samples",
+        'amplitude': "Amplitude",
+        'signal_label': "Signal",
+        'peaks_label': "Detected Peaks",
+        'response_title': "Average photodiode response — {name}",
+        'response_xlabel': "Time from trigger (ms)",
+        'average_label': "Average of {n} trials",
+        'trigger_label': "Trigger",
+        'latency_label': "Median latency (10%) = {latency:.2f} ms",
+        # --- Figure file names ---
+        'intervals_file': "distribution_intervals_{name}",
+        'channel_intervals_file': "hist_intervals_{label}",
+        'delay_file': "delay_arduino_vs_photodiode",
+        'signal_file': "signal_peaks_{name}",
+        'delay_matrix_file': "delay_matrix_{name}",
+        'schedule_file': "schedule_anomalies_{name}",
+        'response_file': "photodiode_response_{name}",
+    },
+    'fr': {
+        # --- Console ---
+        'analysis_header': "--- Analyse du fichier : {filename} ---",
+        'csv_header': "--- Analyse du fichier CSV : {filename} ---",
+        'csv_sampling_rate': "Taux d'échantillonnage utilisé : {rate} Hz (seuil à {percent}% de l'amplitude max)",
+        'sampling_rate': "Taux d'échantillonnage : {rate} Hz",
+        'single_column': "Le fichier contient une seule colonne, elle sera utilisée.",
+        'n_columns': "Le fichier contient {n} colonnes, utilisation de la colonne {column}.",
+        'threshold': "Seuil de détection (absolu) : {threshold:.2f} ({percent}% de l'amplitude max)",
+        'threshold_adaptive': "Seuil de détection : adaptatif (percentiles glissants, hystérésis)",
+        'dual_thresholds': "Seuil TTL : {ttl:.2f}, Seuil Photodiode : {photo:.2f}",
+        'min_distance': "Distance minimale entre pics : {ms} ms",
+        'pulse_width': "Largeur des impulsions TTL : moyenne {mean:.3f} ms, min {min:.3f}, max {max:.3f}",
+        'photodiode_filter': "Photodiode filtrée avant la détection : {params}",
+        'results': "\n--- RÉSULTATS ---",
+        'n_peaks': "Nombre de pics détectés : {n}",
+        'n_intervals': "Nombre total d'intervalles : {n}",
+        'mean_interval': "Intervalle moyen : {mean:.2f} ms",
+        'min_interval': "Intervalle min : {min:.2f} ms",
+        'max_interval': "Intervalle max : {max:.2f} ms",
+        'channel_header': "\n--- {label} ---",
+        'n_triggers': "Nombre de triggers : {n}",
+        'interval_summary': "Min : {min:.2f}, Max : {max:.2f}, Écart-type : {std:.2f}",
+        'delay_header': "\n--- Délai entre trigger Arduino et détection visuelle ---",
+        'n_matched': "Nombre d'appariements : {n}",
+        'unmatched': "Triggers non appariés : {unmatched}, Événements photodiode orphelins : {orphans}",
+        'delay_summary': "Délai moyen : {mean:.2f} ms, Min : {min:.2f}, Max : {max:.2f}, Jitter : {jitter:.2f} ms",
+        'percentiles': "Percentiles : p50 {p50:.3f}, p95 {p95:.3f}, p99 {p99:.3f}, p99.9 {p999:.3f} ms",
+        'clock_drift': "Dérive d'horloge : {ppm:+.2f} ppm, Jitter après correction de la dérive : {jitter:.2f} ms",
+        'no_interval': "Aucun intervalle à tracer, la figure n'a pas été créée.",
+        'figure_saved': "\nFigure sauvegardée avec succès sous : '{path}'",
+        'signal_plot_saved': "Tracé du signal sauvegardé : {path}",
+        'file_not_found': "ERREUR : Le fichier '{filename}' est introuvable.",
+        'error': "Une erreur est survenue : {error}",
+        'need_two_channels': "Le fichier WAV doit avoir au moins 2 canaux (Arduino, Photodiode).",
+        'role_summary': "{name} (canal {channel}, {kind}) : {n} événements, intervalle moyen {mean:.2f} ms",
+        'matrix_header': "\n--- Délais (moyenne ± jitter en ms, n appariés), lignes : source, colonnes : cible ---",
+        'matrix_saved': "\nMatrice des délais sauvegardée sous : '{path}'",
+        'events_saved': "Table des événements sauvegardée sous : '{path}'",
+        'schedule_header': "\n--- Planning {label} : période ajustée {period:.3f} ms, {n} créneaux ---",
+        'schedule_summary': "Réussis : {hit}, En avance : {early}, En retard : {late}, Doublés : {duplicated}, "
+                            "Manqués : {missed}",
+        'anomalies_saved': "Créneaux anormaux sauvegardés sous : '{path}'",
+        'response_header': "\n--- Réponse de la photodiode autour des triggers ({n} essais, médianes) ---",
+        'response_summary': "Latence (10%) : {latency:.3f} ms, Montée 10–90% : {rise:.3f} ms, Pic : {peak:.3f} ms, "
+                            "Amplitude : {amplitude:.1f}",
+        # --- Lots, banc d'essai, dérive d'horloge, moniteur en direct ---
+        'batch_no_file': "Aucun fichier CSV ou WAV trouvé.",
+        'batch_header': "--- Analyse par lots de {n} fichier(s) sur {workers} processus ---",
+        'batch_file_error': "{filename} : ERREUR {error}",
+        'batch_file': "{filename} ({kind}) : {n} pics, intervalle moyen {mean:.2f} ms",
+        'batch_pooled': "\nTous les fichiers : {n} délais, moyenne {mean:.3f} ms, p50 {p50:.3f}, p95 {p95:.3f}, "
+                        "p99 {p99:.3f}, p99.9 {p999:.3f} ms",
+        'summary_saved': "\nRésumé sauvegardé sous : '{path}'",
+        'benchmark_case': "{stage:>9} {n:>12.0e} échantillons : {ms:10.2f} ms, {rate:12.3e} échantillons/s, "
+                          "RSS max {rss:8.1f} Mo",
+        'results_saved': "\nRésultats sauvegardés sous : '{path}'",
+        'regression': "RÉGRESSION {stage} @ {n:.0e} : {rate:.3e} échantillons/s (référence {reference:.3e})",
+        'no_regression': "Aucune régression de débit.",
+        'drift_header': "--- {n_log} stimuli journalisés, {n_photo} onsets photodiode ---",
+        'matched_events': "Événements appariés : {n}",
+        'clock_model': "Modèle d'horloge : {y} = {slope:.9f} * {x} + {intercept:.3f} ms",
+        'clock_drift_rate': "Dérive : {ppm:+.2f} ppm ({per_hour:+.2f} ms par heure)",
+        'clock_jitter': "Jitter résiduel après correction : {jitter:.3f} ms ({outliers} valeur(s) aberrante(s) "
+                        "sur {n})",
+        'drift_segment': "  à partir de {start:8.1f} s : dérive {ppm:+.2f} ppm, jitter {jitter:.3f} ms",
+        'live_header': "--- Surveillance en direct à {rate} Hz (Ctrl+C pour arrêter) ---",
+        'live_calibrating': "[{elapsed:7.1f} s] calibration des seuils (attente d'une impulsion sur les deux voies)...",
+        'live_counts': "[{elapsed:7.1f} s] triggers : {triggers}, photodiode : {photo}, manqués : {missed}",
+        'live_delays': " | délai moyen {mean:.2f} ms, jitter {std:.2f} ms, p99 {p99:.2f} ms, p99.9 {p999:.2f} ms",
+        'live_recent': " | {n} derniers : moyenne {mean:.2f} ms",
+        'acquisition_warning': "Avertissement d'acquisition : {status}",
+        'interrupted': "🛑 Interrompu manuellement.",
+        # --- Figures ---
+        'interval_title': "Distribution des intervalles\nFichier: {name}",
+        'interval_xlabel': "Durée de l'intervalle (ms)",
+        'interval_ylabel': "Nombre d'intervalles",
+        'mean_label': "Moyenne = {mean:.2f} ms",
+        'trigger_interval_title': "Intervalles entre triggers - {label}",
+        'duration_xlabel': "Durée (ms)",
+        'occurrences': "Occurrences",
+        'delay_title': "Délai entre trigger Arduino et photodiode",
+        'delay_xlabel': "Délai (ms)",
+        'signal_title': "Signal et pics détectés — {name}",
+        'samples': "Échantillons",
+        'amplitude': "Amplitude",
+        'signal_label': "Signal",
+        'peaks_label': "Pics détectés",
+        'response_title': "Réponse moyenne de la photodiode — {name}",
+        'response_xlabel': "Temps depuis le trigger (ms)",
+        'average_label': "Moyenne de {n} essais",
+        'trigger_label': "Trigger",
+        'latency_label': "Latence médiane (10%) = {latency:.2f} ms",
+        # --- Figure file names ---
+        'intervals_file': "distribution_intervalles_{name}",
+        'channel_intervals_file': "hist_intervalles_{label}",
+        'delay_file': "delai_arduino_vs_photodiode",
+        'signal_file': "signal_pics_{name}",
+        'delay_matrix_file': "matrice_delais_{name}",
+        'schedule_file': "anomalies_planning_{name}",
+        'response_file': "reponse_photodiode_{name}",
+    },
+}
+
+
+class Messages:
+    """Formats the messages of one language catalogue: `messages('n_peaks', n=12)`."""
+
+    def __init__(self, language='en'):
+        if language not in CATALOGUES:
+            raise ValueError(f"Unknown language '{language}', expected one of {LANGUAGES}.")
+        self.language = language
+        self._catalogue = CATALOGUES[language]
+
+    def __call__(self, key, **values):
+        return self._catalogue[key].format(**values)
@@ -0,0 +1,98 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .detectors import detect_events
+from .stats import delay_stats
+from .trigger_matching import bounded_lag, match_events
+
+# Default (threshold ratio, absolute, digital) per kind of line; digital lines go through the edge detector
+ROLE_KINDS = {
+    'ttl': (0.5, False, True),
+    'photodiode': (0.8, True, False),
+    'button': (0.5, True, False),
+    'meg_trigger': (0.5, False, True),
+}
+
+ChannelRole = namedtuple('ChannelRole', ['name', 'channel', 'kind', 'ratio', 'absolute', 'digital'])
+ChannelRole.__doc__ = "One analysed line: display name, channel index, kind and detection settings."
+
+DelayMatrix = namedtuple('DelayMatrix', ['names', 'mean', 'jitter', 'n_matched', 'stats'])
+DelayMatrix.__doc__ = """
+Pairwise delays between roles: `mean`, `jitter` (ms) and `n_matched` are
+(N, N) arrays indexed [source, target] (NaN / 0 for pairs not computed),
+`stats` maps (source name, target name) to the full DelayStats.
+"""
+
+
+def make_roles(mapping):
+    """
+    Builds ChannelRole tuples from {name: (channel, kind)} or
+    {name: (channel, kind, ratio, absolute)}.
+    """
+    roles = []
+    for name, spec in mapping.items():
+        channel, kind = spec[0], spec[1]
+        if kind not in ROLE_KINDS:
+            raise ValueError(f"Unknown line kind '{kind}', expected one of {tuple(ROLE_KINDS)}.")
+        ratio, absolute, digital = ROLE_KINDS[kind]
+        if len(spec) >= 4:
+            ratio, absolute = spec[2:4]
+        roles.append(ChannelRole(name, channel, kind, ratio, absolute, digital))
+    return roles
+
+
+def parse_role(text):
+    """'name=channel:kind' (command-line form) → (name, (channel, kind))."""
+    name, _, spec = text.partition('=')
+    channel, _, kind = spec.partition(':')
+    if not name or not channel.isdigit():
+        raise ValueError(f"Invalid role '{text}', expected NAME=CHANNEL:KIND.")
+    return name, (int(channel), kind or 'ttl')
+
+
+def detect_all_channels(recording, roles, min_distance_ms, threshold_mode='max', onset_method='crossing', cache=None,
+                        workers=None, filters=None):
+    """
+    Detects the events of every role of a recording with `detect_events`, so
+    the threshold modes, `filters` (channel index → SOS), event `cache` and
+    sharded `workers` behave as in the two-channel analyses: the channels
+    share the same streaming passes, digital lines go through the edge
+    detector. Returns {role name: Detection}.
+    """
+    for role in roles:
+        if not 0 <= role.channel < recording.n_channels:
+            raise ValueError(f"Channel {role.channel} requested but the file has {recording.n_channels} channel(s).")
+    channels = [(role.channel, role.ratio, role.absolute, role.digital) for role in roles]
+    detections = detect_events(recording, channels, min_distance_ms, threshold_mode, onset_method, cache, workers,
+                               filters)
+    return {role.name: detection for role, detection in zip(roles, detections)}
+
+
+def delay_matrix(detections, sampling_rate, pairs=None, mode='after', max_lag_ms=None, one_to_one=True):
+    """
+    Delays between the event times of role pairs, computed from the detections
+    already in memory. `pairs` lists (source, target) names; by default every
+    ordered pair of distinct roles is computed. Pairs are one-to-one within
+    `max_lag_ms`, half the source's median interval by default.
+    """
+    names = list(detections)
+    if pairs is None:
+        pairs = [(source, target) for source in names for target in names if source != target]
+    index = {name: k for k, name in enumerate(names)}
+    n = len(names)
+    mean = np.full((n, n), np.nan)
+    jitter = np.full((n, n), np.nan)
+    n_matched = np.zeros((n, n), dtype=int)
+    max_lag = None if max_lag_ms is None else max_lag_ms * sampling_rate / 1000
+
+    stats = {}
+    for source, target in pairs:
+        source_times, target_times = detections[source].times, detections[target].times
+        match = match_events(source_times, target_times, mode=mode, max_lag=bounded_lag(source_times, max_lag),
+                             one_to_one=one_to_one)
+        pair_stats = delay_stats(source_times, target_times, match, sampling_rate)
+        stats[(source, target)] = pair_stats
+        i, j = index[source], index[target]
+        mean[i, j], jitter[i, j], n_matched[i, j] = pair_stats.mean, pair_stats.jitter, len(pair_stats.delays_ms)
+    return DelayMatrix(names, mean, jitter, n_matched, stats)
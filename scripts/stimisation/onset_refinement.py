@@ -0,0 +1,90 @@
+import numpy as np
+
+# --- Parameters ---
+BLOCK_SIZE = 1 << 20  # Samples scanned at once when searching threshold crossings
+
+ONSET_METHODS = ('crossing', 'parabolic')
+
+
+def upward_crossings(signal, level, absolute=False, block_size=BLOCK_SIZE):
+    """
+    Indices i where the signal goes from below `level` to at or above it
+    between samples i and i + 1, found block by block (one sample of overlap).
+    """
+    found = []
+    n_samples = len(signal)
+    for start in range(0, max(n_samples - 1, 0), block_size):
+        block = np.asarray(signal[start:start + block_size + 1])
+        if absolute:
+            block = np.abs(block)
+        below = block < level
+        found.append(np.flatnonzero(below[:-1] & ~below[1:]) + start)
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def refine_crossing(signal, peaks, level, absolute=False, max_lookback=None, crossings=None):
+    """
+    Sub-sample onset of each event: the last upward crossing of `level` before
+    its peak, linearly interpolated between the two samples around it.
+
+    Events without a crossing (or further than `max_lookback` samples from it)
+    keep their integer peak index. `crossings` skips the scan when the
+    `upward_crossings` of the signal are already known.
+    """
+    peaks = np.asarray(peaks)
+    times = peaks.astype(float)
+    if crossings is None:
+        crossings = upward_crossings(signal, level, absolute)
+    if len(peaks) == 0 or len(crossings) == 0:
+        return times
+
+    k = np.searchsorted(crossings, peaks, side='left') - 1
+    valid = k >= 0
+    before = crossings[np.maximum(k, 0)]
+    if max_lookback is not None:
+        valid &= peaks - before <= max_lookback
+    before = before[valid]
+
+    # Gather only the samples around each crossing
+    y0 = np.asarray(signal[before]).astype(float)
+    y1 = np.asarray(signal[before + 1]).astype(float)
+    if absolute:
+        y0, y1 = np.abs(y0), np.abs(y1)
+    times[valid] = before + (level - y0) / (y1 - y0)
+    return times
+
+
+def refine_parabolic(signal, peaks, absolute=False):
+    """
+    Sub-sample peak position from the parabola through the peak sample and its
+    two neighbours (offset clipped to +/- half a sample, flat tops unchanged).
+    """
+    peaks = np.asarray(peaks)
+    times = peaks.astype(float)
+    inner = (peaks > 0) & (peaks < len(signal) - 1)
+    centre = peaks[inner]
+    y0, y1, y2 = (np.asarray(signal[centre + shift]).astype(float) for shift in (-1, 0, 1))
+    if absolute:
+        y0, y1, y2 = np.abs(y0), np.abs(y1), np.abs(y2)
+
+    curvature = y0 - 2 * y1 + y2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = np.where(curvature != 0, 0.5 * (y0 - y2) / curvature, 0.0)
+    times[inner] = centre + np.clip(offset, -0.5, 0.5)
+    return times
+
+
+def refine_onsets(signal, peaks, method='crossing', level=None, absolute=False, max_lookback=None):
+    """
+    Refines integer event indices to fractional sample positions for all events at once.
+    `method` is 'crossing' (needs `level`), 'parabolic', or None to keep the indices.
+    """
+    if method is None:
+        return np.asarray(peaks).astype(float)
+    if method == 'crossing':
+        if level is None:
+            raise ValueError("The 'crossing' method needs a threshold level.")
+        return refine_crossing(signal, peaks, level, absolute, max_lookback)
+    if method == 'parabolic':
+        return refine_parabolic(signal, peaks, absolute)
+    raise ValueError(f"Unknown onset method '{method}', expected one of {ONSET_METHODS}.")
@@ -0,0 +1,325 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from .detectors import detect_events
+from .epochs import epoch_shapes
+from .export import export_events
+from .filtering import design_filter
+from .loaders import open_recording
+from .multichannel import delay_matrix, detect_all_channels, make_roles
+from .reporting import Reporter
+from .schedule import align_schedule, schedule_counts
+from .stats import delay_stats, interval_stats
+from .trigger_matching import bounded_lag, match_events
+
+AnalysisResult = namedtuple('AnalysisResult', ['sampling_rate', 'detections', 'intervals', 'delays', 'channels',
+                                               'schedules', 'response'], defaults=(None, None))
+AnalysisResult.__doc__ = """
+Outcome of one analysis: one Detection and one IntervalStats per analysed
+channel, and the DelayStats of dual-channel recordings (the DelayMatrix of
+multi-channel ones, None otherwise). `channels` holds the (label, channel
+index) of each detection, `schedules` their ScheduleAlignment when a
+stimulation period was given, `response` the EpochShapes of the photodiode
+around the triggers when epochs were requested (None otherwise).
+"""
+
+
+def _finish(reporter, filename, result, export_dir):
+    """Exports the per-event table of `result` when `export_dir` is set."""
+    if export_dir is not None:
+        reporter.say('events_saved', path=export_events(filename, result, export_dir))
+    return result
+
+
+def _report_intervals(reporter, stats, filename, suffix='', n_peaks_key='n_peaks'):
+    reporter.say('results')
+    reporter.say(n_peaks_key, n=stats.n_events)
+    reporter.say('n_intervals', n=len(stats.intervals_ms))
+    if len(stats.intervals_ms) == 0:
+        reporter.say('no_interval')
+        return False
+    reporter.say('mean_interval', mean=stats.mean)
+    reporter.say('min_interval', min=stats.min)
+    reporter.say('max_interval', max=stats.max)
+    reporter.say('percentiles', **stats.distribution._asdict())
+    save_path = reporter.interval_histogram(stats, os.path.basename(filename), suffix)
+    if save_path is not None:
+        reporter.say('figure_saved', path=save_path)
+    return True
+
+
+def _report_threshold(reporter, detection, ratio):
+    if detection.threshold is None:
+        reporter.say('threshold_adaptive')
+    else:
+        reporter.say('threshold', threshold=detection.threshold, percent=round(ratio * 100))
+
+
+def _n_samples(recording, channel):
+    """Length of the analysed channel without reading its samples (WAV header, loaded or cached CSV column)."""
+    if hasattr(recording, 'n_frames'):
+        return recording.n_frames
+    return recording.n_samples(channel)
+
+
+def _report_schedule(reporter, detection, recording, channel, period_ms, n_trials, filename, label, start=None):
+    """
+    Aligns the events on the expected schedule, prints the slot counts and
+    saves the anomalous slots. Missed trials before the first event are only
+    counted from `start` (the first trigger for the photodiode).
+    """
+    if period_ms is None:
+        return None
+    sampling_rate = recording.sampling_rate
+    alignment = align_schedule(detection.times, sampling_rate, period_ms, n_slots=n_trials,
+                               n_samples=_n_samples(recording, channel), start=start)
+    reporter.say('schedule_header', label=label, period=alignment.period / sampling_rate * 1000,
+                 n=len(alignment.status))
+    reporter.say('schedule_summary', **schedule_counts(alignment))
+    if len(alignment.ranges):
+        name = os.path.splitext(os.path.basename(filename))[0] + '_' + label
+        save_path = reporter.save_schedule_anomalies(alignment, sampling_rate, name)
+        if save_path is not None:
+            reporter.say('anomalies_saved', path=save_path)
+    return alignment
+
+
+def _photodiode_filters(reporter, sampling_rate, channels, params):
+    """`detect_events` filters of the photodiode channels (None without filter parameters or channel)."""
+    if not params or not channels:
+        return None
+    reporter.say('photodiode_filter', params=", ".join(f"{name}={value}" for name, value in params.items()))
+    sos = design_filter(sampling_rate, **params)
+    return {channel: sos for channel in channels}
+
+
+def _report_widths(reporter, detection, sampling_rate):
+    """Pulse widths of a digital channel (edge detector only)."""
+    if detection.widths is None or not np.any(np.isfinite(detection.widths)):
+        return
+    widths = detection.widths / sampling_rate * 1000
+    reporter.say('pulse_width', mean=np.nanmean(widths), min=np.nanmin(widths), max=np.nanmax(widths))
+
+
+def analyze_csv(filename, sampling_rate, column=0, min_distance_ms=1.0, threshold_mode='max',
+                onset_method='crossing', ratio=0.5, cache=None, reporter=None, export_dir=None, period_ms=None,
+                n_trials=None):
+    """
+    Trigger intervals of one CSV column (absolute amplitude). With the
+    stimulation `period_ms` (and optionally `n_trials`), every expected
+    trigger is labelled hit / early / late / duplicated / missed.
+    """
+    reporter = Reporter() if reporter is None else reporter
+    recording = open_recording(filename, sampling_rate)
+    reporter.say('csv_header', filename=filename)
+    reporter.say('csv_sampling_rate', rate=sampling_rate, percent=round(ratio * 100))
+    if recording.n_channels == 1:
+        column = 0
+        reporter.say('single_column')
+    else:
+        reporter.say('n_columns', n=recording.n_channels, column=column)
+
+    detection, = detect_events(recording, [(column, ratio, True, True)], min_distance_ms, threshold_mode, onset_method,
+                               cache)
+    _report_threshold(reporter, detection, ratio)
+    reporter.say('min_distance', ms=min_distance_ms)
+    _report_widths(reporter, detection, sampling_rate)
+
+    stats = interval_stats(detection.times, sampling_rate)
+    _report_intervals(reporter, stats, filename, '_csv')
+    schedule = _report_schedule(reporter, detection, recording, column, period_ms, n_trials, filename, 'trigger')
+    result = AnalysisResult(sampling_rate, [detection], [stats], None, [('trigger', column)], [schedule])
+    return _finish(reporter, filename, result, export_dir)
+
+
+def analyze_trigger_wav(filename, min_distance_ms=100.0, threshold_mode='max', ratio=0.5, cache=None,
+                        reporter=None, export_dir=None, workers=None, period_ms=None, n_trials=None):
+    """
+    Arduino trigger intervals of a WAV recording (first channel, absolute
+    amplitude), aligned on the stimulation schedule when `period_ms` is given.
+    """
+    reporter = Reporter() if reporter is None else reporter
+    recording = open_recording(filename)
+    reporter.say('analysis_header', filename=filename)
+    reporter.say('sampling_rate', rate=recording.sampling_rate)
+
+    detection, = detect_events(recording, [(0, ratio, True, True)], min_distance_ms, threshold_mode, cache=cache,
+                               workers=workers)
+    _report_threshold(reporter, detection, ratio)
+    reporter.say('min_distance', ms=min_distance_ms)
+    _report_widths(reporter, detection, recording.sampling_rate)
+
+    stats = interval_stats(detection.times, recording.sampling_rate)
+    _report_intervals(reporter, stats, filename, '_wav')
+    schedule = _report_schedule(reporter, detection, recording, 0, period_ms, n_trials, filename, 'trigger')
+    result = AnalysisResult(recording.sampling_rate, [detection], [stats], None, [('trigger', 0)], [schedule])
+    return _finish(reporter, filename, result, export_dir)
+
+
+def analyze_photodiode_wav(filename, min_distance_ms=100.0, threshold_mode='max', ratio=0.8, envelope=True,
+                           zoom_peaks=3, zoom_window_ms=150.0, cache=None, reporter=None,
+                           export_dir=None, workers=None, period_ms=None, n_trials=None, photodiode_filter=None):
+    """
+    Photodiode flash intervals of a WAV recording (first channel) and the
+    signal plot; with `period_ms`, every expected flash is labelled hit /
+    early / late / duplicated / missed. `photodiode_filter` holds `design_filter`
+    arguments (e.g. {'notch_hz': 50}) to clean the channel before detection.
+    """
+    reporter = Reporter() if reporter is None else reporter
+    recording = open_recording(filename)
+    sampling_rate = recording.sampling_rate
+    reporter.say('analysis_header', filename=filename)
+    reporter.say('sampling_rate', rate=sampling_rate)
+
+    filters = _photodiode_filters(reporter, sampling_rate, [0], photodiode_filter)
+    detection, = detect_events(recording, [(0, ratio, True)], min_distance_ms, threshold_mode, cache=cache,
+                               workers=workers, filters=filters)
+    _report_threshold(reporter, detection, ratio)
+
+    stats = interval_stats(detection.times, sampling_rate)
+    if _report_intervals(reporter, stats, filename):
+        base_name = os.path.splitext(os.path.basename(filename))[0]
+        save_path = reporter.signal_plot(recording.channel(0), detection.peaks, base_name, envelope, zoom_peaks,
+                                         int(zoom_window_ms * sampling_rate / 1000))
+        if save_path is not None:
+            reporter.say('signal_plot_saved', path=save_path)
+    schedule = _report_schedule(reporter, detection, recording, 0, period_ms, n_trials, filename, 'photodiode')
+    result = AnalysisResult(sampling_rate, [detection], [stats], None, [('photodiode', 0)], [schedule])
+    return _finish(reporter, filename, result, export_dir)
+
+
+def analyze_dual_wav(filename, min_distance_ms=100.0, threshold_mode='max', onset_method='crossing',
+                     match_mode='after', max_lag_ms=None, one_to_one=True, cache=None, reporter=None,
+                     export_dir=None, workers=None, period_ms=None, n_trials=None, epoch_ms=None,
+                     photodiode_filter=None):
+    """
+    Arduino (channel 0) and photodiode (channel 1) intervals, and the trigger
+    → photodiode delays. With `period_ms`, both channels are also aligned on
+    the stimulation schedule: a missed flash then shows apart from a missed
+    trigger. With `epoch_ms` = (before, after), the photodiode waveform
+    around every trigger gives the per-trial response shape and its average.
+    `photodiode_filter` cleans the photodiode channel before detection only.
+    Each flash goes to one trigger within `max_lag_ms` (half the trigger
+    period by default), so a missed flash counts as unmatched.
+    """
+    reporter = Reporter() if reporter is None else reporter
+    recording = open_recording(filename)
+    if recording.n_channels < 2:
+        raise ValueError(reporter.messages('need_two_channels'))
+    sampling_rate = recording.sampling_rate
+    reporter.say('analysis_header', filename=filename)
+    reporter.say('sampling_rate', rate=sampling_rate)
+
+    # Dynamic thresholds, TTL edges, photodiode peaks of the absolute amplitude (same streaming passes for both)
+    filters = _photodiode_filters(reporter, sampling_rate, [1], photodiode_filter)
+    ttl, photo = detect_events(recording, [(0, 0.5, False, True), (1, 0.8, True)], min_distance_ms, threshold_mode,
+                               onset_method, cache, workers, filters)
+    if ttl.threshold is None:
+        reporter.say('threshold_adaptive')
+    else:
+        reporter.say('dual_thresholds', ttl=ttl.threshold, photo=photo.threshold)
+    _report_widths(reporter, ttl, sampling_rate)
+
+    intervals = []
+    for detection, label in ((ttl, "Arduino"), (photo, "Photodiode")):
+        stats = interval_stats(detection.times, sampling_rate)
+        intervals.append(stats)
+        reporter.say('channel_header', label=label)
+        reporter.say('n_triggers', n=stats.n_events)
+        reporter.say('mean_interval', mean=stats.mean)
+        reporter.say('interval_summary', min=stats.min, max=stats.max, std=stats.std)
+        reporter.say('percentiles', **stats.distribution._asdict())
+        if len(stats.intervals_ms) > 0:
+            reporter.channel_histogram(stats, label)
+
+    # Delay Arduino → Photodiode
+    max_lag = bounded_lag(ttl.times, None if max_lag_ms is None else max_lag_ms * sampling_rate / 1000)
+    match = match_events(ttl.times, photo.times, mode=match_mode, max_lag=max_lag, one_to_one=one_to_one)
+    delays = delay_stats(ttl.times, photo.times, match, sampling_rate)
+    reporter.say('delay_header')
+    reporter.say('n_matched', n=len(delays.delays_ms))
+    reporter.say('unmatched', unmatched=delays.n_unmatched, orphans=delays.n_orphans)
+    reporter.say('delay_summary', mean=delays.mean, min=delays.min, max=delays.max, jitter=delays.jitter)
+    reporter.say('percentiles', **delays.distribution._asdict())
+    if len(delays.delays_ms) >= 2:
+        # Drift between the Arduino timer and the display (photodiode) clock
+        reporter.say('clock_drift', ppm=delays.drift_ppm, jitter=delays.corrected_jitter)
+    if len(delays.delays_ms) > 0:
+        reporter.delay_histogram(delays)
+    # The photodiode schedule starts at the first trigger: flashes missed before the first detected one count
+    first_trigger = ttl.times[0] if len(ttl.times) else None
+    schedules = [_report_schedule(reporter, detection, recording, channel, period_ms, n_trials, filename, label,
+                                  start)
+                 for detection, channel, label, start in ((ttl, 0, 'ttl', None),
+                                                          (photo, 1, 'photodiode', first_trigger))]
+    response = None
+    if epoch_ms is not None:
+        response = epoch_shapes(recording.channel(1), ttl.peaks, sampling_rate, *epoch_ms, absolute=True)
+        reporter.say('response_header', n=len(response.events))
+        reporter.say('response_summary', latency=np.nanmedian(response.latency_ms),
+                     rise=np.nanmedian(response.rise_ms), peak=np.nanmedian(response.peak_ms),
+                     amplitude=np.nanmedian(response.amplitude))
+        save_path = reporter.response_plot(response, os.path.splitext(os.path.basename(filename))[0])
+        if save_path is not None:
+            reporter.say('figure_saved', path=save_path)
+    result = AnalysisResult(sampling_rate, [ttl, photo], intervals, delays, [('ttl', 0), ('photodiode', 1)],
+                            schedules, response)
+    return _finish(reporter, filename, result, export_dir)
+
+
+def analyze_multichannel_wav(filename, roles, pairs=None, min_distance_ms=100.0, threshold_mode='max',
+                             onset_method='crossing', match_mode='after', max_lag_ms=None, one_to_one=True,
+                             cache=None, reporter=None, export_dir=None, workers=None, photodiode_filter=None):
+    """
+    Any number of trigger / photodiode / response lines of one WAV recording.
+    `roles` maps a name to (channel, kind); delays are computed for `pairs` of
+    names (every ordered pair by default) from a single detection pass, with
+    the cache, workers and thresholds of the two-channel analyses.
+    `photodiode_filter` cleans every 'photodiode' line before detection.
+    """
+    reporter = Reporter() if reporter is None else reporter
+    recording = open_recording(filename)
+    sampling_rate = recording.sampling_rate
+    reporter.say('analysis_header', filename=filename)
+    reporter.say('sampling_rate', rate=sampling_rate)
+
+    roles = make_roles(roles)
+    photodiodes = [role.channel for role in roles if role.kind == 'photodiode']
+    filters = _photodiode_filters(reporter, sampling_rate, photodiodes, photodiode_filter)
+    detections = detect_all_channels(recording, roles, min_distance_ms, threshold_mode, onset_method, cache, workers,
+                                     filters)
+    intervals = []
+    for role in roles:
+        stats = interval_stats(detections[role.name].times, sampling_rate)
+        intervals.append(stats)
+        reporter.say('role_summary', name=role.name, channel=role.channel, kind=role.kind, n=stats.n_events,
+                     mean=stats.mean)
+
+    matrix = delay_matrix(detections, sampling_rate, pairs, match_mode, max_lag_ms, one_to_one)
+    reporter.say('matrix_header')
+    reporter.delay_matrix_table(matrix)
+    save_path = reporter.save_delay_matrix(matrix, os.path.splitext(os.path.basename(filename))[0])
+    if save_path is not None:
+        reporter.say('matrix_saved', path=save_path)
+    result = AnalysisResult(sampling_rate, [detections[role.name] for role in roles], intervals, matrix,
+                            [(role.name, role.channel) for role in roles])
+    return _finish(reporter, filename, result, export_dir)
+
+
+def run_reported(analysis, filename, language='en', **params):
+    """
+    Runs one analysis for a command-line script: errors are printed in the
+    script language instead of being raised. Pass `cache=EventCache()` to
+    reuse the events detected by a previous run, `export_dir=...` to save the
+    per-event table, `workers=N` to split long WAV recordings over N processes.
+    """
+    reporter = Reporter(language)
+    try:
+        return analysis(filename, reporter=reporter, **params)
+    except FileNotFoundError:
+        reporter.say('file_not_found', filename=filename)
+    except Exception as e:
+        reporter.say('error', error=e)
+    return None
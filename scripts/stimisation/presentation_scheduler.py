@@ -0,0 +1,81 @@
+import csv
+import time
+
+import numpy as np
+
+# --- Parameters ---
+GUARD_MS = 2.0  # Spin-wait only during the last GUARD_MS before a deadline (sleep before)
+
+
+def periodic_schedule(n_onsets, period_ms, first_ms=None):
+    """Onset times (ms) of a periodic presentation: first_ms, first_ms + period_ms, ..."""
+    first_ms = period_ms if first_ms is None else first_ms
+    return first_ms + period_ms * np.arange(n_onsets, dtype=float)
+
+
+class PresentationScheduler:
+    """
+    Waits for precomputed onset deadlines with a hybrid sleep + spin strategy.
+
+    `time.sleep` is used until `guard_ms` before the deadline, so the core is
+    free for the render thread most of the time; the remaining guard band is
+    spin-waited, which keeps the wake-up precision of a busy loop. Planned and
+    actual onsets are stored in preallocated arrays to measure the slippage.
+    """
+
+    def __init__(self, schedule_ms, guard_ms=GUARD_MS, clock=time.perf_counter):
+        self.planned = np.asarray(schedule_ms, dtype=float)
+        if np.any(np.diff(self.planned) < 0):
+            raise ValueError("The onset schedule must be sorted.")
+        self.actual = np.full(len(self.planned), np.nan)
+        self.guard_ms = guard_ms
+        self._clock = clock
+        self._start = None
+
+    def start(self):
+        """Sets time zero of the schedule (called automatically by the first wait)."""
+        self._start = self._clock()
+
+    def now(self):
+        """Milliseconds since `start()`."""
+        return (self._clock() - self._start) * 1000
+
+    def wait_until(self, deadline_ms):
+        """Blocks until `deadline_ms`; returns immediately if it has already passed."""
+        if self._start is None:
+            self.start()
+        remaining = deadline_ms - self.now() - self.guard_ms
+        if remaining > 0:
+            time.sleep(remaining / 1000)
+        while self.now() < deadline_ms:
+            pass
+
+    def wait_for(self, index, lead_ms=0.0):
+        """Waits for onset `index` of the schedule, `lead_ms` early (e.g. to compensate the flip)."""
+        self.wait_until(self.planned[index] - lead_ms)
+
+    def record(self, index, onset_ms):
+        """Stores the measured onset time of presentation `index`."""
+        self.actual[index] = onset_ms
+
+    def slippage(self):
+        """Actual minus planned onset (ms) of the presentations recorded so far."""
+        done = ~np.isnan(self.actual)
+        return self.actual[done] - self.planned[done]
+
+    def summary(self):
+        slip = self.slippage()
+        if len(slip) == 0:
+            return "No onset recorded."
+        return (f"Onsets: {len(slip)}, slippage mean {np.mean(slip):.3f} ms, std {np.std(slip):.3f} ms, "
+                f"min {np.min(slip):.3f} ms, max {np.max(slip):.3f} ms")
+
+    def save_log(self, path):
+        """Writes one CSV line per recorded onset: index, planned, actual and slippage (ms)."""
+        done = np.flatnonzero(~np.isnan(self.actual))
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['index', 'planned_ms', 'actual_ms', 'slippage_ms'])
+            for k in done:
+                writer.writerow([k, f"{self.planned[k]:.3f}", f"{self.actual[k]:.3f}",
+                                 f"{self.actual[k] - self.planned[k]:.3f}"])
@@ -0,0 +1,182 @@
+import csv
+import os
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend
+import matplotlib.pyplot as plt
+
+from .envelope_plot import plot_signal_with_peaks, select_zoom_peaks
+from .messages import Messages
+from .schedule import HIT, SLOT_STATUSES
+from .streaming_stats import StreamingStats, histogram_edges
+
+# --- Parameters ---
+OUTPUT_DIR = 'figures'
+
+
+def _bins(values):
+    """Histogram bins fitted to the spread of the values (sub-millisecond jitter stays resolved)."""
+    return histogram_edges(StreamingStats.from_values(values))
+
+
+class Reporter:
+    """
+    Console and figure output of the analyses, in one language.
+
+    `verbose=False` silences the console, `output_dir=None` skips the figures
+    (batch runs only keep the returned statistics).
+    """
+
+    def __init__(self, language='en', output_dir=OUTPUT_DIR, verbose=True):
+        self.messages = Messages(language)
+        self.output_dir = output_dir
+        self.verbose = verbose
+
+    def say(self, key, **values):
+        if self.verbose:
+            print(self.messages(key, **values))
+
+    def _save_path(self, file_key, suffix='', extension='.png', **values):
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, self.messages(file_key, **values) + suffix + extension)
+
+    def interval_histogram(self, stats, name, suffix='', figsize=(12, 7)):
+        """Histogram of the intervals of one recording with its mean; returns the saved path."""
+        if self.output_dir is None:
+            return None
+        m = self.messages
+        plt.figure(figsize=figsize)
+        plt.hist(stats.intervals_ms, bins=_bins(stats.intervals_ms), edgecolor='black', alpha=0.75)
+        plt.axvline(stats.mean, color='red', linestyle='--', linewidth=2, label=m('mean_label', mean=stats.mean))
+        plt.title(m('interval_title', name=name), fontsize=16)
+        plt.xlabel(m('interval_xlabel'), fontsize=12)
+        plt.ylabel(m('interval_ylabel'), fontsize=12)
+        plt.legend()
+        plt.grid(True, linestyle='--', alpha=0.6)
+        save_path = self._save_path('intervals_file', suffix, name=os.path.splitext(name)[0])
+        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.close()
+        return save_path
+
+    def channel_histogram(self, stats, label):
+        """Interval histogram of one channel of a multi-channel recording."""
+        if self.output_dir is None:
+            return None
+        m = self.messages
+        plt.figure(figsize=(10, 5))
+        plt.hist(stats.intervals_ms, bins=_bins(stats.intervals_ms), edgecolor='black', alpha=0.8)
+        plt.axvline(stats.mean, color='red', linestyle='--', label=m('mean_label', mean=stats.mean))
+        plt.title(m('trigger_interval_title', label=label))
+        plt.xlabel(m('duration_xlabel'))
+        plt.ylabel(m('occurrences'))
+        plt.legend()
+        save_path = self._save_path('channel_intervals_file', label=label.lower().replace(" ", "_"))
+        plt.savefig(save_path)
+        plt.close()
+        return save_path
+
+    def delay_histogram(self, delays):
+        """Histogram of the trigger → photodiode delays."""
+        if self.output_dir is None:
+            return None
+        m = self.messages
+        mean = np.mean(delays.delays_ms)
+        plt.figure(figsize=(10, 5))
+        plt.hist(delays.delays_ms, bins=_bins(delays.delays_ms), edgecolor='black', alpha=0.8)
+        plt.axvline(mean, color='red', linestyle='--', label=m('mean_label', mean=mean))
+        plt.title(m('delay_title'))
+        plt.xlabel(m('delay_xlabel'))
+        plt.ylabel(m('occurrences'))
+        plt.legend()
+        save_path = self._save_path('delay_file')
+        plt.savefig(save_path)
+        plt.close()
+        return save_path
+
+    def response_plot(self, shapes, name):
+        """Grand-average photodiode response around the triggers, with the median latency."""
+        if self.output_dir is None or len(shapes.events) == 0:
+            return None
+        m = self.messages
+        latency = np.nanmedian(shapes.latency_ms)
+        plt.figure(figsize=(10, 5))
+        plt.plot(shapes.time_ms, shapes.average, color='black', label=m('average_label', n=len(shapes.events)))
+        plt.axvline(0, color='red', linestyle='--', label=m('trigger_label'))
+        plt.axvline(latency, color='gray', linestyle=':', label=m('latency_label', latency=latency))
+        plt.title(m('response_title', name=name))
+        plt.xlabel(m('response_xlabel'))
+        plt.ylabel(m('amplitude'))
+        plt.legend()
+        plt.grid(True, linestyle='--', alpha=0.6)
+        save_path = self._save_path('response_file', name=name)
+        plt.savefig(save_path)
+        plt.close()
+        return save_path
+
+    def signal_plot(self, signal, peaks, name, envelope=True, zoom_peaks=0, zoom_half_width=0):
+        """Signal with its detected peaks (min/max envelope unless `envelope=False`)."""
+        if self.output_dir is None:
+            return None
+        m = self.messages
+        save_path = self._save_path('signal_file', name=name)
+        title = m('signal_title', name=name)
+        if envelope:
+            # Rendering time depends on the figure width, not on the recording length
+            plot_signal_with_peaks(signal, peaks, title, save_path, zoom_peaks=select_zoom_peaks(peaks, zoom_peaks),
+                                   zoom_half_width=zoom_half_width, xlabel=m('samples'), ylabel=m('amplitude'),
+                                   signal_label=m('signal_label'), peaks_label=m('peaks_label'))
+        else:
+            plt.figure(figsize=(15, 5))
+            plt.plot(signal, label=m('signal_label'))
+            plt.plot(peaks, signal[peaks], 'rx', label=m('peaks_label'))
+            plt.title(title)
+            plt.xlabel(m('samples'))
+            plt.ylabel(m('amplitude'))
+            plt.legend()
+            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.close()
+        return save_path
+
+    def delay_matrix_table(self, matrix):
+        """Prints the pairwise delay matrix, one row per source role."""
+        if not self.verbose:
+            return
+        rows = []
+        for i, source in enumerate(matrix.names):
+            rows.append([source] + [
+                f"{matrix.mean[i, j]:.2f} ± {matrix.jitter[i, j]:.2f} ({matrix.n_matched[i, j]})"
+                if matrix.n_matched[i, j] else '-' for j in range(len(matrix.names))])
+        width = max(len(cell) for row in rows + [matrix.names] for cell in row) + 2
+        for row in [[''] + matrix.names] + rows:
+            print(''.join(f"{cell:>{width}}" for cell in row))
+
+    def save_delay_matrix(self, matrix, name):
+        """Writes one CSV line per computed pair; returns the saved path."""
+        if self.output_dir is None:
+            return None
+        save_path = self._save_path('delay_matrix_file', extension='.csv', name=name)
+        with open(save_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['source', 'target', 'n_matched', 'n_unmatched', 'n_orphans', 'mean_ms', 'min_ms',
+                             'max_ms', 'jitter_ms', 'drift_ppm'])
+            for (source, target), stats in matrix.stats.items():
+                writer.writerow([source, target, len(stats.delays_ms), stats.n_unmatched, stats.n_orphans]
+                                + [f"{value:.3f}" for value in (stats.mean, stats.min, stats.max, stats.jitter,
+                                                                stats.drift_ppm)])
+        return save_path
+
+    def save_schedule_anomalies(self, alignment, sampling_rate, name):
+        """Writes one CSV line per anomalous schedule slot (sample range to inspect); returns the saved path."""
+        if self.output_dir is None:
+            return None
+        save_path = self._save_path('schedule_file', extension='.csv', name=name)
+        anomalous = np.flatnonzero(alignment.status != HIT)
+        with open(save_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['slot', 'status', 'expected_s', 'start_sample', 'stop_sample', 'n_events', 'lateness_ms'])
+            for slot, (start, stop) in zip(anomalous, alignment.ranges):
+                writer.writerow([slot, SLOT_STATUSES[alignment.status[slot]],
+                                 f"{alignment.expected[slot] / sampling_rate:.6f}", start, stop,
+                                 alignment.counts[slot], f"{alignment.lateness[slot] / sampling_rate * 1000:.3f}"])
+        return save_path
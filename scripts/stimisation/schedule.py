@@ -0,0 +1,113 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .clock_alignment import fit_clock
+
+# --- Parameters ---
+EARLY_FRACTION = 0.25     # A slot collects the events from a quarter period before it to 3/4 period after it
+TOLERANCE_FRACTION = 0.1  # Default timing tolerance of a hit, as a fraction of the period
+N_INITIAL = 10            # Events of the first period fit, the fitted prefix then doubles
+
+HIT, EARLY, LATE, DUPLICATED, MISSED = 0, 1, 2, 3, 4
+SLOT_STATUSES = ('hit', 'early', 'late', 'duplicated', 'missed')
+
+ScheduleAlignment = namedtuple('ScheduleAlignment', ['expected', 'status', 'counts', 'lateness', 'event_slot',
+                                                     'period', 'ranges'])
+ScheduleAlignment.__doc__ = """
+Events aligned on a periodic schedule, all times in samples. Per slot: the
+expected time, the status (index into SLOT_STATUSES), the number of events
+and the lateness of its first event (NaN when missed). Per event: its slot
+(-1 outside the schedule). `period` is the fitted period and `ranges` the
+[start, stop) sample window of every anomalous slot, one row per anomaly.
+"""
+
+
+def fit_schedule(times, period, fit_period=True, n_initial=N_INITIAL):
+    """
+    First slot time and period of a periodic event stream (samples). The
+    phase is the circular mean of the events modulo the nominal `period`;
+    with `fit_period`, a robust line through (slot number, time) then absorbs
+    the clock drift, refitted on a prefix that doubles in length so that the
+    accumulated drift never shifts an event into the wrong slot.
+    """
+    times = np.asarray(times, dtype=float)
+    angles = 2 * np.pi * (times - times[0]) / period
+    origin = times[0] + np.angle(np.mean(np.exp(1j * angles))) / (2 * np.pi) * period
+    if not fit_period:
+        return origin, float(period)
+    count = min(n_initial, len(times))
+    while True:
+        slots = np.round((times[:count] - origin) / period)
+        if np.ptp(slots) > 0:
+            fit = fit_clock(slots, times[:count])
+            origin, period = fit.intercept, fit.slope
+        if count == len(times):
+            return origin, period
+        count = min(2 * count, len(times))
+
+
+def align_schedule(times, sampling_rate, period_ms, tolerance_ms=None, n_slots=None, n_samples=None,
+                   fit_period=True, start=None):
+    """
+    Labels every slot of a periodic stimulation schedule as hit, early, late,
+    duplicated or missed from the detected event times (samples), in one
+    vectorized pass.
+
+    A slot collects the events from EARLY_FRACTION of a period before its
+    expected time to the rest of the period after it. It is missed without
+    any event, duplicated with several, early / late when its single event is
+    more than `tolerance_ms` (TOLERANCE_FRACTION of the period by default)
+    before / after the expected time.
+
+    Slots start at the first event's slot, or at the first slot expected at
+    or after `start` (sample time of the first trial, e.g. the first trigger
+    when aligning the photodiode): missed trials before the first detected
+    event are only reported with `start`. They end at the last event, or
+    after `n_slots` slots when the number of trials is known (trailing missed
+    trials are then reported too). `n_samples` clips the anomaly ranges to
+    the recording.
+    """
+    times = np.asarray(times, dtype=float)
+    period = period_ms * sampling_rate / 1000
+    if period <= 0:
+        raise ValueError(f"The schedule period must be positive, got {period_ms} ms.")
+    if len(times) == 0:
+        n_slots = n_slots or 0  # No event to place the slots: only their number is known
+        return ScheduleAlignment(np.full(n_slots, np.nan), np.full(n_slots, MISSED, dtype=np.int8),
+                                 np.zeros(n_slots, dtype=np.int64), np.full(n_slots, np.nan),
+                                 np.empty(0, dtype=np.int64), period, np.empty((0, 2), dtype=np.int64))
+
+    origin, period = fit_schedule(times, period, fit_period)
+    slot = np.floor((times - origin) / period + EARLY_FRACTION).astype(np.int64)
+    first = slot[0] if start is None else int(np.ceil((start - origin) / period - EARLY_FRACTION))
+    slot -= first
+    n_slots = max(slot[-1] + 1, 0) if n_slots is None else n_slots
+    expected = origin + (first + np.arange(n_slots)) * period
+    inside = (slot >= 0) & (slot < n_slots)
+    event_slot = np.where(inside, slot, -1)
+
+    counts = np.bincount(slot[inside], minlength=n_slots)
+    lateness = np.full(n_slots, np.nan)
+    first_event = np.minimum(np.searchsorted(slot, np.arange(n_slots), side='left'), len(slot) - 1)
+    hit = counts > 0
+    lateness[hit] = times[first_event[hit]] - expected[hit]
+
+    tolerance = TOLERANCE_FRACTION * period if tolerance_ms is None else tolerance_ms * sampling_rate / 1000
+    status = np.full(n_slots, HIT, dtype=np.int8)
+    status[lateness < -tolerance] = EARLY
+    status[lateness > tolerance] = LATE
+    status[counts > 1] = DUPLICATED
+    status[counts == 0] = MISSED
+
+    anomalous = np.flatnonzero(status != HIT)
+    starts = np.floor(expected[anomalous] - EARLY_FRACTION * period)
+    ranges = np.stack([starts, starts + np.ceil(period)], axis=1)
+    ranges = np.clip(ranges, 0, np.inf if n_samples is None else n_samples).astype(np.int64)
+    return ScheduleAlignment(expected, status, counts, lateness, event_slot, period, ranges)
+
+
+def schedule_counts(alignment):
+    """Number of slots of each status, keyed by SLOT_STATUSES."""
+    found = np.bincount(alignment.status, minlength=len(SLOT_STATUSES))
+    return dict(zip(SLOT_STATUSES, found.tolist()))
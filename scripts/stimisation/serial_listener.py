@@ -0,0 +1,80 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+
+# --- Parameters ---
+READ_TIMEOUT = 0.05  # Seconds a read may block, bounds the time needed to stop the thread
+
+SerialCommand = namedtuple('SerialCommand', ['command', 'arrival_ns', 'complete_ns'])
+SerialCommand.__doc__ = """
+A framed command with the `time.perf_counter_ns()` arrival of its first byte
+and of the byte completing the frame.
+"""
+
+
+class LineFramer:
+    """Splits the byte stream into newline-terminated ASCII commands (surrounding whitespace removed)."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._arrival_ns = None
+
+    def feed(self, data, timestamp_ns):
+        """Adds received bytes and returns the completed commands as (command, arrival_ns, complete_ns)."""
+        commands = []
+        while data:
+            if not self._buffer:
+                self._arrival_ns = timestamp_ns
+            end = data.find(b'\n')
+            if end < 0:
+                self._buffer += data
+                break
+            self._buffer += data[:end]
+            command = self._buffer.decode(errors='ignore').strip()
+            if command:
+                commands.append(SerialCommand(command, self._arrival_ns, timestamp_ns))
+            self._buffer.clear()
+            data = data[end + 1:]
+        return commands
+
+
+class SerialListener(threading.Thread):
+    """
+    Background thread reading a serial port and queueing framed commands.
+
+    Bytes are timestamped with `time.perf_counter_ns()` as soon as the read
+    returns, and framing/decoding happens here, so the presentation thread only
+    has to dequeue (`queue.SimpleQueue`, no polling of the port).
+    """
+
+    def __init__(self, port, framer=None):
+        super().__init__(daemon=True)
+        self.port = port
+        self.framer = LineFramer() if framer is None else framer
+        self.commands = queue.SimpleQueue()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            # Block for the first byte, then take whatever else is already buffered
+            data = self.port.read(1)
+            if not data:
+                continue
+            timestamp_ns = time.perf_counter_ns()
+            waiting = self.port.in_waiting
+            if waiting:
+                data += self.port.read(waiting)
+            for command in self.framer.feed(data, timestamp_ns):
+                self.commands.put(command)
+
+    def get(self, timeout=None):
+        """Next command, or None if none arrived within `timeout` seconds (0 for non-blocking)."""
+        try:
+            return self.commands.get(block=timeout != 0, timeout=timeout or None)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
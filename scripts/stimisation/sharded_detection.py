@@ -0,0 +1,131 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from .edge_detection import TtlEdges, refractory, transitions
+from .streaming_detection import select_by_distance
+from .wav_reader import MappedWav
+
+# --- Parameters ---
+SHARD_SIZE = 1 << 23  # Frames per shard (several shards per worker keep the cores busy)
+RUN_SCAN = 1 << 16    # Samples read at a time when a shard boundary falls on a plateau
+
+
+def _values(signal, start, stop, absolute):
+    values = np.asarray(signal[start:stop])
+    return np.abs(values) if absolute else values
+
+
+def _run_start(signal, index, absolute):
+    """First index of the constant run containing `index`."""
+    value = _values(signal, index, index + 1, absolute)[0]
+    start = index
+    while start > 0:
+        low = max(0, start - RUN_SCAN)
+        differ = np.flatnonzero(_values(signal, low, start, absolute) != value)
+        if len(differ):
+            return low + differ[-1] + 1
+        start = low
+    return 0
+
+
+def _run_stop(signal, index, absolute):
+    """One past the last index of the constant run containing `index`."""
+    value = _values(signal, index, index + 1, absolute)[0]
+    stop = index + 1
+    while stop < len(signal):
+        high = min(len(signal), stop + RUN_SCAN)
+        differ = np.flatnonzero(_values(signal, stop, high, absolute) != value)
+        if len(differ):
+            return stop + differ[0]
+        stop = high
+    return len(signal)
+
+
+def _shard_maxima(filename, start, stop, specs):
+    wav = MappedWav(filename)
+    return [_values(wav.channel(spec[0]), start, stop, spec[2]).max() for spec in specs]
+
+
+def _scan_shard(filename, start, stop, specs, thresholds, crossings):
+    """
+    Everything about frames [start, stop) that does not depend on the other
+    shards: all rising / falling edges (with their onsets) of digital channels,
+    all candidate peaks (with heights) and upward crossings of analog ones.
+    The shard reads just enough context to see the same neighbourhood as a
+    serial pass: one sample for edges, the whole plateau for peaks.
+    """
+    wav = MappedWav(filename)
+    found = []
+    for (channel, _, absolute, digital), level in zip(specs, thresholds):
+        signal = wav.channel(channel)
+        if digital:
+            low = max(start - 1, 0)
+            values = _values(signal, low, stop, absolute)
+            high = values >= level
+            changes = transitions(high)
+            becomes_high = high[changes + 1]
+            up, down = changes[becomes_high], changes[~becomes_high]
+            y0, y1 = values[up].astype(float), values[up + 1].astype(float)
+            found.append((low + up + 1, low + up + (level - y0) / (y1 - y0), low + down + 1))
+            continue
+
+        # A plateau whose middle lies in the shard may extend beyond it
+        low = max(_run_start(signal, start, absolute) - 1, 0)
+        high = min(_run_stop(signal, stop - 1, absolute) + 1, len(signal))
+        values = _values(signal, low, high, absolute)
+        peaks, props = find_peaks(values, height=level)
+        inside = (peaks >= start - low) & (peaks < stop - low)
+        shard_crossings = None
+        if crossings:
+            window = values[start - low:min(stop + 1, high) - low]
+            below = window < level
+            shard_crossings = start + np.flatnonzero(below[:-1] & ~below[1:])
+        found.append((low + peaks[inside], props['peak_heights'][inside], shard_crossings))
+    return found
+
+
+def detect_sharded(wav, specs, min_distance, workers=None, shard_size=SHARD_SIZE, crossings=False):
+    """
+    Two-pass 'max' detection of `run_channel_detectors` spread over a process
+    pool. Workers reopen the memory-mapped file, so no samples are pickled.
+
+    `specs` gives one (channel, ratio, absolute, digital) tuple per channel.
+    Shards return every raw candidate; the refractory selection of edges and
+    the distance selection of peaks, which chain across shard boundaries, then
+    run once over the merged candidates, in file order. The result is the
+    same as the serial detectors whatever the number of workers.
+
+    Returns the thresholds and, per channel, TtlEdges (digital) or the peak
+    indices and their upward crossings (analog, crossings None unless asked).
+    """
+    n_frames = wav.n_frames
+    starts = list(range(0, n_frames, shard_size))
+    stops = [min(start + shard_size, n_frames) for start in starts]
+    distance = math.ceil(min_distance)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shard_maxima = list(executor.map(_shard_maxima, repeat(wav.filename), starts, stops, repeat(specs)))
+        thresholds = [spec[1] * max(maxima[k] for maxima in shard_maxima) for k, spec in enumerate(specs)]
+        shards = list(executor.map(_scan_shard, repeat(wav.filename), starts, stops, repeat(specs),
+                                   repeat(thresholds), repeat(crossings)))
+
+    results = []
+    for k, spec in enumerate(specs):
+        parts = [shard[k] for shard in shards]
+        if spec[3]:
+            rising, onsets, falling = (np.concatenate([part[j] for part in parts]) for j in range(3))
+            keep = refractory(rising, distance)
+            rising, onsets = rising[keep], onsets[keep]
+            after = np.searchsorted(falling, rising)
+            ends = np.full(len(rising), -1, dtype=np.int64)
+            ends[after < len(falling)] = falling[after[after < len(falling)]]
+            results.append(TtlEdges(rising, ends, np.where(ends >= 0, ends - rising, np.nan), onsets))
+        else:
+            peaks = np.concatenate([part[0] for part in parts])
+            heights = np.concatenate([part[1] for part in parts])
+            found = np.concatenate([part[2] for part in parts]) if crossings else None
+            results.append((peaks[select_by_distance(peaks, heights, distance)], found))
+    return thresholds, results
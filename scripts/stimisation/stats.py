@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .clock_alignment import fit_clock
+from .streaming_stats import StreamingStats
+
+# --- Parameters ---
+DRIFT_LAG_FRACTION = 0.5  # Drift pairs lie within this fraction of the median trigger interval of the median delay
+
+IntervalStats = namedtuple('IntervalStats', ['n_events', 'intervals_ms', 'mean', 'min', 'max', 'std', 'distribution'])
+DelayStats = namedtuple('DelayStats', ['delays_ms', 'n_unmatched', 'n_orphans', 'mean', 'min', 'max', 'jitter',
+                                       'drift_ppm', 'corrected_jitter', 'match', 'distribution'])
+
+
+def interval_stats(times, sampling_rate):
+    """
+    Intervals between consecutive events (ms), their summary (NaN without
+    intervals) and their percentiles (LatencySummary).
+    """
+    intervals = np.diff(np.asarray(times, dtype=float)) / sampling_rate * 1000
+    distribution = StreamingStats.from_values(intervals).summary()
+    if len(intervals) == 0:
+        return IntervalStats(len(times), intervals, np.nan, np.nan, np.nan, np.nan, distribution)
+    return IntervalStats(len(times), intervals, np.mean(intervals), np.min(intervals), np.max(intervals),
+                         np.std(intervals), distribution)
+
+
+def _drift_pairs(trigger_times, match, delays, to_ms):
+    """
+    Pairs fit for the drift: the closest trigger of each event (one-to-one),
+    with a delay within the lag bound of their median delay.
+    """
+    reliable = np.zeros(len(delays), dtype=bool)
+    if len(delays) == 0:
+        return reliable
+    event_idx = np.asarray(match.event_idx)
+    order = np.lexsort((np.abs(delays), event_idx))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = event_idx[order][1:] != event_idx[order][:-1]
+    reliable[order[first]] = True
+    if len(trigger_times) >= 2:
+        bound = DRIFT_LAG_FRACTION * np.median(np.diff(np.asarray(trigger_times, dtype=float))) * to_ms
+        reliable &= np.abs(delays - np.median(delays[reliable])) <= bound
+    return reliable
+
+
+def delay_stats(trigger_times, event_times, match, sampling_rate):
+    """
+    Trigger → event delays (ms) of a `match_events` result, their summary and
+    the clock drift between both streams (robust linear fit, NaN below 2 pairs).
+    The MatchResult is kept to trace every delay back to its events, the
+    LatencySummary gives the tail percentiles.
+
+    The drift is fitted on the closest trigger of each event only, with a
+    delay within DRIFT_LAG_FRACTION of a trigger interval of the median
+    delay, so that missed events paired with the next one do not bias the
+    slope.
+    """
+    to_ms = 1000 / sampling_rate
+    triggers = np.asarray(trigger_times, dtype=float)[match.trigger_idx] * to_ms
+    events = np.asarray(event_times, dtype=float)[match.event_idx] * to_ms
+    delays = events - triggers
+    summary = (np.mean(delays), np.min(delays), np.max(delays), np.std(delays)) if len(delays) else (np.nan,) * 4
+    drift = (np.nan, np.nan)
+    reliable = _drift_pairs(trigger_times, match, delays, to_ms)
+    if np.count_nonzero(reliable) >= 2:
+        fit = fit_clock(triggers[reliable], events[reliable])
+        drift = (fit.drift_ppm, fit.jitter)
+    return DelayStats(delays, len(match.unmatched_triggers), len(match.orphan_events), *summary, *drift,
+                      match, StreamingStats.from_values(delays).summary())
@@ -0,0 +1,160 @@
+import math
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from .edge_detection import StreamingEdgeDetector
+from .wav_reader import MappedWav
+
+# --- Parameters ---
+BLOCK_SIZE = 1 << 20  # Number of frames read per block (~1M frames)
+
+
+def select_by_distance(peaks, heights, distance):
+    """
+    Mask of the candidates kept by the `distance` constraint, with the greedy
+    selection of `find_peaks(..., distance=...)`: candidates are visited in
+    the reverse order of `argsort(heights)` and each kept peak suppresses its
+    neighbours closer than `distance`.
+
+    The sort is stable, so among equal heights closer than `distance` the
+    latest peak wins, whichever part of the candidates is selected at once:
+    streaming, sharded and serial runs agree. scipy sorts with numpy's default
+    (unstable, SIMD-dependent) sort, so for such ties it may keep another of
+    the tied peaks; otherwise the peaks are the same.
+    """
+    keep = np.ones(len(peaks), dtype=bool)
+    for j in np.argsort(heights, kind='stable')[::-1]:
+        if not keep[j]:
+            continue
+        k = j - 1
+        while k >= 0 and peaks[j] - peaks[k] < distance:
+            keep[k] = False
+            k -= 1
+        k = j + 1
+        while k < len(peaks) and peaks[k] - peaks[j] < distance:
+            keep[k] = False
+            k += 1
+    return keep
+
+
+class StreamingPeakDetector:
+    """
+    Incremental equivalent of `find_peaks(signal, height=height, distance=distance)`.
+
+    Blocks are fed one after the other with `feed()`; the detector keeps a
+    small carry-over of samples so that plateaus spanning a block boundary are
+    handled exactly like the single-shot call, and keeps candidate peaks until
+    no later peak can fall within the `distance` refractory window. Equal
+    heights closer than `distance` go to the latest peak, whereas scipy's
+    choice among them follows numpy's sort (see `select_by_distance`).
+    """
+
+    def __init__(self, height, distance, absolute=False):
+        self.height = height
+        self.distance = math.ceil(distance)
+        self.absolute = absolute
+        self._carry = None
+        self._offset = 0  # Global index of the first carried sample
+        self._pending = np.empty(0, dtype=np.int64)
+        self._pending_heights = np.empty(0)
+
+    def feed(self, block):
+        """Processes the next block and returns the peaks that became final."""
+        block = np.abs(block) if self.absolute else np.asarray(block)
+        buf = block if self._carry is None else np.concatenate((self._carry, block))
+        if len(buf) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        local_peaks, props = find_peaks(buf, height=self.height)
+        self._pending = np.concatenate((self._pending, local_peaks + self._offset))
+        self._pending_heights = np.concatenate((self._pending_heights, props['peak_heights']))
+
+        # Keep the trailing constant run (plus one sample of left context):
+        # a plateau touching the end of the buffer is not resolved yet.
+        changes = np.flatnonzero(buf != buf[-1])
+        if buf[-1] >= self.height and len(changes) > 0:
+            cut = changes[-1]
+        else:
+            # Below the threshold the run can never become a peak
+            cut = len(buf) - 1
+        self._carry = buf[cut:].copy()
+        self._offset += cut
+
+        # Any future peak lies strictly after the first carried sample
+        return self._release(self._offset + 1)
+
+    def finish(self):
+        """Flushes the last candidates once the stream is exhausted."""
+        return self._release(None)
+
+    def _release(self, next_possible):
+        peaks, heights = self._pending, self._pending_heights
+        if len(peaks) == 0:
+            return peaks
+
+        # Groups of candidates closer than `distance` only interact among themselves
+        gaps = np.flatnonzero(np.diff(peaks) >= self.distance) + 1
+        if next_possible is None or next_possible - peaks[-1] >= self.distance:
+            closed = len(peaks)
+        elif len(gaps) > 0:
+            closed = gaps[-1]
+        else:
+            return np.empty(0, dtype=np.int64)
+
+        keep = select_by_distance(peaks[:closed], heights[:closed], self.distance)
+        self._pending, self._pending_heights = peaks[closed:], heights[closed:]
+        return peaks[:closed][keep]
+
+
+def run_channel_detectors(signals, specs, min_distance, block_size=BLOCK_SIZE):
+    """
+    Detects events on several signals of the same length (arrays, memory-mapped
+    channels) in two streaming passes, only one block being materialised at a time.
+
+    `specs` gives one (threshold ratio, absolute[, digital]) tuple per signal.
+    The first pass finds each signal's maximum (the threshold is a fraction of
+    it, as in the single-shot scripts); the second pass runs the detectors:
+    rising edges for digital (TTL) signals, peaks otherwise.
+    Returns the thresholds, the detectors and the event indices per signal.
+    """
+    n_samples = len(signals[0]) if signals else 0
+    maxima = [None] * len(signals)
+    for start in range(0, n_samples, block_size):
+        for k, (signal, spec) in enumerate(zip(signals, specs)):
+            values = np.asarray(signal[start:start + block_size])
+            block_max = (np.abs(values) if spec[1] else values).max()
+            maxima[k] = block_max if maxima[k] is None else max(maxima[k], block_max)
+
+    thresholds = [spec[0] * maximum for spec, maximum in zip(specs, maxima)]
+    detectors = [(StreamingEdgeDetector if len(spec) > 2 and spec[2] else StreamingPeakDetector)(
+                     threshold, min_distance, spec[1]) for threshold, spec in zip(thresholds, specs)]
+
+    found = [[] for _ in signals]
+    for start in range(0, n_samples, block_size):
+        for detector, signal, peaks in zip(detectors, signals, found):
+            peaks.append(detector.feed(signal[start:start + block_size]))
+    for detector, peaks in zip(detectors, found):
+        peaks.append(detector.finish())
+
+    return thresholds, detectors, [np.concatenate(peaks) for peaks in found]
+
+
+def detect_channel_peaks(signals, specs, min_distance, block_size=BLOCK_SIZE):
+    """Thresholds and event indices per signal (see `run_channel_detectors`)."""
+    thresholds, _, peaks = run_channel_detectors(signals, specs, min_distance, block_size)
+    return thresholds, peaks
+
+
+def detect_wav_peaks(filename, channels, min_distance_ms, block_size=BLOCK_SIZE):
+    """
+    Streaming peak detection on channels of a WAV file (see `detect_channel_peaks`).
+    `channels` is a list of (channel index, threshold ratio, absolute[, digital]) tuples.
+    Returns the sampling rate, the thresholds and the peak indices per channel.
+    """
+    reader = MappedWav(filename)
+    signals = [reader.channel(channel[0]) for channel in channels]
+    specs = [channel[1:] for channel in channels]
+    min_distance_samples = int(min_distance_ms * reader.sampling_rate / 1000)
+    thresholds, peaks = detect_channel_peaks(signals, specs, min_distance_samples, block_size)
+    return reader.sampling_rate, thresholds, peaks
@@ -0,0 +1,209 @@
+from collections import namedtuple
+
+import numpy as np
+
+# --- Parameters ---
+PERCENTILES = (50, 95, 99, 99.9)  # Reported latency percentiles
+DIGEST_COMPRESSION = 200          # Quantile sketch size: about COMPRESSION / 2 centroids
+HISTOGRAM_BINS = 1000
+MIN_PLOT_BINS = 10
+MAX_PLOT_BINS = 200
+
+LatencySummary = namedtuple('LatencySummary', ['n', 'mean', 'std', 'min', 'max', 'p50', 'p95', 'p99', 'p999'])
+LatencySummary.__doc__ = "Moments, extremes and PERCENTILES of a distribution (NaN when empty)."
+
+
+class RunningMoments:
+    """Count, mean, variance (Welford / Chan updates) and extremes of a stream of values."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, n, mean, m2, minimum, maximum):
+        total = self.n + n
+        if n == 0:
+            return
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, values):
+        """Adds a chunk of values (one vectorized pass, then a pairwise merge)."""
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values):
+            mean = values.mean()
+            self._combine(len(values), mean, np.sum((values - mean) ** 2), values.min(), values.max())
+
+    def merge(self, other):
+        """Adds the values summarised by another accumulator (e.g. from another process)."""
+        self._combine(other.n, other.mean, other._m2, other.min, other.max)
+
+    @property
+    def variance(self):
+        return self._m2 / self.n if self.n else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class QuantileDigest:
+    """
+    Mergeable quantile sketch (merging t-digest): values are buffered, then
+    sorted with the existing centroids and grouped so that each centroid spans
+    at most one unit of the arcsine scale function. Centroids stay small near
+    both tails, which keeps p99 / p99.9 accurate with a fixed memory.
+    """
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        self.compression = compression
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer = []
+        self._buffered = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _add(self, means, weights):
+        self._buffer.append((means, weights))
+        self._buffered += len(means)
+        if self._buffered >= 5 * self.compression:
+            self._compress()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self._add(values, np.ones(len(values)))
+
+    def merge(self, other):
+        other._compress()
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._add(other._means, other._weights)
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self._means] + [means for means, _ in self._buffer])
+        weights = np.concatenate([self._weights] + [weights for _, weights in self._buffer])
+        self._buffer, self._buffered = [], 0
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        q_left = (np.cumsum(weights) - weights) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        groups = np.floor(k - k[0])
+        starts = np.flatnonzero(np.r_[True, np.diff(groups) > 0])
+        self._weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / self._weights
+
+    @property
+    def n(self):
+        self._compress()
+        return float(self._weights.sum())
+
+    def quantile(self, q):
+        """Quantile(s) `q` in [0, 1], interpolated between centroid centres (NaN when empty)."""
+        self._compress()
+        if len(self._means) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        total = self._weights.sum()
+        centres = np.cumsum(self._weights) - self._weights / 2
+        return np.interp(np.asarray(q) * total, np.r_[0, centres, total], np.r_[self.min, self._means, self.max])
+
+
+class FixedHistogram:
+    """
+    Fixed-memory histogram over [low, high) with linear or logarithmic bins,
+    plus underflow / overflow counts. Histograms with the same bins merge by
+    adding their counts.
+    """
+
+    def __init__(self, low, high, n_bins=HISTOGRAM_BINS, log=False):
+        if not low < high or (log and low <= 0):
+            raise ValueError(f"Invalid histogram range [{low}, {high}) (log bins need low > 0).")
+        self.edges = np.geomspace(low, high, n_bins + 1) if log else np.linspace(low, high, n_bins + 1)
+        self.log = log
+        self.counts = np.zeros(n_bins + 2, dtype=np.int64)  # [underflow, bins..., overflow]
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        self.counts += np.bincount(np.searchsorted(self.edges, values[~np.isnan(values)], side='right'),
+                                   minlength=len(self.counts))
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only histograms with identical bins can be merged.")
+        self.counts += other.counts
+
+    @property
+    def underflow(self):
+        return int(self.counts[0])
+
+    @property
+    def overflow(self):
+        return int(self.counts[-1])
+
+
+class StreamingStats:
+    """
+    Moments and quantiles of a stream of latencies, updated chunk by chunk and
+    mergeable across chunks, files and worker processes (picklable).
+    """
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        self.moments = RunningMoments()
+        self.digest = QuantileDigest(compression)
+
+    @classmethod
+    def from_values(cls, values):
+        stats = cls()
+        stats.update(values)
+        return stats
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        self.moments.update(values)
+        self.digest.update(values)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        return self
+
+    @property
+    def n(self):
+        return self.moments.n
+
+    def percentiles(self, percentiles=PERCENTILES):
+        return self.digest.quantile(np.asarray(percentiles) / 100)
+
+    def summary(self):
+        m = self.moments
+        if m.n == 0:
+            return LatencySummary(0, *(np.nan,) * 8)
+        return LatencySummary(m.n, m.mean, m.std, m.min, m.max, *self.percentiles(PERCENTILES))
+
+
+def histogram_edges(stats, min_bins=MIN_PLOT_BINS, max_bins=MAX_PLOT_BINS):
+    """
+    Plot bins fitted to a distribution: Freedman–Diaconis width from the
+    interquartile range, over [min, max], between `min_bins` and `max_bins` bins.
+    """
+    low, high = stats.moments.min, stats.moments.max
+    if stats.n == 0 or not high > low:
+        return min_bins
+    q25, q75 = stats.digest.quantile([0.25, 0.75])
+    width = 2 * (q75 - q25) * stats.n ** (-1 / 3)
+    n_bins = int(np.clip(np.ceil((high - low) / width), min_bins, max_bins)) if width > 0 else max_bins
+    return np.linspace(low, high, n_bins + 1)
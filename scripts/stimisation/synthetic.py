@@ -0,0 +1,132 @@
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+# --- Parameters ---
+SAMPLING_RATE = 100000
+PERIOD_MS = 500.0        # Trigger period (Arduino timer)
+PULSE_MS = 1.0           # TTL pulse width
+FLASH_MS = 100.0         # Duration of the white square
+JITTER_MS = 0.05         # Gaussian jitter of the trigger onsets
+DELAY_MS = 18.0          # Mean trigger → photodiode delay
+DELAY_STD_MS = 0.5       # Delay spread (Gaussian)
+RISE_MS = 0.5            # Photodiode time constants (first-order response)
+FALL_MS = 2.0
+NOISE = 0.01             # Gaussian noise, as a fraction of full scale
+DRIFT_PPM = 0.0          # Arduino clock error relative to the recorder
+ARTIFACT_RATE = 0.0      # Isolated full-scale spikes per second (photodiode channel)
+MISSED_RATE = 0.0        # Probability that a flash is not displayed
+BLOCK_SIZE = 1 << 20
+
+TTL_LEVEL = 0.6          # Channel amplitudes, as a fraction of full scale
+PHOTO_LEVEL = 0.75
+
+SyntheticTruth = namedtuple('SyntheticTruth', ['sampling_rate', 'n_samples', 'ttl_onsets', 'photo_onsets'])
+SyntheticTruth.__doc__ = """
+Ground truth of a synthetic session: fractional onset samples of each TTL
+pulse and of the matching flash (NaN when the flash was missed).
+"""
+
+
+def make_truth(n_samples, sampling_rate=SAMPLING_RATE, period_ms=PERIOD_MS, jitter_ms=JITTER_MS, delay_ms=DELAY_MS,
+               delay_std_ms=DELAY_STD_MS, drift_ppm=DRIFT_PPM, missed_rate=MISSED_RATE, seed=0):
+    """Draws the trigger and flash onsets of a session of `n_samples` samples."""
+    rng = np.random.default_rng(seed)
+    to_samples = sampling_rate / 1000
+    period = period_ms * to_samples * (1 + drift_ppm * 1e-6)
+    margin = (delay_ms + 6 * delay_std_ms + FLASH_MS + 10 * FALL_MS) * to_samples
+    n_triggers = max(0, int((n_samples - margin - period) // period))
+    ttl = period * np.arange(1, n_triggers + 1) + rng.normal(0, jitter_ms * to_samples, n_triggers)
+    photo = ttl + rng.normal(delay_ms, delay_std_ms, n_triggers) * to_samples
+    photo[rng.random(n_triggers) < missed_rate] = np.nan
+    return SyntheticTruth(sampling_rate, n_samples, ttl, photo)
+
+
+def _render(t, onsets, shape, length):
+    """Sum of one pulse shape per onset at sample times `t` (pulses must not overlap)."""
+    out = np.zeros(len(t))
+    if len(onsets) == 0:
+        return out
+    k = np.searchsorted(onsets, t, side='right') - 1
+    valid = k >= 0
+    dt = t[valid] - onsets[k[valid]]
+    inside = dt < length
+    values = np.zeros(len(dt))
+    values[inside] = shape(dt[inside])
+    out[valid] = values
+    return out
+
+
+def render_block(truth, start, stop, pulse_ms=PULSE_MS, flash_ms=FLASH_MS, rise_ms=RISE_MS, fall_ms=FALL_MS,
+                 noise=NOISE, artifact_rate=ARTIFACT_RATE, seed=0):
+    """
+    Samples [start, stop) of both channels as a float (frames, 2) array in
+    [-1, 1]: TTL pulses on channel 0, photodiode flashes on channel 1.
+    Noise and artifacts are seeded per block start, so blocks are reproducible.
+    """
+    to_samples = truth.sampling_rate / 1000
+    pulse, flash = pulse_ms * to_samples, flash_ms * to_samples
+    rise, fall = rise_ms * to_samples, fall_ms * to_samples
+    t = np.arange(start, stop, dtype=float)
+
+    photo_onsets = truth.photo_onsets[~np.isnan(truth.photo_onsets)]
+    flash_top = 1 - np.exp(-flash / rise)
+
+    def flash_shape(dt):
+        on = np.minimum(dt, flash)
+        level = 1 - np.exp(-on / rise)
+        return np.where(dt < flash, level, flash_top * np.exp(-(dt - flash) / fall))
+
+    block = np.empty((len(t), 2))
+    block[:, 0] = TTL_LEVEL * _render(t, truth.ttl_onsets, lambda dt: np.ones(len(dt)), pulse)
+    block[:, 1] = PHOTO_LEVEL * _render(t, photo_onsets, flash_shape, flash + 10 * fall)
+
+    rng = np.random.default_rng([seed, start])
+    if noise:
+        block += rng.normal(0, noise, block.shape)
+    n_artifacts = rng.poisson(artifact_rate * len(t) / truth.sampling_rate)
+    if n_artifacts:
+        block[rng.integers(0, len(t), n_artifacts), 1] = 1.0
+    return np.clip(block, -1, 1)
+
+
+def synthetic_signals(n_samples, block_size=BLOCK_SIZE, seed=0, **params):
+    """In-memory int16 (frames, 2) session and its ground truth (for small sizes)."""
+    truth = make_truth(n_samples, seed=seed, **_truth_params(params))
+    data = np.empty((n_samples, 2), dtype=np.int16)
+    for start in range(0, n_samples, block_size):
+        stop = min(start + block_size, n_samples)
+        data[start:stop] = np.round(render_block(truth, start, stop, seed=seed, **params) * 32767)
+    return data, truth
+
+
+def write_synthetic_wav(filename, n_samples, block_size=BLOCK_SIZE, seed=0, **params):
+    """
+    Writes a 2-channel 16-bit session block by block (any length, memory use is
+    one block) and returns its ground truth. Files over 4 GiB are written as RF64.
+    """
+    truth_params = _truth_params(params)
+    truth = make_truth(n_samples, seed=seed, **truth_params)
+    sampling_rate = truth.sampling_rate
+    data_size = n_samples * 4
+    with open(filename, 'wb') as f:
+        fmt = struct.pack('<4sIHHIIHH', b'fmt ', 16, 1, 2, sampling_rate, sampling_rate * 4, 4, 16)
+        if data_size + 36 < 1 << 32:
+            f.write(struct.pack('<4sI4s', b'RIFF', data_size + 36, b'WAVE') + fmt)
+            f.write(struct.pack('<4sI', b'data', data_size))
+        else:
+            ds64 = struct.pack('<4sIQQQI', b'ds64', 28, data_size + 72, data_size, n_samples, 0)
+            f.write(struct.pack('<4sI4s', b'RF64', 0xFFFFFFFF, b'WAVE') + ds64 + fmt)
+            f.write(struct.pack('<4sI', b'data', 0xFFFFFFFF))
+        for start in range(0, n_samples, block_size):
+            stop = min(start + block_size, n_samples)
+            block = np.round(render_block(truth, start, stop, seed=seed, **params) * 32767).astype('<i2')
+            block.tofile(f)
+    return truth
+
+
+def _truth_params(params):
+    """Splits the onset parameters out of `params` (the rest are waveform parameters)."""
+    names = ('sampling_rate', 'period_ms', 'jitter_ms', 'delay_ms', 'delay_std_ms', 'drift_ppm', 'missed_rate')
+    return {name: params.pop(name) for name in names if name in params}
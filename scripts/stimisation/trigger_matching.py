@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Result of `match_events`: every field is an array of indices.
+# `triggers[trigger_idx[k]]` is paired with `events[event_idx[k]]`.
+MatchResult = namedtuple('MatchResult', ['trigger_idx', 'event_idx', 'unmatched_triggers', 'orphan_events'])
+
+MATCH_MODES = ('after', 'nearest')
+
+# --- Parameters ---
+MAX_LAG_FRACTION = 0.5  # Default matching window, as a fraction of the median trigger interval
+
+
+def bounded_lag(triggers, max_lag=None, fraction=MAX_LAG_FRACTION):
+    """
+    Matching window of `match_events`: `max_lag` when given, otherwise
+    `fraction` of the median trigger interval (None with fewer than two
+    triggers). Without a bound, a missed event would be paired with the next
+    trigger's event, one period late; pass np.inf to disable it.
+    """
+    if max_lag is not None:
+        return max_lag
+    triggers = np.asarray(triggers)
+    if len(triggers) < 2:
+        return None
+    return fraction * float(np.median(np.diff(triggers)))
+
+
+def match_events(triggers, events, mode='after', max_lag=None, one_to_one=False):
+    """
+    Pairs each trigger with a photodiode event using binary search (np.searchsorted).
+
+    Both inputs must be sorted (peak indices or times, in the same unit).
+    - mode='after': first event strictly after the trigger
+    - mode='nearest': closest event on either side (ties go to the later event)
+    - max_lag: pairs with |event - trigger| > max_lag are rejected
+    - one_to_one: an event is paired with at most one trigger, the closest one;
+      the other triggers that claimed it are reported as unmatched
+
+    Runs in O((N + M) log M) without a Python loop over the triggers.
+    """
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown matching mode '{mode}', expected one of {MATCH_MODES}.")
+    triggers = np.asarray(triggers)
+    events = np.asarray(events)
+    n_events = len(events)
+    if n_events == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return MatchResult(empty, empty, np.arange(len(triggers)), empty)
+
+    if mode == 'after':
+        candidate = np.searchsorted(events, triggers, side='right')
+        valid = candidate < n_events
+    else:
+        after = np.searchsorted(events, triggers, side='left')
+        before = after - 1
+        after_clipped = np.minimum(after, n_events - 1)
+        before_clipped = np.maximum(before, 0)
+        lag_after = np.where(after < n_events, events[after_clipped] - triggers, np.inf)
+        lag_before = np.where(before >= 0, triggers - events[before_clipped], np.inf)
+        candidate = np.where(lag_before < lag_after, before, after)
+        valid = np.minimum(lag_before, lag_after) < np.inf
+
+    candidate = np.where(valid, candidate, 0)
+    lags = np.abs(events[candidate] - triggers)
+    if max_lag is not None:
+        valid &= lags <= max_lag
+
+    trigger_idx = np.flatnonzero(valid)
+    event_idx = candidate[trigger_idx]
+
+    if one_to_one and len(trigger_idx) > 0:
+        # Sort by event, then by lag: the first trigger of each group wins the event
+        order = np.lexsort((lags[trigger_idx], event_idx))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = event_idx[order][1:] != event_idx[order][:-1]
+        winners = np.sort(order[first])
+        trigger_idx, event_idx = trigger_idx[winners], event_idx[winners]
+
+    matched_triggers = np.zeros(len(triggers), dtype=bool)
+    matched_triggers[trigger_idx] = True
+    used_events = np.zeros(n_events, dtype=bool)
+    used_events[event_idx] = True
+
+    return MatchResult(trigger_idx, event_idx, np.flatnonzero(~matched_triggers), np.flatnonzero(~used_events))
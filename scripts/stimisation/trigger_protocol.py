@@ -0,0 +1,154 @@
+import struct
+import threading
+import time
+from collections import namedtuple
+
+# --- Frame layout (little-endian, 9 bytes) ---
+# sync (0xA5) | event code (u8) | sequence (u16) | micros() (u32) | CRC-8 of the previous 8 bytes
+SYNC = 0xA5
+_BODY = struct.Struct('<BBHI')
+FRAME_SIZE = _BODY.size + 1
+SEQUENCE_MODULO = 1 << 16
+MICROS_MODULO = 1 << 32
+
+EVENT_CODES = {'SHOW': 1, 'TTL': 2, 'START': 3, 'STOP': 4}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+TriggerFrame = namedtuple('TriggerFrame', ['command', 'code', 'sequence', 'micros', 'arrival_ns', 'complete_ns'])
+TriggerFrame.__doc__ = """
+A decoded frame; `command` is the event name ('SHOW', ...) like the text
+protocol commands, `arrival_ns`/`complete_ns` are host perf_counter_ns stamps.
+"""
+
+
+def _crc8_table(polynomial=0x07):
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+
+_CRC8_TABLE = _crc8_table()
+
+
+def crc8(data):
+    """CRC-8 (polynomial 0x07, initial value 0), the same as `crc8()` in the Arduino sketch."""
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def encode_frame(event, sequence, micros):
+    """Encodes one frame; `event` is an event name or a numeric code."""
+    code = EVENT_CODES[event] if isinstance(event, str) else event
+    body = _BODY.pack(SYNC, code, sequence % SEQUENCE_MODULO, micros % MICROS_MODULO)
+    return body + bytes((crc8(body),))
+
+
+def decode_frame(frame):
+    """(code, sequence, micros) of one complete frame; raises ValueError if it is corrupted."""
+    if len(frame) != FRAME_SIZE or frame[0] != SYNC:
+        raise ValueError("Not a trigger frame.")
+    if crc8(frame[:-1]) != frame[-1]:
+        raise ValueError("Trigger frame CRC mismatch.")
+    _, code, sequence, micros = _BODY.unpack(frame[:-1])
+    return code, sequence, micros
+
+
+class BinaryFramer:
+    """
+    Stream decoder for `SerialListener`: finds frames in the byte stream,
+    resynchronizes byte by byte after a corrupted frame and counts the frames
+    lost in between from the sequence numbers.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._arrival_ns = None
+        self._last_sequence = None
+        self.n_frames = 0
+        self.n_dropped = 0
+        self.n_corrupted = 0
+
+    def feed(self, data, timestamp_ns):
+        """Adds received bytes and returns the completed TriggerFrame tuples."""
+        if not self._buffer:
+            self._arrival_ns = timestamp_ns
+        self._buffer += data
+        frames = []
+        while True:
+            start = self._buffer.find(SYNC)
+            if start < 0:
+                self._buffer.clear()
+                break
+            if start:
+                del self._buffer[:start]
+                self._arrival_ns = timestamp_ns
+            if len(self._buffer) < FRAME_SIZE:
+                break
+            try:
+                code, sequence, micros = decode_frame(bytes(self._buffer[:FRAME_SIZE]))
+            except ValueError:
+                self.n_corrupted += 1
+                del self._buffer[:1]  # Not a frame start after all, look for the next sync byte
+                continue
+            del self._buffer[:FRAME_SIZE]
+            self._count(sequence)
+            frames.append(TriggerFrame(EVENT_NAMES.get(code, str(code)), code, sequence, micros,
+                                       self._arrival_ns, timestamp_ns))
+            self._arrival_ns = timestamp_ns
+        return frames
+
+    def _count(self, sequence):
+        if self._last_sequence is not None:
+            self.n_dropped += (sequence - self._last_sequence - 1) % SEQUENCE_MODULO
+        self._last_sequence = sequence
+        self.n_frames += 1
+
+
+class LoopbackSerial:
+    """
+    In-memory stand-in for `serial.Serial`: bytes written are read back, so the
+    protocol and the listener can be exercised without an Arduino.
+    `read` honours `timeout` like pyserial.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.is_open = True
+        self._buffer = bytearray()
+        self._condition = threading.Condition()
+
+    @property
+    def in_waiting(self):
+        with self._condition:
+            return len(self._buffer)
+
+    def write(self, data):
+        with self._condition:
+            self._buffer += data
+            self._condition.notify_all()
+        return len(data)
+
+    def read(self, size=1):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._condition:
+            while len(self._buffer) < size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+    def reset_input_buffer(self):
+        with self._condition:
+            self._buffer.clear()
+
+    def close(self):
+        self.is_open = False
@@ -0,0 +1,195 @@
+import os
+import struct
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _parse_header(fid, file_size):
+    """
+    Walks the RIFF (or RF64) chunks until the 'data' chunk.
+    Returns the format fields, the byte offset of the samples and their size.
+    """
+    riff_id, _, wave_id = struct.unpack('<4sI4s', fid.read(12))
+    if riff_id not in (b'RIFF', b'RF64') or wave_id != b'WAVE':
+        raise ValueError("Not a little-endian RIFF/RF64 WAVE file.")
+
+    fmt = None
+    rf64_data_size = None
+    while True:
+        header = fid.read(8)
+        if len(header) < 8:
+            raise ValueError("No 'data' chunk found in the WAV file.")
+        chunk_id, size = struct.unpack('<4sI', header)
+        if chunk_id == b'ds64':
+            _, rf64_data_size = struct.unpack('<QQ', fid.read(16))
+            fid.seek(size - 16 + (size & 1), 1)
+        elif chunk_id == b'fmt ':
+            body = fid.read(size)
+            format_tag, channels, rate, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and size >= 40:
+                # The real format tag is the first two bytes of the sub-format GUID
+                format_tag = struct.unpack('<H', body[24:26])[0]
+            fmt = (format_tag, channels, rate, block_align, bits)
+            if size & 1:
+                fid.seek(1, 1)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("'data' chunk found before the 'fmt ' chunk.")
+            offset = fid.tell()
+            if riff_id == b'RF64' and size == 0xFFFFFFFF and rf64_data_size is not None:
+                size = rf64_data_size
+            # Some recorders never patch the size of an interrupted capture
+            size = min(size, file_size - offset)
+            return fmt, offset, size
+        else:
+            fid.seek(size + (size & 1), 1)
+
+
+class _Int24Channel:
+    """
+    Lazy view of one 24-bit channel: slicing decodes only the requested frames
+    into int32 (left-justified, like `scipy.io.wavfile.read`).
+    """
+
+    def __init__(self, wav, channel):
+        self._wav = wav
+        self._channel = channel
+        self.dtype = np.dtype(np.int32)
+        self.shape = (wav.n_frames,)
+        self.ndim = 1
+
+    def __len__(self):
+        return self._wav.n_frames
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._wav.n_frames)
+            if step < 0:
+                # Frames (stop, start] read forwards, then walked backwards from `start`
+                frames = self._wav.read(stop + 1, max(start + 1, stop + 1), channels=[self._channel])
+                return frames[::-1][::-step, 0]
+            return self._wav.read(start, stop, channels=[self._channel])[::step, 0]
+        if isinstance(key, (int, np.integer)):
+            index = key + self._wav.n_frames if key < 0 else key
+            return self._wav.read(index, index + 1, channels=[self._channel])[0, 0]
+        # Integer index array: gather and decode only the requested frames
+        key = np.asarray(key)
+        if key.dtype == bool:
+            return self[:][key]
+        key = np.where(key < 0, key + self._wav.n_frames, key)
+        return self._wav.take(key, self._channel)
+
+    def __array__(self, dtype=None, copy=None):
+        data = self[:]
+        return data if dtype is None else data.astype(dtype)
+
+
+class MappedWav:
+    """
+    Memory-mapped WAV file: opening only parses the header and maps the 'data'
+    chunk, samples are paged in by the OS when they are actually accessed.
+
+    Supports 8/16/24/32-bit PCM and 32/64-bit float, RIFF and RF64 files.
+    `channel(i)` returns a strided view of one channel without copying;
+    values are the same as those returned by `scipy.io.wavfile.read`.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        file_size = os.path.getsize(filename)
+        with open(filename, 'rb') as fid:
+            (format_tag, channels, rate, block_align, bits), offset, size = _parse_header(fid, file_size)
+
+        self.sampling_rate = rate
+        self.n_channels = channels
+        self.bits_per_sample = bits
+        self.block_align = block_align
+        self.n_frames = size // block_align
+        self.sample_width = block_align // channels
+
+        width = self.sample_width
+        if format_tag == WAVE_FORMAT_PCM:
+            if bits <= 8:
+                self._dtype = np.dtype(np.uint8)
+            elif width == 3:
+                self._dtype = None  # No native dtype, decoded on access
+            elif width in (2, 4, 8):
+                self._dtype = np.dtype(f'<i{width}')
+            else:
+                raise ValueError(f"Unsupported {bits}-bit PCM WAV file.")
+        elif format_tag == WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+            self._dtype = np.dtype(f'<f{width}')
+        else:
+            raise ValueError(f"Unsupported WAV format tag {format_tag:#06x} ({bits}-bit).")
+        self.dtype = self._dtype if self._dtype is not None else np.dtype(np.int32)
+
+        if self.n_frames > 0:
+            self._raw = np.memmap(filename, dtype=np.uint8, mode='r', offset=offset,
+                                  shape=(self.n_frames * block_align,))
+        else:
+            self._raw = np.empty(0, dtype=np.uint8)
+        self._frames = None
+        if self._dtype is not None:
+            self._frames = np.ndarray((self.n_frames, channels), dtype=self._dtype, buffer=self._raw,
+                                      strides=(block_align, width))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases the memory map (views obtained earlier keep it alive)."""
+        self._raw = None
+        self._frames = None
+
+    @property
+    def duration(self):
+        """Recording duration in seconds."""
+        return self.n_frames / self.sampling_rate
+
+    def channel(self, index):
+        """Zero-copy view of one channel (lazy decoding view for 24-bit files)."""
+        if not 0 <= index < self.n_channels:
+            raise ValueError(f"Channel {index} requested but the file has {self.n_channels} channel(s).")
+        if self._frames is not None:
+            return self._frames[:, index]
+        return _Int24Channel(self, index)
+
+    def read(self, start=0, stop=None, channels=None):
+        """
+        Frames [start, stop) as a (frames, channels) array.
+        This is a view of the memory map, except for 24-bit files which are decoded.
+        """
+        stop = self.n_frames if stop is None else min(stop, self.n_frames)
+        start = min(start, stop)
+        if self._frames is not None:
+            block = self._frames[start:stop]
+            return block if channels is None else block[:, channels]
+
+        channels = range(self.n_channels) if channels is None else channels
+        raw = self._raw[start * self.block_align:stop * self.block_align].reshape(-1, self.block_align)
+        decoded = np.zeros((raw.shape[0], len(channels), 4), dtype=np.uint8)
+        for k, ch in enumerate(channels):
+            decoded[:, k, 1:] = raw[:, ch * 3:ch * 3 + 3]
+        return decoded.view('<i4')[..., 0]
+
+    def take(self, indices, channel):
+        """Samples of one channel at arbitrary frame indices (only those pages are read)."""
+        indices = np.asarray(indices)
+        if self._frames is not None:
+            return self._frames[indices, channel]
+        frames = self._raw.reshape(-1, self.block_align)[indices.ravel()]
+        decoded = np.zeros((len(frames), 4), dtype=np.uint8)
+        decoded[:, 1:] = frames[:, channel * 3:channel * 3 + 3]
+        return decoded.view('<i4')[:, 0].reshape(indices.shape)
+
+    def blocks(self, block_size, channels=None):
+        """Yields consecutive blocks of at most `block_size` frames."""
+        for start in range(0, self.n_frames, block_size):
+            yield self.read(start, start + block_size, channels)
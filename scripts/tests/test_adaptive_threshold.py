@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.adaptive_threshold import AdaptiveThreshold, detect_onsets
+
+SAMPLING_RATE = 10000
+PERIOD = 5000  # 500 ms
+N = 40 * PERIOD
+
+
+def _drifting_pulses():
+    """50 ms pulses whose baseline and height double over the recording."""
+    t = np.arange(N)
+    signal = 1000 + 1000 * t / N + np.random.default_rng(0).normal(0, 20, N)
+    for start in PERIOD // 2 + PERIOD * np.arange(40):
+        signal[start:start + 500] += 3000 * (1 + start / N)
+    return signal
+
+
+def test_levels_are_continuous_and_blockwise():
+    signal = _drifting_pulses()
+    high, low = AdaptiveThreshold(SAMPLING_RATE).levels(signal, 0, N)
+    assert np.all(np.isfinite(high)) and np.max(np.abs(np.diff(high))) < 1  # No step at window boundaries
+
+    threshold = AdaptiveThreshold(SAMPLING_RATE)
+    block = threshold.hop * 7
+    blocks = [threshold.levels(signal, start, min(start + block, N))[0] for start in range(0, N, block)]
+    assert np.array_equal(np.concatenate(blocks), high)
+
+
+@pytest.mark.parametrize('baseline', ['percentile', 'median'])
+def test_drifting_pulses_are_all_detected(baseline):
+    onsets = detect_onsets(_drifting_pulses(), SAMPLING_RATE, 100, baseline=baseline)
+    assert len(onsets) == 40
+    assert np.max(np.abs(onsets - (PERIOD // 2 + PERIOD * np.arange(40)))) <= 1
@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.benchmark import STAGES, compare, run_benchmarks
+
+
+def test_benchmark_runs_every_stage(tmp_path):
+    results = run_benchmarks([200_000], repeats=1, workdir=tmp_path)
+    checks = {row['stage']: row['check'] for row in results}
+    assert set(checks) == set(STAGES)
+    assert checks['generate'] > 0
+    assert checks['match'] == checks['detect'] == checks['generate']
+    assert compare(results, results) == []
@@ -0,0 +1,87 @@
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.detectors import detect_events
+from stimisation.filtering import FilteredChannel, StreamingFilter, design_filter, filter_signal
+
+SAMPLING_RATE = 10000
+N_FLASHES = 39
+PERIOD = SAMPLING_RATE // 2  # 500 ms
+
+
+class _Recording:
+    """Single-channel in-memory recording with the interface `detect_events` needs."""
+
+    def __init__(self, signal):
+        self.signal = signal
+        self.sampling_rate = SAMPLING_RATE
+        self.filename = 'memory'
+        self.n_channels = 1
+
+    def channel(self, index):
+        return self.signal
+
+
+def _photodiode(flash_ms, baseline=12000, height=8000):
+    """Flashes on a DC baseline, with 50 Hz mains pickup and noise (int16)."""
+    t = np.arange((N_FLASHES + 1) * PERIOD)
+    signal = np.full(len(t), float(baseline))
+    flash = int(flash_ms * SAMPLING_RATE / 1000)
+    for start in PERIOD // 2 + PERIOD * np.arange(N_FLASHES):
+        signal[start:start + flash] += height
+    signal += 300 * np.sin(2 * np.pi * 50 * t / SAMPLING_RATE) + np.random.default_rng(0).normal(0, 50, len(t))
+    return signal.astype(np.int16)
+
+
+@pytest.mark.parametrize('flash_ms', [16, 100])
+@pytest.mark.parametrize('params', [None, {'notch_hz': 50, 'highpass_hz': 1},
+                                    {'notch_hz': 50, 'n_harmonics': 3, 'highpass_hz': 1, 'lowpass_hz': 2000}])
+def test_dc_baseline_keeps_every_flash(flash_ms, params):
+    filters = None if params is None else {0: design_filter(SAMPLING_RATE, **params)}
+    detection, = detect_events(_Recording(_photodiode(flash_ms)), [(0, 0.8, True)], 100, filters=filters)
+    assert len(detection.peaks) == N_FLASHES
+
+
+def test_high_pass_starts_without_step():
+    sos = design_filter(SAMPLING_RATE, highpass_hz=1)
+    filtered = filter_signal(np.full(1000, 12000.0), sos)
+    assert np.max(np.abs(filtered)) < 1e-6
+
+
+def test_blocks_match_whole_signal_filtering():
+    signal = _photodiode(100)
+    sos = design_filter(SAMPLING_RATE, notch_hz=50, n_harmonics=3, highpass_hz=1, lowpass_hz=2000)
+    reference = filter_signal(signal, sos)
+
+    streaming = StreamingFilter(sos)
+    blocks = [streaming.feed(signal[start:start + 777]) for start in range(0, len(signal), 777)]
+    assert np.array_equal(np.concatenate(blocks), reference)
+
+    channel = FilteredChannel(signal, sos, block_size=1000)
+    indices = np.sort(np.random.default_rng(1).integers(0, len(signal), 100))
+    assert np.array_equal(channel[indices], reference[indices])
+    assert np.array_equal(channel[5000:12345], reference[5000:12345])
+    assert np.array_equal(channel[::-3], reference[::-3])
+    assert channel[-1] == reference[-1]
+
+
+def test_filtered_channel_keeps_no_full_length_buffer():
+    signal = np.random.default_rng(2).integers(-1000, 1000, 1 << 21).astype(np.int16)
+    sos = design_filter(SAMPLING_RATE, notch_hz=50, highpass_hz=1)
+    channel = FilteredChannel(signal, sos, block_size=1 << 14)
+    tracemalloc.start()
+    try:
+        for _ in range(2):
+            peak = max(np.max(channel[start:start + (1 << 16)]) for start in range(0, len(channel), 1 << 16))
+        channel[np.arange(0, len(channel), 1 << 12)]
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak == np.max(filter_signal(signal, sos))
+    assert peak_bytes < len(signal) * 8 // 8  # A filtered copy would take len * 8 bytes
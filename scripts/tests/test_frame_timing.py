@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.frame_timing import measure_frame_period
+
+
+class _Display:
+    """Fake display whose flips advance a clock by `period` ms."""
+
+    def __init__(self, period):
+        self.period = period
+        self.time = 0.0
+
+    def present(self):
+        self.time += self.period
+
+    def clock(self):
+        return self.time
+
+
+def test_blocking_flips_give_the_refresh_period():
+    display = _Display(1000 / 60)
+    assert measure_frame_period(display.present, clock=display.clock) == pytest.approx(1000 / 60)
+
+
+def test_non_blocking_flips_are_rejected():
+    display = _Display(0.05)
+    with pytest.raises(ValueError):
+        measure_frame_period(display.present, clock=display.clock)
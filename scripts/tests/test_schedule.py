@@ -0,0 +1,27 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.schedule import align_schedule, schedule_counts
+
+SAMPLING_RATE = 10000
+PERIOD = 5000  # 500 ms
+
+
+def test_early_and_late_events_are_told_apart():
+    times = 1000.0 + PERIOD * np.arange(10)
+    times[3] -= 1000
+    times[5] += 1000
+    alignment = align_schedule(times, SAMPLING_RATE, 500, fit_period=False)
+    assert schedule_counts(alignment) == {'hit': 8, 'early': 1, 'late': 1, 'duplicated': 0, 'missed': 0}
+
+
+def test_start_reports_leading_missed_trials():
+    times = 1000.0 + PERIOD * np.arange(4, 10)
+    assert schedule_counts(align_schedule(times, SAMPLING_RATE, 500))['missed'] == 0
+    alignment = align_schedule(times, SAMPLING_RATE, 500, start=1000)
+    assert schedule_counts(alignment) == {'hit': 6, 'early': 0, 'late': 0, 'duplicated': 0, 'missed': 4}
+    assert np.array_equal(alignment.status[:4], [4, 4, 4, 4])
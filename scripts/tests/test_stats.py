@@ -0,0 +1,22 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.stats import delay_stats
+from stimisation.trigger_matching import match_events
+
+SAMPLING_RATE = 10000
+
+
+def test_drift_ignores_mispaired_flashes():
+    triggers = 5000.0 * np.arange(200)
+    flashes = triggers * (1 + 50e-6) + 187 + np.random.default_rng(0).normal(0, 1, len(triggers))
+    # Two flashes out of three missed in the last 3/4 of the recording
+    flashes = np.delete(flashes, np.r_[np.arange(50, 200, 3), np.arange(51, 200, 3)])
+    match = match_events(triggers, flashes)  # No lag bound: missed flashes pair with the next one
+    stats = delay_stats(triggers, flashes, match, SAMPLING_RATE)
+    assert np.max(stats.delays_ms) > 900
+    assert abs(stats.drift_ppm - 50) < 1
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.signal import find_peaks
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.streaming_detection import StreamingPeakDetector, select_by_distance
+
+
+def _plateaus(rng, n, values):
+    """Random levels held for 1 to 4 samples: plateaus and, with few levels, many equal heights."""
+    return np.repeat(values, rng.integers(1, 5, len(values)))[:n]
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_streaming_matches_find_peaks(seed):
+    rng = np.random.default_rng(seed)
+    signal = _plateaus(rng, 2000, rng.normal(size=2000))
+    # Equal heights far enough apart not to compete
+    spikes = np.arange(5, len(signal) - 5, 40)
+    signal[spikes] = 10.0
+    height, distance, block_size = rng.uniform(-0.5, 1.5), int(rng.integers(1, 12)), int(rng.integers(3, 60))
+    detector = StreamingPeakDetector(height, distance)
+    peaks = [detector.feed(signal[start:start + block_size]) for start in range(0, len(signal), block_size)]
+    peaks = np.concatenate(peaks + [detector.finish()])
+    assert np.array_equal(peaks, find_peaks(signal, height=height, distance=distance)[0])
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_ties_do_not_depend_on_blocks(seed):
+    rng = np.random.default_rng(seed)
+    signal = _plateaus(rng, 2000, rng.integers(0, 6, 2000)).astype(float)
+    height, distance, block_size = int(rng.integers(1, 5)), int(rng.integers(1, 12)), int(rng.integers(3, 60))
+    candidates, props = find_peaks(signal, height=height)
+    detector = StreamingPeakDetector(height, distance)
+    peaks = [detector.feed(signal[start:start + block_size]) for start in range(0, len(signal), block_size)]
+    peaks = np.concatenate(peaks + [detector.finish()])
+    assert np.array_equal(peaks, candidates[select_by_distance(candidates, props['peak_heights'], distance)])
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.trigger_matching import bounded_lag, match_events
+
+
+def test_missed_flash_is_unmatched_by_default():
+    triggers = 50000.0 * np.arange(39)
+    flashes = np.delete(triggers + 1868, 10)
+    match = match_events(triggers, flashes, max_lag=bounded_lag(triggers), one_to_one=True)
+    assert np.array_equal(match.unmatched_triggers, [10])
+    assert np.all(flashes[match.event_idx] - triggers[match.trigger_idx] == 1868)
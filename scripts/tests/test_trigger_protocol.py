@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.serial_listener import LineFramer, SerialListener
+from stimisation.trigger_protocol import BinaryFramer, LoopbackSerial, encode_frame
+
+
+def _listen(framer, data, n_expected):
+    """Commands decoded by a listener thread from `data` written to a loopback port."""
+    port = LoopbackSerial(timeout=0.01)
+    listener = SerialListener(port, framer)
+    listener.start()
+    try:
+        port.write(data)
+        return [listener.get(timeout=1.0) for _ in range(n_expected)], listener.get(timeout=0.05)
+    finally:
+        listener.stop()
+
+
+def test_binary_frames_survive_loss_and_corruption():
+    corrupted = bytearray(encode_frame('SHOW', 2, 2000))
+    corrupted[5] ^= 0xFF
+    data = (encode_frame('START', 0, 0) + encode_frame('SHOW', 1, 1000) + bytes(corrupted)
+            + encode_frame('SHOW', 4, 4000) + encode_frame('STOP', 5, 5000))
+    framer = BinaryFramer()
+    frames, extra = _listen(framer, data, 4)
+    assert [frame.command for frame in frames] == ['START', 'SHOW', 'SHOW', 'STOP']
+    assert [frame.micros for frame in frames] == [0, 1000, 4000, 5000]
+    assert extra is None
+    assert (framer.n_frames, framer.n_dropped) == (4, 2)
+    assert framer.n_corrupted >= 1
+
+
+def test_text_commands():
+    commands, extra = _listen(LineFramer(), b"SHOW\r\n\nSHOW\n", 2)
+    assert [command.command for command in commands] == ['SHOW', 'SHOW']
+    assert all(command.arrival_ns <= command.complete_ns for command in commands)
+    assert extra is None
@@ -0,0 +1,32 @@
+import os
+import struct
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # stimisation package
+
+from stimisation.wav_reader import MappedWav
+
+
+def _write_int24(path, samples, rate=10000):
+    """Two-channel 24-bit PCM WAV of `samples` (int32 values in the 24-bit range)."""
+    frames = np.asarray(samples, dtype='<i4')
+    data = frames.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    channels = frames.shape[1]
+    fmt = struct.pack('<HHIIHH', 1, channels, rate, rate * 3 * channels, 3 * channels, 24)
+    with open(path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + len(data)) + b'WAVE')
+        f.write(b'fmt ' + struct.pack('<I', len(fmt)) + fmt)
+        f.write(b'data' + struct.pack('<I', len(data)) + data)
+
+
+@pytest.mark.parametrize('key', [slice(None, None, -1), slice(None, None, -3), slice(50, 5, -7), slice(-2, None, -2),
+                                 slice(5, 50, -1), slice(3, 90, 4), slice(-10, None)])
+def test_int24_slices_match_numpy(tmp_path, key):
+    samples = np.random.default_rng(0).integers(-(1 << 23), 1 << 23, (101, 2))
+    path = str(tmp_path / 'int24.wav')
+    _write_int24(path, samples)
+    channel = MappedWav(path).channel(1)
+    assert np.array_equal(channel[key], (samples[:, 1] << 8)[key])